@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MATCH_ALLCHARS 匹配基准测试
+对比改动前每个查询编译 ".*?c1.*?c2..." 正则的匹配方式与
+逐字符 str.find 查找最短窗口的方式：
+1. 在全部图标文件名上只用 MATCH_ALLCHARS 规则过滤
+2. 在很长的键上匹配（正则在字符都存在但顺序不对时会大量回溯）
+
+用法: python3 benchmarks/bench_allchars.py
+"""
+
+import re
+
+from common import bench, load_icon_names
+
+from workflow import MATCH_ALLCHARS
+from workflow.workflow import _allchars_search
+
+QUERIES = ["bank", "cy", "icbc", "zfb", "nrml2x"]
+
+# 很长的键: 只有开头有一个 "z"，之后都是 "a"，查询 "az" 的字符都在键中但不按顺序
+LONG_KEY = "z" + "a" * 400
+LONG_QUERY = "az"
+
+
+def legacy_search(query):
+    """改动前的匹配方式"""
+    pattern = "".join([".*?{0}".format(re.escape(c)) for c in query])
+    return re.compile(pattern, re.IGNORECASE).search
+
+
+def legacy_score(search, value):
+    match = search(value)
+    if match:
+        return 100.0 / ((1 + match.start()) * (match.end() - match.start() + 1))
+    return 0
+
+
+def score(search, lower):
+    window = search(lower)
+    if window:
+        start, end = window
+        return 100.0 / ((1 + start) * (end - start + 1))
+    return 0
+
+
+def main():
+    names = load_icon_names()
+    lowers = [name.lower() for name in names]
+    print(f"{len(names)} 个条目，规则 MATCH_ALLCHARS ({MATCH_ALLCHARS})\n")
+
+    for query in QUERIES:
+        old = legacy_search(query)
+        new = _allchars_search(query)
+        # 两种方式匹配到的条目相同（分数按最短窗口计算，可能不同）
+        assert ([bool(legacy_score(old, name)) for name in names]
+                == [bool(score(new, lower)) for lower in lowers]), query
+
+        base = bench(f"正则       {query!r}", lambda: [legacy_score(old, name) for name in names])
+        fast = bench(f"最短窗口   {query!r}", lambda: [score(new, lower) for lower in lowers])
+        print(f"{'':<40} {base / fast:9.1f}x\n")
+
+    old = legacy_search(LONG_QUERY)
+    new = _allchars_search(LONG_QUERY)
+    assert not legacy_score(old, LONG_KEY) and not score(new, LONG_KEY)
+    base = bench(f"正则       长键 {len(LONG_KEY)} 字符", lambda: legacy_score(old, LONG_KEY), repeat=3)
+    fast = bench(f"最短窗口   长键 {len(LONG_KEY)} 字符", lambda: score(new, LONG_KEY), repeat=3)
+    print(f"{'':<40} {base / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+后台任务启动开销基准测试
+对比直接从当前进程启动命令（run_in_background 默认方式）与
+经由 python -m workflow.background 启动时，前台脚本等待的时间
+
+每次启动之间等待上一个任务结束，避免测到多个进程同时启动时的相互影响
+
+用法: python3 benchmarks/bench_background.py
+"""
+
+import statistics
+import sys
+import time
+
+import common  # noqa: F401  设置 sys.path 和临时的 Alfred 目录
+
+from workflow import background
+
+# 后台运行的命令本身几乎不耗时，测得的就是启动开销
+COMMAND = [sys.executable, "-c", "pass"]
+
+LAUNCHES = 10
+
+# 两次启动之间的间隔（秒）
+IDLE = 0.3
+
+
+def measure(label: str, func) -> float:
+    """启动 LAUNCHES 次，打印最短和中位耗时，返回中位耗时（秒）"""
+    times = []
+    for i in range(LAUNCHES):
+        time.sleep(IDLE)
+        start = time.perf_counter()
+        func(f"bench-{func.__name__}-{i}", COMMAND)
+        times.append(time.perf_counter() - start)
+
+    median = statistics.median(times)
+    print(f"{label:<40} {min(times) * 1000:10.3f} ms (中位 {median * 1000:.3f} ms)")
+    return median
+
+
+def main():
+    runner = measure("python -m workflow.background", background._run_via_runner)
+    direct = measure("run_in_background()", background.run_in_background)
+    print(f"{'':<40} {runner / direct:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
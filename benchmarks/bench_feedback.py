@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Workflow3 反馈输出基准测试
+对比先构建完整的 obj 再 json.dump，与逐个条目流式写出（write_feedback）的耗时
+
+用法: python3 benchmarks/bench_feedback.py
+"""
+
+import io
+import json
+
+from common import bench, load_icon_names
+
+from workflow import Workflow3
+
+SIZES = [100, 1000, 5000]
+
+
+def build_workflow(names):
+    """按选择脚本的方式构建反馈条目"""
+    wf = Workflow3()
+    for name in names:
+        wf.add_item(
+            title=name,
+            subtitle=f"使用 {name} 进行消费 ¥50",
+            arg=json.dumps({"action": "select_category1", "amount": "50", "account": name}),
+            uid=f"account_{name}",
+            icon="icon.png",
+            valid=True,
+            match=name,
+        )
+    return wf
+
+
+def main():
+    names = load_icon_names()
+
+    for size in SIZES:
+        wf = build_workflow(names[:size])
+
+        # 确保两种方式输出一致
+        out = io.StringIO()
+        wf.write_feedback(out)
+        assert out.getvalue() == json.dumps(wf.obj)
+
+        base = bench(f"json.dump(obj)     {size} 条", lambda: json.dump(wf.obj, io.StringIO()))
+        fast = bench(f"write_feedback()   {size} 条", lambda: wf.write_feedback(io.StringIO()))
+        print(f"{'':<40} {base / fast:9.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
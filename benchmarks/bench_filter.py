@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Workflow.filter 基准测试
+对比直接过滤列表、使用预先构建的 FilterIndex 过滤，
+以及只取前 N 个结果（max_results）时的耗时
+
+用法: python3 benchmarks/bench_filter.py
+"""
+
+import pickle
+
+from common import bench, load_icon_names
+
+from workflow import FilterIndex, Workflow3
+
+QUERIES = ["bank", "cy", "normal 2x", "icbc", "color", "zfb", "银行"]
+
+# Alfred 一屏能显示的结果数
+MAX_RESULTS = 9
+
+
+def main():
+    wf = Workflow3()
+    items = load_icon_names()
+    print(f"{len(items)} 个条目，{len(QUERIES)} 个查询\n")
+
+    bench("构建 FilterIndex", lambda: FilterIndex(items), repeat=3)
+    index = FilterIndex(items)
+    data = pickle.dumps(index, protocol=-1)
+    bench("从 pickle 加载 FilterIndex", lambda: pickle.loads(data))
+    print()
+
+    for query in QUERIES:
+        # 确保两种方式结果一致
+        assert wf.filter(query, items) == wf.filter(query, index), query
+        base = bench(f"filter(list)   {query!r}", lambda: wf.filter(query, items))
+        fast = bench(f"filter(index)  {query!r}", lambda: wf.filter(query, index))
+        print(f"{'':<40} {base / fast:9.1f}x")
+
+        top = wf.filter(query, index, max_results=MAX_RESULTS)
+        assert top == wf.filter(query, items)[:MAX_RESULTS], query
+        fast = bench(
+            f"filter(index, top {MAX_RESULTS}) {query!r}",
+            lambda: wf.filter(query, index, max_results=MAX_RESULTS),
+        )
+        print(f"{'':<40} {base / fast:9.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
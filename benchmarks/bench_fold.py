@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fold_to_ascii / Workflow.decode 基准测试
+对 10000 个字符串（图标文件名、分类和账户名称、带变音符号的英文）做折叠和规范化，
+对比逐字符查表 + 每次 NFKD/NFC 规范化的旧实现与 str.translate + LRU 缓存的实现
+
+过滤时每次按键都会重新折叠同一批条目，因此重复调用同一批字符串（第二轮起命中缓存）
+
+用法: python3 benchmarks/bench_fold.py
+"""
+
+import itertools
+import json
+import os
+import unicodedata
+
+from common import SRC_DIR, bench, load_icon_names
+
+from workflow import Workflow3
+from workflow.workflow import ASCII_REPLACEMENTS, fold_to_ascii
+from pinyin_index import collect_names
+
+DEFAULT_DATA_PATH = os.path.join(SRC_DIR, "default_icost_data.json")
+
+FOLDS = 10000
+
+ACCENTED = ["Café Crème", "Müller", "Crédit Agricole", "Société Générale",
+            "Škoda", "Ångström", "Zürich Kantonalbank", "Łódź", "Nestlé"]
+
+
+def legacy_fold_to_ascii(text):
+    """改动前的实现"""
+    try:
+        text.encode("ascii")
+        return text
+    except UnicodeEncodeError:
+        pass
+    text = "".join([ASCII_REPLACEMENTS.get(c, c) for c in text])
+    return unicodedata.normalize("NFKD", text)
+
+
+def legacy_decode(wf, text, encoding=None, normalization=None):
+    """改动前的 Workflow.decode"""
+    encoding = encoding or wf._input_encoding
+    normalization = normalization or wf._normalizsation
+    if not isinstance(text, str):
+        text = str(text, encoding)
+    return unicodedata.normalize(normalization, text)
+
+
+def build_texts() -> list:
+    """10000 个测试字符串"""
+    with open(DEFAULT_DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    names = collect_names(data) + list(data["accounts"])
+    pool = load_icon_names() + names + ACCENTED
+    return list(itertools.islice(itertools.cycle(pool), FOLDS))
+
+
+def main():
+    wf = Workflow3()
+    texts = build_texts()
+    non_ascii = sum(1 for text in texts if not text.isascii())
+    print(f"{len(texts)} 个字符串，其中 {non_ascii} 个包含非 ASCII 字符\n")
+
+    assert [fold_to_ascii(t) for t in texts] == [legacy_fold_to_ascii(t) for t in texts]
+    assert [wf.decode(t) for t in texts] == [legacy_decode(wf, t) for t in texts]
+
+    base = bench("fold_to_ascii（旧）", lambda: [legacy_fold_to_ascii(t) for t in texts])
+    fast = bench("fold_to_ascii", lambda: [fold_to_ascii(t) for t in texts])
+    print(f"{'':<40} {base / fast:9.1f}x\n")
+
+    base = bench("decode（旧）", lambda: [legacy_decode(wf, t) for t in texts])
+    fast = bench("decode", lambda: [wf.decode(t) for t in texts])
+    print(f"{'':<40} {base / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+反馈条目构建基准测试
+构建 5000 个 Item / Item3（带或不带变量、修饰键），记录每个条目的耗时和内存占用
+
+用法: python3 benchmarks/bench_items.py
+"""
+
+import gc
+import json
+import tracemalloc
+
+from common import bench, load_icon_names
+
+from workflow import Workflow, Workflow3
+
+ITEM_COUNT = 5000
+
+
+def build_items(wf, names, with_variables=False, with_modifier=False):
+    """按选择脚本的方式添加条目"""
+    wf._items = []
+    for name in names:
+        item = wf.add_item(
+            title=name,
+            subtitle=f"使用 {name} 进行消费 ¥50",
+            arg=json.dumps({"action": "select_category1", "amount": "50", "account": name}),
+            uid=f"account_{name}",
+            icon="icon.png",
+            valid=True,
+        )
+        if with_variables:
+            item.setvar("account", name)
+        if with_modifier:
+            item.add_modifier("cmd", subtitle="修改金额")
+    return wf._items
+
+
+def measure_memory(func) -> int:
+    """返回 func() 返回的对象占用的内存（字节）"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = func()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    names = (load_icon_names() * 2)[:ITEM_COUNT]
+    print(f"{len(names)} 个条目\n")
+
+    cases = [
+        ("Item", Workflow, {}),
+        ("Item3", Workflow3, {}),
+        ("Item3 + 变量", Workflow3, {"with_variables": True}),
+        ("Item3 + 修饰键", Workflow3, {"with_modifier": True}),
+    ]
+
+    for label, cls, kwargs in cases:
+        wf = cls()
+        elapsed = bench(label, lambda: build_items(wf, names, **kwargs))
+        size = measure_memory(lambda: build_items(wf, names, **kwargs))
+        print(f"{'':<40} {elapsed / len(names) * 1e6:8.2f} µs/条"
+              f" {size / len(names):8.0f} 字节/条\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存序列化格式基准测试
+在真实规模的数据（分类数据、使用频率、拼音索引、查找索引、FilterIndex）上
+对比各个已注册序列化格式的写入/读取耗时和文件大小
+
+用法: python3 benchmarks/bench_serializers.py
+"""
+
+import io
+import json
+import os
+import random
+import time
+
+from common import SRC_DIR, bench, load_icon_names
+
+from workflow import FilterIndex, manager
+from entry_parser import build_lookup_index
+from pinyin_index import build_pinyin_index, collect_names
+
+DEFAULT_DATA_PATH = os.path.join(SRC_DIR, "default_icost_data.json")
+
+
+def build_datasets() -> dict:
+    """构建测试数据"""
+    with open(DEFAULT_DATA_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # 使用频率：所有账户和分类都有记录
+    names = collect_names(data)
+    now = time.time()
+    frequency = {
+        "accounts": {name: random.randint(1, 500) for name in data["accounts"]},
+        "categories": {name: random.randint(1, 500) for name in names},
+        "last_used": {
+            "accounts": {name: now - random.random() * 86400 * 90 for name in data["accounts"]},
+            "categories": {name: now - random.random() * 86400 * 90 for name in names},
+        },
+    }
+
+    pinyin_index = build_pinyin_index(names)
+
+    return {
+        "分类数据": data,
+        "使用频率": frequency,
+        "拼音索引": pinyin_index,
+        "查找索引": build_lookup_index(data, pinyin_index),
+        "图标 FilterIndex": FilterIndex(load_icon_names()),
+    }
+
+
+def main():
+    datasets = build_datasets()
+
+    for label, obj in datasets.items():
+        print(f"== {label}")
+        for name in manager.serializers:
+            serializer = manager.serializer(name)
+            buf = io.BytesIO() if serializer.is_binary else io.StringIO()
+            try:
+                serializer.dump(obj, buf)
+            except (TypeError, ValueError):
+                # 该格式不支持这种数据（例如 json/marshal 不能保存对象）
+                print(f"   {name:<14} 不支持")
+                continue
+
+            raw = buf.getvalue()
+            size = len(raw.encode("utf-8") if isinstance(raw, str) else raw)
+
+            def dump():
+                serializer.dump(obj, io.BytesIO() if serializer.is_binary else io.StringIO())
+
+            def load():
+                serializer.load(io.BytesIO(raw) if serializer.is_binary else io.StringIO(raw))
+
+            dump_time = bench(f"   {name:<14} 写入", dump, repeat=5, number=5)
+            load_time = bench(f"   {name:<14} 读取", load, repeat=5, number=5)
+            print(f"   {name:<14} {size / 1024:8.1f} KB"
+                  f"  (写入 {dump_time * 1000:.3f} ms / 读取 {load_time * 1000:.3f} ms)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基准测试公共工具
+将 src 加入 sys.path，并把 Alfred 的缓存/数据目录指向临时目录，
+这样基准测试不会读写真实的 workflow 数据
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+ICONS_JSON_PATH = os.path.join(SRC_DIR, "icons.json")
+
+_TEMP_DIR = tempfile.mkdtemp(prefix="icost-bench-")
+os.environ.setdefault("alfred_workflow_bundleid", "com.ay.icost.workflow")
+os.environ.setdefault("alfred_workflow_cache", os.path.join(_TEMP_DIR, "cache"))
+os.environ.setdefault("alfred_workflow_data", os.path.join(_TEMP_DIR, "data"))
+
+sys.path.insert(0, SRC_DIR)
+
+
+def load_icon_names() -> list:
+    """加载图标目录中的全部文件名（约 4000 个，作为真实规模的数据）"""
+    with open(ICONS_JSON_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def bench(label: str, func, repeat: int = 5, number: int = 1) -> float:
+    """
+    运行 func 多次并打印最好成绩
+
+    Returns:
+        单次调用的最短耗时（秒）
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    print(f"{label:<40} {best * 1000:10.3f} ms")
+    return best
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成 pinyin.json 文件
+为 GB2312 中的全部汉字（6763 个）生成拼音读音表，写入 src/pinyin.json
+workflow 运行时只读取该文件，不依赖 pypinyin
+
+用法: pip3 install pypinyin && python3 generate_pinyin_json.py
+"""
+
+import os
+import json
+
+from pypinyin import pinyin, Style
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_FILE = os.path.join(SCRIPT_DIR, "src", "pinyin.json")
+
+# 每个多音字最多保留的读音数
+MAX_READINGS = 3
+
+
+def gb2312_chars():
+    """按编码顺序返回 GB2312 一、二级汉字"""
+    chars = []
+    for high in range(0xB0, 0xF8):
+        for low in range(0xA1, 0xFF):
+            try:
+                chars.append(bytes([high, low]).decode("gb2312"))
+            except UnicodeDecodeError:
+                continue
+    return chars
+
+
+def main():
+    """生成 pinyin.json"""
+    table = {}
+    for char in gb2312_chars():
+        readings = pinyin(char, style=Style.NORMAL, heteronym=True)[0]
+        # 去重并保持 pypinyin 给出的常用读音在前
+        readings = [r for i, r in enumerate(readings) if r.isalpha() and r not in readings[:i]]
+        if readings:
+            table[char] = readings[:MAX_READINGS]
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+    print(f"已生成 {OUTPUT_FILE}")
+    print(f"共 {len(table)} 个汉字")
+
+
+if __name__ == "__main__":
+    main()
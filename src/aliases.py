@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 别名模块
+读取用户编辑的别名表 aliases.json（data 目录，可用 "ic workflow:opendata" 打开），格式:
+
+    {
+        "aliases": {"招行": "招商银行信用卡尾号1234", "咖啡": "餐饮/咖啡"},
+        "icons": {"招商银行信用卡尾号1234": "招商银行"}
+    }
+
+- aliases: 简称 -> 完整的账户或分类名称（分类可以写成 "一级分类/二级分类"）
+- icons: 完整名称 -> 图标（icons.json 中的文件名，或图标关键词如 "招商银行"）
+
+别名表编译成哈希查找表后使用:
+entry_parser 把简称作为账户/分类的查找键，输入完整简称时直接查表得到结果；
+icon_manager 把 icons 合并到手动选择的图标中，查找图标时先查表，不做模糊匹配
+"""
+
+import json
+import os
+from typing import Dict, Optional
+
+# 别名表文件名（data 目录，清除缓存时不会丢失）
+ALIASES_FILENAME = "aliases.json"
+
+# 缓存：别名表（避免重复读取）
+_aliases: Optional[Dict[str, Dict[str, str]]] = None
+
+
+def get_aliases_path(wf) -> str:
+    """获取别名表文件路径"""
+    return wf.datafile(ALIASES_FILENAME)
+
+
+def load_aliases(wf) -> Dict[str, Dict[str, str]]:
+    """
+    加载别名表（使用缓存），格式错误的部分忽略
+
+    Returns:
+        {"aliases": {小写的简称: 完整名称}, "icons": {完整名称: 图标}}
+    """
+    global _aliases
+    if _aliases is not None:
+        return _aliases
+
+    raw = {}
+    aliases_file = get_aliases_path(wf)
+    if os.path.exists(aliases_file):
+        try:
+            with open(aliases_file, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            wf.logger.error(f"Invalid {ALIASES_FILENAME}: {e}")
+
+    sections = {}
+    for section in ("aliases", "icons"):
+        entries = raw.get(section) if isinstance(raw, dict) else None
+        if not isinstance(entries, dict):
+            entries = {}
+        sections[section] = {
+            str(key).strip(): str(value).strip()
+            for key, value in entries.items()
+            if str(key).strip() and str(value).strip()
+        }
+
+    # 简称不区分大小写
+    sections["aliases"] = {alias.lower(): name for alias, name in sections["aliases"].items()}
+    _aliases = sections
+    return _aliases
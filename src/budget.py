@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 预算
+显示本月每个分类的支出与预算，支出来自 spending_totals.py 的累计值（只读取本月数据）
+
+用法（关键词 icost:budget）:
+    icost:budget              本月各分类的预算使用情况
+    icost:budget 餐饮         只显示名称包含 "餐饮" 的分类
+    icost:budget 餐饮 2000    设置 "餐饮" 每月预算为 2000 元（回车确认，0 表示删除）
+
+预算保存在 workflow 的设置中（wf.settings["budgets"]，单位为分）。
+一级分类的预算包含其所有二级分类的支出。
+条目不设置 uid，保持按预算使用比例排序
+"""
+
+import calendar
+import datetime
+import json
+import re
+import sys
+import os
+from typing import Dict
+
+# 添加 workflow 包路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from workflow import Workflow3
+from icon_manager import get_icon_for_item, flush_download_queue
+from spending_totals import month_spending
+from stats import format_amount
+from transactions import parse_amount
+
+DATA_FILENAME = "icost_data.json"
+
+# 进度条长度
+BAR_WIDTH = 10
+
+
+def load_data(wf):
+    """加载分类和账户数据（从 cache 目录）"""
+    data_file = wf.cachefile(DATA_FILENAME)
+    if os.path.exists(data_file):
+        with open(data_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"expense_categories": {}}
+
+
+def get_budgets(wf) -> Dict[str, int]:
+    """{分类: 每月预算（分）}"""
+    return wf.settings.get("budgets", {})
+
+
+def set_budget(wf, category: str, cents: int):
+    """设置（cents 为 0 时删除）分类的每月预算"""
+    budgets = dict(get_budgets(wf))
+    if cents:
+        budgets[category] = cents
+    else:
+        budgets.pop(category, None)
+    # 重新赋值才会保存到设置文件
+    wf.settings["budgets"] = budgets
+
+
+def roll_up(spending: Dict[str, int], budgets: Dict[str, int],
+            parents: Dict[str, str]) -> Dict[str, int]:
+    """
+    按预算分类汇总支出: 分类本身有预算时计入该分类，一级分类有预算时同时计入一级分类；
+    都没有预算的支出汇总到一级分类下
+
+    Returns:
+        {分类: 金额（分）}
+    """
+    result: Dict[str, int] = {}
+    for category, cents in spending.items():
+        parent = parents.get(category, category)
+        targets = {name for name in (category, parent) if name in budgets} or {parent}
+        for name in targets:
+            result[name] = result.get(name, 0) + cents
+    return result
+
+
+def progress_bar(ratio: float) -> str:
+    """预算使用比例 -> "■■■■□□□□□□" """
+    filled = min(int(ratio * BAR_WIDTH + 0.5), BAR_WIDTH)
+    return "■" * filled + "□" * (BAR_WIDTH - filled)
+
+
+def add_set_budget_item(wf, category: str, amount: str):
+    """设置预算的条目（回车确认）"""
+    cents = parse_amount(amount) or 0
+    budgets = get_budgets(wf)
+    if cents:
+        title = f"设置 {category} 每月预算 {format_amount(cents)}"
+    else:
+        title = f"删除 {category} 的预算"
+    current = budgets.get(category)
+    wf.add_item(
+        title=title,
+        subtitle=f"当前预算: {format_amount(current)}" if current else "当前未设置预算",
+        arg=json.dumps({"category": category, "amount": cents}),
+        icon=get_icon_for_item(wf, category),
+        valid=True
+    )
+
+
+def main(wf):
+    args = wf.args
+    if len(args) == 2 and args[0] == "--set":
+        # 由 Alfred 的 Run Script 调用，保存预算
+        params = json.loads(args[1])
+        set_budget(wf, params["category"], params["amount"])
+        print(f"✅ 已设置 {params['category']} 的预算" if params["amount"]
+              else f"✅ 已删除 {params['category']} 的预算")
+        return
+
+    query = args[0].strip() if args else ""
+    tokens = query.split()
+
+    # "分类 金额": 设置预算
+    if len(tokens) >= 2 and re.fullmatch(r'\d+(\.\d{1,2})?', tokens[-1]):
+        add_set_budget_item(wf, " ".join(tokens[:-1]), tokens[-1])
+        wf.send_feedback()
+        return
+
+    budgets = get_budgets(wf)
+    parents = {child: parent
+               for parent, children in load_data(wf).get("expense_categories", {}).items()
+               for child in children}
+    spending = month_spending(wf)
+    by_category = roll_up(spending, budgets, parents)
+
+    today = datetime.date.today()
+    days_left = calendar.monthrange(today.year, today.month)[1] - today.day + 1
+    total_spent = sum(spending.values())
+    total_budget = sum(budgets.values())
+    budget_spent = sum(by_category.get(name, 0) for name in budgets)
+
+    if not query:
+        subtitle = f"本月还剩 {days_left} 天"
+        if total_budget:
+            subtitle = (f"预算合计 {format_amount(total_budget)}，"
+                        f"已用 {budget_spent * 100 / total_budget:.0f}% · " + subtitle)
+        wf.add_item(
+            title=f"📅 {today:%Y-%m} 本月支出 {format_amount(total_spent)}",
+            subtitle=subtitle,
+            icon="icon.png",
+            valid=False
+        )
+
+    # 有预算的分类按使用比例降序，其后是没有预算但有支出的分类
+    budgeted = sorted(budgets, key=lambda name: by_category.get(name, 0) / budgets[name],
+                      reverse=True)
+    unbudgeted = sorted((name for name in by_category if name not in budgets),
+                        key=by_category.get, reverse=True)
+    keyword = query.lower()
+    shown = 0
+
+    for category in budgeted:
+        if keyword and keyword not in category.lower():
+            continue
+        spent = by_category.get(category, 0)
+        budget = budgets[category]
+        ratio = spent / budget
+        left = budget - spent
+        status = f"剩余 {format_amount(left)}" if left >= 0 else f"超出 {format_amount(-left)}"
+        wf.add_item(
+            title=f"{'⚠️ ' if left < 0 else ''}{category}  {format_amount(spent)} / {format_amount(budget)}",
+            subtitle=f"{progress_bar(ratio)} {ratio * 100:.0f}% · {status}",
+            icon=get_icon_for_item(wf, category),
+            autocomplete=f"{category} ",
+            valid=False
+        )
+        shown += 1
+
+    for category in unbudgeted:
+        if keyword and keyword not in category.lower():
+            continue
+        wf.add_item(
+            title=f"{category or '(无分类)'}  {format_amount(by_category[category])}",
+            subtitle="未设置预算，按 Tab 后输入金额设置",
+            icon=get_icon_for_item(wf, category),
+            autocomplete=f"{category} ",
+            valid=False
+        )
+        shown += 1
+
+    if query and not shown:
+        wf.add_item(
+            title=f"{query}",
+            subtitle="输入 \"分类 金额\" 设置每月预算，例如: 餐饮 2000",
+            icon="icon.png",
+            autocomplete=f"{query} ",
+            valid=False
+        )
+
+    flush_download_queue(wf)
+    wf.send_feedback()
+
+
+if __name__ == "__main__":
+    wf = Workflow3()
+    sys.exit(wf.run(main))
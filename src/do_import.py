@@ -2,6 +2,12 @@
 # -*- coding: utf-8 -*-
 """
 iCost Alfred Workflow - 执行导入操作
+导入在后台任务中进行（大文件解析较慢），进度通过 workflow.background.JobStatus
+写入状态文件，由 import_categories.py 显示
+
+用法:
+    python do_import.py <file>            启动后台导入
+    python do_import.py --worker <file>   在当前进程中导入（由后台任务调用）
 """
 
 import json
@@ -12,6 +18,14 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from workflow import Workflow3
+from workflow.background import JobStatus, is_running, run_in_background
+from pinyin_index import save_pinyin_index
+from entry_parser import save_lookup_index
+from remark_model import learn_records
+from spending_totals import rebuild_from_store
+from transactions import (TransactionStore, load_store, save_store, parse_amount,
+                          parse_day, parse_type, TYPE_INCOME)
+from import_categories import IMPORT_JOB_NAME
 
 DATA_FILENAME = "icost_data.json"
 
@@ -40,8 +54,13 @@ def save_data(wf, data):
     with open(data_file, 'w', encoding='utf-8') as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
 
-def import_from_excel(wf, file_path):
-    """从 Excel 文件导入分类"""
+def import_from_excel(wf, file_path, status=None):
+    """
+    从 Excel 文件导入分类
+
+    Args:
+        status: JobStatus，传入时每读取一行更新一次进度
+    """
     try:
         import openpyxl
     except ImportError:
@@ -57,11 +76,18 @@ def import_from_excel(wf, file_path):
         # 读取表头，找到对应列
         headers = [cell.value for cell in next(sheet.iter_rows(min_row=1, max_row=1))]
         
+        # 总行数（只读模式下来自文件中记录的表格范围，可能没有）
+        if status is not None and sheet.max_row:
+            status.update(total=max(sheet.max_row - 1, 0))
+        
         # 查找列索引
         type_col = None
         cat1_col = None
         cat2_col = None
         account_col = None
+        remark_col = None
+        amount_col = None
+        date_col = None
         
         for idx, header in enumerate(headers):
             if header:
@@ -74,6 +100,12 @@ def import_from_excel(wf, file_path):
                     cat2_col = idx
                 elif '账户' in header_str:
                     account_col = idx
+                elif '备注' in header_str:
+                    remark_col = idx
+                elif '金额' in header_str and amount_col is None:
+                    amount_col = idx
+                elif ('日期' in header_str or '时间' in header_str) and date_col is None:
+                    date_col = idx
         
         # 如果没找到一级分类，尝试找"分类"列
         if cat1_col is None:
@@ -86,8 +118,13 @@ def import_from_excel(wf, file_path):
         expense_categories = {}
         income_categories = {}
         accounts = set()
+        # 交易记录（供 icost:stats 统计）
+        transactions = TransactionStore()
         
         for row in sheet.iter_rows(min_row=2):
+            if status is not None:
+                status.advance()
+            
             # 获取类型（支出/收入）
             record_type = ""
             if type_col is not None and row[type_col].value:
@@ -104,8 +141,23 @@ def import_from_excel(wf, file_path):
                 cat2 = str(row[cat2_col].value).strip()
             
             # 获取账户
+            account = ""
             if account_col is not None and row[account_col].value:
-                accounts.add(str(row[account_col].value).strip())
+                account = str(row[account_col].value).strip()
+                accounts.add(account)
+            
+            # 获取备注
+            remark = ""
+            if remark_col is not None and row[remark_col].value:
+                remark = str(row[remark_col].value).strip()
+            
+            # 记录交易（日期和金额都有效时）
+            if date_col is not None and amount_col is not None:
+                day = parse_day(row[date_col].value)
+                amount_cents = parse_amount(row[amount_col].value)
+                if day is not None and amount_cents is not None:
+                    transactions.add(day, amount_cents, parse_type(record_type),
+                                     cat1, cat2, account, remark)
             
             if not cat1:
                 continue
@@ -158,23 +210,78 @@ def import_from_excel(wf, file_path):
         save_data(wf, existing_data)
         wf.logger.info(f"Data saved to: {get_data_file_path(wf)}")
         
+        # 为所有账户和分类构建拼音索引
+        save_pinyin_index(wf, existing_data)
+        
+        # 构建一次性记账使用的账户/分类查找索引
+        save_lookup_index(wf, existing_data)
+        
+        # 合并交易记录（重复导入相同的账单不会重复计入）
+        store = load_store(wf)
+        added_rows = store.merge(transactions)
+        added = len(added_rows)
+        if added:
+            save_store(wf, store)
+        
+        # 从新增记录的备注学习备注预测模型（同样不会重复计入）
+        learned = learn_records(wf, (
+            (remark, "income" if record_type == TYPE_INCOME else "expense", account, cat2 or cat1)
+            for _, _, record_type, cat1, cat2, account, remark in added_rows
+            if cat1
+        ))
+        
+        # 根据交易记录重新生成预算使用的每月支出累计
+        rebuild_from_store(wf, store)
+        
         expense_cat1_count = len(expense_categories)
         expense_cat2_count = sum(len(v) for v in expense_categories.values())
         income_cat1_count = len(income_categories)
         income_cat2_count = sum(len(v) for v in income_categories.values())
         
-        return f"✅ 导入成功！\n支出: {expense_cat1_count} 个一级分类，{expense_cat2_count} 个二级分类\n收入: {income_cat1_count} 个一级分类，{income_cat2_count} 个二级分类\n账户: {len(accounts)} 个"
+        return f"✅ 导入成功！\n支出: {expense_cat1_count} 个一级分类，{expense_cat2_count} 个二级分类\n收入: {income_cat1_count} 个一级分类，{income_cat2_count} 个二级分类\n账户: {len(accounts)} 个\n备注: 学习了 {learned} 条记录\n交易: 新增 {added} 条（共 {len(store)} 条）"
         
     except Exception as e:
         return f"❌ 导入失败: {str(e)}"
 
+def run_import_job(wf, file_path):
+    """在当前进程中导入，并把进度和结果写入任务状态"""
+    status = JobStatus(IMPORT_JOB_NAME, file=os.path.basename(file_path))
+    result = import_from_excel(wf, file_path, status)
+    wf.logger.info(result)
+    status.finish(error=result if result.startswith("❌") else None, result=result)
+
+
+def start_import_job(wf, file_path):
+    """
+    启动后台导入任务
+
+    Returns:
+        提示信息（显示在 Alfred 通知中）
+    """
+    if not os.path.exists(file_path):
+        return f"❌ 文件不存在: {file_path}"
+    
+    if is_running(IMPORT_JOB_NAME):
+        return "⚠️ 已有导入任务正在进行，输入 icost:import 查看进度"
+    
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", file_path]
+    if run_in_background(IMPORT_JOB_NAME, cmd):
+        return "❌ 无法启动后台导入任务"
+    
+    return f"⏳ 正在后台导入 {os.path.basename(file_path)}\n输入 icost:import 查看进度"
+
+
 def main(wf):
-    file_path = wf.args[0].strip() if wf.args else ""
+    args = wf.args
+    if len(args) == 2 and args[0] == "--worker":
+        run_import_job(wf, args[1])
+        return
+    
+    file_path = args[0].strip() if args else ""
     
     if file_path:
         file_path = os.path.expanduser(file_path)
-        result = import_from_excel(wf, file_path)
-        print(result)
+        print(start_import_job(wf, file_path))
     else:
         print("❌ 未提供文件路径")
 
@@ -5,6 +5,9 @@ iCost Alfred Workflow - 图标下载脚本
 用于在后台下载图标文件并转换为圆角矩形
 
 用法: python download_icons.py <url> <cache_path>
+
+批量下载时通过 workflow.background.JobStatus 报告进度，
+前台脚本用 job_status(icon_manager.BATCH_JOB_NAME) 读取
 """
 
 import os
@@ -12,6 +15,7 @@ import sys
 import urllib.request
 import urllib.error
 import tempfile
+from typing import Optional
 
 
 def make_rounded_corners(image_path: str, radius: int = 20) -> bool:
@@ -66,9 +70,12 @@ def make_rounded_corners(image_path: str, radius: int = 20) -> bool:
         return False
 
 
-def download(url: str, filepath: str):
+def download(url: str, filepath: str) -> Optional[str]:
     """
     下载文件到指定路径，并转换为圆角矩形
+
+    Returns:
+        错误信息，成功时返回 None
     """
     try:
         # 确保目录存在
@@ -83,6 +90,7 @@ def download(url: str, filepath: str):
         
         # 移动到最终位置
         os.rename(temp_path, filepath)
+        return None
         
     except Exception as e:
         # 清理临时文件
@@ -91,6 +99,25 @@ def download(url: str, filepath: str):
             os.remove(temp_path)
         # 记录错误日志到 Alfred debug console
         sys.stderr.write(f"Download failed: {e}\n")
+        return f"{os.path.basename(filepath)}: {e}"
+
+
+def download_batch(tasks: list):
+    """
+    依次下载所有图标，并记录任务进度（完成数量/总数、最后一个错误）
+    """
+    from workflow.background import JobStatus
+    from icon_manager import BATCH_JOB_NAME
+
+    with JobStatus(BATCH_JOB_NAME, total=len(tasks)) as status:
+        for task in tasks:
+            url = task.get("url")
+            path = task.get("path")
+            if url and path and not os.path.exists(path):
+                error = download(url, path)
+                if error:
+                    status.update(error=error)
+            status.advance()
 
 
 if __name__ == "__main__":
@@ -112,11 +139,7 @@ if __name__ == "__main__":
                 os.unlink(tasks_file)
                 
                 # 下载所有图标
-                for task in tasks:
-                    url = task.get("url")
-                    path = task.get("path")
-                    if url and path and not os.path.exists(path):
-                        download(url, path)
+                download_batch(tasks)
         else:
             # 单个下载模式
             download(sys.argv[1], sys.argv[2])
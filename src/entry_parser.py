@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 一次性记账语法解析模块
+解析 "金额 [备注] [@账户] [#一级分类/二级分类]" 格式的输入，例如:
+    50 午餐 @wx #餐饮/午餐
+    +8000 @yhk #工资
+
+账户和分类支持完整名称、别名、拼音和首字母，并且可以只输入前缀
+金额前加 "+" 表示收入；不加时由分类所在的类型决定
+
+用户别名表（aliases.py）编译进查找索引: 简称既是普通的查找键（支持前缀），
+也保存在哈希表中，输入完整简称时直接得到结果
+"""
+
+import bisect
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aliases import load_aliases
+from pinyin_index import INDEX_SERIALIZER, get_pinyin_index
+
+# 查找索引在 cache 目录中的名称（通过 wf.cache_data 保存）
+LOOKUP_INDEX_NAME = "lookup_index"
+
+# 账户和分类的前缀符号
+ACCOUNT_PREFIX = "@"
+CATEGORY_PREFIX = "#"
+CATEGORY_SEPARATOR = "/"
+
+# 内置账户别名
+BUILTIN_ALIASES = {
+    "微信": ["wechat"],
+    "支付宝": ["alipay"],
+    "现金": ["cash"],
+    "银行卡": ["card"],
+}
+
+# 分类索引中的值: (记录类型, 一级分类, 二级分类)，一级分类本身的二级分类为 ""
+Category = Tuple[str, str, str]
+
+
+def parse_entry(query: str, accept: Optional[Callable[[str, str, str], bool]] = None) -> Dict[str, str]:
+    """
+    拆分输入
+
+    每种只取第一个 @账户 / #分类 词；指定 accept 时只取 accept("account" 或 "category",
+    去掉前缀的词, 记录类型) 为真的词（能解析为已知的账户或分类）。
+    其余的词（包括没有被采用的 @/# 词）按原样留在备注中
+
+    Returns:
+        {"amount": "50", "type": "" 或 "income", "remark": "午餐",
+         "account": "wx", "category": "餐饮/午餐"}
+        未输入的部分为空字符串
+    """
+    result = {"amount": "", "type": "", "remark": "", "account": "", "category": ""}
+    remark = []
+
+    for i, token in enumerate(query.split()):
+        if i == 0:
+            if token.startswith("+"):
+                result["type"] = "income"
+                token = token[1:]
+            result["amount"] = token
+            continue
+
+        kind = None
+        if token.startswith(ACCOUNT_PREFIX) and len(token) > 1:
+            kind = "account"
+        elif token.startswith(CATEGORY_PREFIX) and len(token) > 1:
+            kind = "category"
+
+        if (kind and not result[kind]
+                and (accept is None or accept(kind, token[1:], result["type"]))):
+            result[kind] = token[1:]
+        else:
+            remark.append(token)
+
+    result["remark"] = " ".join(remark)
+    return result
+
+
+def _data_source(data: Dict, aliases: Optional[Dict[str, str]] = None) -> Dict:
+    """查找索引对应的数据和用户别名（用于判断索引是否过期）"""
+    return {
+        "accounts": data.get("accounts", []),
+        "expense_categories": data.get("expense_categories", {}),
+        "income_categories": data.get("income_categories", {}),
+        "aliases": aliases or {},
+    }
+
+
+def _lookup_keys(name: str, pinyin_index: Dict[str, List[str]],
+                 user_aliases: Optional[Dict[str, List[str]]] = None,
+                 extra_keys: Optional[List[str]] = None) -> List[str]:
+    """名称的查找键：名称本身、别名、拼音和首字母（均为小写），以及 extra_keys"""
+    keys = [name.lower()] + BUILTIN_ALIASES.get(name, []) + pinyin_index.get(name, [])
+    if user_aliases:
+        keys += user_aliases.get(name, [])
+    if extra_keys:
+        keys += extra_keys
+    return list(dict.fromkeys(keys))
+
+
+def _compile_aliases(aliases: Dict[str, str], account_pairs: List[Tuple[str, str]],
+                     category_pairs: List[Tuple[str, Category]]) -> Dict[str, Dict[str, list]]:
+    """
+    用户别名的哈希查找表（只包含指向现有账户和分类的别名）
+
+    Returns:
+        {"accounts": {简称: [账户名]}, "categories": {简称: [(类型, 一级分类, 二级分类), ...]}}
+    """
+    accounts = {value for _, value in account_pairs}
+    categories: Dict[str, List[Category]] = {}
+    for _, category in category_pairs:
+        name = category[2] or category[1]
+        path = CATEGORY_SEPARATOR.join(filter(None, category[1:]))
+        for key in (name, path):
+            if category not in categories.setdefault(key, []):
+                categories[key].append(category)
+
+    compiled = {"accounts": {}, "categories": {}}
+    for alias, name in aliases.items():
+        if name in accounts:
+            compiled["accounts"][alias] = [name]
+        if name in categories:
+            compiled["categories"][alias] = categories[name]
+    return compiled
+
+
+def _sorted_entries(pairs: List[Tuple[str, object]]) -> Dict[str, list]:
+    """按查找键排序，保存为两个平行列表（便于二分查找前缀）"""
+    pairs.sort(key=lambda pair: pair[0])
+    return {"keys": [key for key, _ in pairs], "values": [value for _, value in pairs]}
+
+
+def build_lookup_index(data: Dict, pinyin_index: Dict[str, List[str]],
+                       aliases: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    构建账户和分类的查找索引
+
+    Args:
+        data: 分类和账户数据
+        pinyin_index: 拼音索引
+        aliases: 用户别名 {小写的简称: 账户名、分类名或 "一级分类/二级分类"}
+
+    Returns:
+        {"source": 构建时的数据,
+         "accounts": {"keys": [...], "values": [账户名, ...]},
+         "categories": {"keys": [...], "values": [(类型, 一级分类, 二级分类), ...]},
+         "aliases": _compile_aliases 的哈希查找表}
+    """
+    aliases = aliases or {}
+    user_aliases: Dict[str, List[str]] = {}
+    path_aliases: Dict[Tuple[str, str], List[str]] = {}
+    for alias, name in aliases.items():
+        if CATEGORY_SEPARATOR in name:
+            # "一级分类/二级分类" 的别名只作为该一级分类下的二级分类的查找键，
+            # 不加到其他一级分类下的同名二级分类
+            cat1, cat2 = name.split(CATEGORY_SEPARATOR, 1)
+            path_aliases.setdefault((cat1, cat2), []).append(alias)
+        else:
+            user_aliases.setdefault(name, []).append(alias)
+
+    account_pairs = []
+    for account in data.get("accounts", []):
+        for key in _lookup_keys(account, pinyin_index, user_aliases):
+            account_pairs.append((key, account))
+
+    category_pairs = []
+    for record_type in ("expense", "income"):
+        for cat1, cat2_list in data.get(f"{record_type}_categories", {}).items():
+            for key in _lookup_keys(cat1, pinyin_index, user_aliases):
+                category_pairs.append((key, (record_type, cat1, "")))
+            for cat2 in cat2_list:
+                for key in _lookup_keys(cat2, pinyin_index, user_aliases,
+                                        path_aliases.get((cat1, cat2))):
+                    category_pairs.append((key, (record_type, cat1, cat2)))
+
+    return {
+        "source": _data_source(data, aliases),
+        "aliases": _compile_aliases(aliases, account_pairs, category_pairs),
+        "accounts": _sorted_entries(account_pairs),
+        "categories": _sorted_entries(category_pairs),
+    }
+
+
+def save_lookup_index(wf, data: Dict) -> Dict:
+    """构建查找索引并保存到 cache 目录（导入时调用）"""
+    index = build_lookup_index(data, get_pinyin_index(wf, data), load_aliases(wf)["aliases"])
+    wf.cache_data(LOOKUP_INDEX_NAME, index, serializer=INDEX_SERIALIZER)
+    return index
+
+
+def get_lookup_index(wf, data: Dict) -> Dict:
+    """获取查找索引（从 cache 目录读取，数据或别名表变化时重新构建）"""
+    index = wf.cached_data(LOOKUP_INDEX_NAME, max_age=0, serializer=INDEX_SERIALIZER)
+    if (index is None or "aliases" not in index
+            or index.get("source") != _data_source(data, load_aliases(wf)["aliases"])):
+        index = save_lookup_index(wf, data)
+    return index
+
+
+def lookup(entries: Dict[str, list], token: str, accept=None) -> list:
+    """
+    在排好序的查找键中查找
+    有完全匹配的键时只返回完全匹配的结果，否则返回所有前缀匹配的结果（去重，保持顺序）
+
+    Args:
+        entries: 排好序的查找键和值
+        token: 输入（名称、别名、拼音或它们的前缀）
+        accept: 可选的过滤函数，只保留 accept(value) 为真的值
+    """
+    token = token.lower()
+    keys = entries["keys"]
+    values = entries["values"]
+
+    exact = []
+    prefix = []
+    i = bisect.bisect_left(keys, token)
+    while i < len(keys) and keys[i].startswith(token):
+        if accept is None or accept(values[i]):
+            (exact if keys[i] == token else prefix).append(values[i])
+        i += 1
+
+    return list(dict.fromkeys(exact or prefix))
+
+
+def lookup_alias(index: Dict, kind: str, token: str, accept=None) -> Optional[list]:
+    """
+    在用户别名的哈希表中查找完整的简称
+
+    Args:
+        kind: "accounts" 或 "categories"
+
+    Returns:
+        匹配的值列表；token 不是简称（或 accept 过滤后为空）时返回 None
+    """
+    values = index["aliases"][kind].get(token.lower())
+    if values and accept is not None:
+        values = [value for value in values if accept(value)]
+    return list(values) if values else None
+
+
+def resolve_account(index: Dict, token: str) -> List[str]:
+    """解析账户，返回候选账户列表"""
+    return lookup_alias(index, "accounts", token) or lookup(index["accounts"], token)
+
+
+def resolve_category(index: Dict, data: Dict, token: str,
+                     record_type: Optional[str] = None) -> List[Category]:
+    """
+    解析分类，返回可以直接记账的候选分类列表
+
+    "一级/二级" 先匹配一级分类，再在其二级分类中匹配；只输入一个名称时匹配所有分类，
+    匹配到的一级分类如果有二级分类，则展开为它的所有二级分类
+
+    Args:
+        index: 查找索引
+        data: 分类和账户数据
+        token: 分类输入（不含 "#"）
+        record_type: 限定记录类型 ("expense"/"income")，None 表示不限
+    """
+    entries = index["categories"]
+
+    def find(token: str, accept) -> list:
+        return lookup_alias(index, "categories", token, accept) or lookup(entries, token, accept)
+
+    if CATEGORY_SEPARATOR in token:
+        token1, token2 = token.split(CATEGORY_SEPARATOR, 1)
+        parents = find(token1, lambda c: not c[2] and record_type in (None, c[0]))
+        if token2:
+            parent_keys = {c[:2] for c in parents}
+            matches = find(token2, lambda c: c[2] and c[:2] in parent_keys)
+        else:
+            matches = parents
+    else:
+        matches = find(token, lambda c: record_type in (None, c[0]))
+
+    candidates = []
+    for t, c1, c2 in matches:
+        children = data.get(f"{t}_categories", {}).get(c1, [])
+        if c2 or not children:
+            candidates.append((t, c1, c2))
+        else:
+            candidates.extend((t, c1, child) for child in children)
+
+    return list(dict.fromkeys(candidates))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 反馈模板缓存模块
+账户列表和一级分类列表的输出只有金额、备注等少数字段随输入变化，
+因此把渲染好的 JSON 反馈保存为模板，之后只替换这些字段直接输出，
+跳过逐个 add_item 和 json 序列化
+
+模板按 (步骤, 记录类型) 保存，并记录生成时的版本:
+(数据文件, 使用频率文件, 图标缓存目录, 手动选择的图标, 别名表) 的修改时间，任一变化时重新生成
+"""
+
+import io
+import json
+import os
+import sys
+from typing import Dict, Optional, Tuple
+
+from workflow.util import file_version
+from aliases import get_aliases_path
+from icon_manager import get_icon_overrides_path
+
+# 模板在 cache 目录中的名称前缀（通过 wf.cache_data 保存）
+FEEDBACK_CACHE_PREFIX = "feedback_"
+
+# 模板只包含字符串和元组，使用加载更快的 marshal 格式
+TEMPLATE_SERIALIZER = "marshal"
+
+# 模板格式版本（修改脚本输出格式时递增，使旧模板失效）
+TEMPLATE_FORMAT = 1
+
+# 模板中的占位符格式
+PLACEHOLDER = "@@{}@@"
+
+DATA_FILENAME = "icost_data.json"
+FREQUENCY_FILENAME = "usage_frequency.json"
+
+
+def template_key(wf, step: str, record_type: str) -> Tuple:
+    """
+    模板的版本键: (步骤, 记录类型, 数据版本, 使用频率版本, 图标缓存版本, 手动图标版本, 别名表版本)
+    图标下载完成时图标目录的修改时间会变化，从而使用新下载的图标重新生成模板
+    """
+    return (
+        TEMPLATE_FORMAT,
+        step,
+        record_type,
+        file_version(wf.cachefile(DATA_FILENAME)),
+        file_version(wf.cachefile(FREQUENCY_FILENAME)),
+        file_version(os.path.join(wf.cachedir, "icons")),
+        file_version(get_icon_overrides_path(wf)),
+        file_version(get_aliases_path(wf)),
+    )
+
+
+def placeholders(values: Dict[str, str]) -> Dict[str, str]:
+    """返回与 values 相同键的占位符，例如 {"amount": "@@amount@@"}"""
+    return {name: PLACEHOLDER.format(name) for name in values}
+
+
+def render(template: str, values: Dict[str, str]) -> str:
+    """
+    将模板中的占位符替换为实际值
+
+    占位符可能出现在两层 JSON 编码中:
+    - 标题、副标题中: 直接作为字符串的一部分，只需一层转义
+    - arg 中: arg 本身是 json.dumps 生成的字符串，占位符是其中一个完整的字符串值，
+      在模板里表现为 \\"@@name@@\\"，需要两层转义
+    """
+    for name, value in values.items():
+        placeholder = PLACEHOLDER.format(name)
+        quoted = json.dumps(placeholder)
+        template = template.replace(json.dumps(quoted)[1:-1],
+                                    json.dumps(json.dumps(value))[1:-1])
+        template = template.replace(placeholder, json.dumps(value)[1:-1])
+    return template
+
+
+def send_cached_feedback(wf, step: str, record_type: str, values: Dict[str, str]) -> bool:
+    """
+    如果有与当前版本一致的模板，替换字段后直接输出
+
+    Returns:
+        是否已输出
+    """
+    cached = wf.cached_data(FEEDBACK_CACHE_PREFIX + step, max_age=0,
+                            serializer=TEMPLATE_SERIALIZER)
+    if not cached:
+        return False
+
+    template = cached.get(record_type)
+    if template is None or template[0] != template_key(wf, step, record_type):
+        return False
+
+    with wf.phase("feedback"):
+        sys.stdout.write(render(template[1], values))
+        sys.stdout.flush()
+    return True
+
+
+def send_template_feedback(wf, step: str, record_type: str, values: Dict[str, str]):
+    """
+    将使用占位符生成的反馈保存为模板，然后替换字段输出
+
+    有图标正在下载（设置了 rerun）时不保存模板，等图标下载完成后再生成
+    """
+    out = io.StringIO()
+    with wf.phase("feedback"):
+        wf.write_feedback(out)
+    template = out.getvalue()
+
+    if not wf.rerun:
+        cached: Optional[Dict] = wf.cached_data(FEEDBACK_CACHE_PREFIX + step, max_age=0,
+                                                serializer=TEMPLATE_SERIALIZER)
+        # cached_data 返回的对象是共享的，复制后再修改
+        cached = dict(cached or {})
+        cached[record_type] = (template_key(wf, step, record_type), template)
+        wf.cache_data(FEEDBACK_CACHE_PREFIX + step, cached, serializer=TEMPLATE_SERIALIZER)
+
+    with wf.phase("feedback"):
+        sys.stdout.write(render(template, values))
+        sys.stdout.flush()
@@ -8,6 +8,7 @@ iCost Alfred Workflow - 使用频率记录模块
 import json
 import os
 import sys
+import time
 import urllib.parse
 from typing import Dict, List, Optional
 
@@ -19,6 +20,12 @@ from workflow import Workflow3
 # 频率数据文件名
 FREQUENCY_FILENAME = "usage_frequency.json"
 
+# 最近使用加成的半衰期（天）
+RECENCY_HALF_LIFE_DAYS = 30
+
+# 缓存：已加载的频率数据 (文件路径, (修改时间, 大小), 数据)，文件未变化时不重复读取
+_frequency_cache: Optional[tuple] = None
+
 
 def get_frequency_file_path(wf) -> str:
     """获取频率数据文件路径"""
@@ -32,14 +39,27 @@ def load_frequency_data(wf) -> Dict:
     Returns:
         {
             "accounts": {"微信": 10, "支付宝": 5, ...},
-            "categories": {"餐饮": 20, "交通": 15, ...}
+            "categories": {"餐饮": 20, "交通": 15, ...},
+            "last_used": {"accounts": {"微信": 1700000000.0}, "categories": {...}}
         }
+        文件未变化时返回同一个对象，修改后需调用 save_frequency_data 保存
     """
+    global _frequency_cache
     freq_file = get_frequency_file_path(wf)
-    if os.path.exists(freq_file):
+    try:
+        st = os.stat(freq_file)
+    except OSError:
+        st = None
+    
+    if st:
+        stamp = (st.st_mtime_ns, st.st_size)
+        if _frequency_cache and _frequency_cache[:2] == (freq_file, stamp):
+            return _frequency_cache[2]
         try:
             with open(freq_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
+            _frequency_cache = (freq_file, stamp, data)
+            return data
         except (json.JSONDecodeError, IOError):
             pass
     
@@ -66,14 +86,18 @@ def record_usage(wf, account: str, category: str):
         category: 分类名（二级分类）
     """
     data = load_frequency_data(wf)
+    now = time.time()
+    last_used = data.setdefault("last_used", {})
     
     # 更新账户频率
     if account:
         data["accounts"][account] = data["accounts"].get(account, 0) + 1
+        last_used.setdefault("accounts", {})[account] = now
     
     # 更新分类频率
     if category:
         data["categories"][category] = data["categories"].get(category, 0) + 1
+        last_used.setdefault("categories", {})[category] = now
     
     save_frequency_data(wf, data)
 
@@ -106,6 +130,8 @@ def parse_icost_url(url: str) -> Dict[str, str]:
             result["category"] = params["category"][0]
         if "amount" in params:
             result["amount"] = params["amount"][0]
+        if "remark" in params:
+            result["remark"] = params["remark"][0]
         
         # 记录类型（expense/income）
         result["type"] = parsed.netloc or parsed.path.strip("/")
@@ -118,7 +144,8 @@ def parse_icost_url(url: str) -> Dict[str, str]:
 
 def record_from_url(wf, url: str):
     """
-    从 iCost URL 解析并记录使用频率
+    从 iCost URL 解析并记录使用频率，带备注时同时学习备注预测模型，
+    支出同时累计到本月的预算统计
     
     Args:
         wf: Workflow3 实例
@@ -131,11 +158,22 @@ def record_from_url(wf, url: str):
     if account or category:
         record_usage(wf, account, category)
         wf.logger.info(f"Recorded usage: account={account}, category={category}")
+    
+    remark = parsed.get("remark", "")
+    if remark:
+        # 只在用到时导入，选择步骤导入 habbit 时不加载
+        from remark_model import record_remark
+        record_remark(wf, remark, parsed.get("type", "expense"), account, category)
+    
+    if parsed.get("type", "expense") == "expense" and parsed.get("amount"):
+        # 只在用到时导入（spending_totals 会加载交易记录存储）
+        from spending_totals import record_spending
+        record_spending(wf, parsed["amount"], category, account)
 
 
 def sort_by_frequency(wf, items: List[str], item_type: str = "accounts") -> List[str]:
     """
-    按使用频率排序列表
+    按使用频率排序列表（frecency：使用次数，最近使用过的加成）
     
     Args:
         wf: Workflow3 实例
@@ -143,13 +181,41 @@ def sort_by_frequency(wf, items: List[str], item_type: str = "accounts") -> List
         item_type: 类型 ("accounts" 或 "categories")
     
     Returns:
-        按频率降序排列的列表
+        按 frecency 降序排列的列表
+    """
+    with wf.phase("frequency sort"):
+        scores = frecency_scores(wf, item_type)
+    
+        # 按得分降序排序，得分相同则保持原顺序
+        return sorted(items, key=lambda x: scores.get(x, 0), reverse=True)
+
+
+def frecency_scores(wf, item_type: str = "accounts") -> Dict[str, float]:
+    """
+    计算综合使用频率和最近使用时间的得分（frecency）
+    得分 = 使用次数 × (1 + 最近使用加成)，加成随距上次使用的时间按半衰期衰减（0~1）
+    
+    Args:
+        wf: Workflow3 实例
+        item_type: 类型 ("accounts" 或 "categories")
+    
+    Returns:
+        {名称: 得分}
     """
     data = load_frequency_data(wf)
     freq_dict = data.get(item_type, {})
-    
-    # 按频率降序排序，频率相同则保持原顺序
-    return sorted(items, key=lambda x: freq_dict.get(x, 0), reverse=True)
+    last_used = data.get("last_used", {}).get(item_type, {})
+    
+    now = time.time()
+    half_life = RECENCY_HALF_LIFE_DAYS * 86400
+    scores = {}
+    for name, count in freq_dict.items():
+        bonus = 0.0
+        if name in last_used:
+            bonus = 0.5 ** (max(now - last_used[name], 0) / half_life)
+        scores[name] = count * (1 + bonus)
+    
+    return scores
 
 
 def main(wf):
@@ -3,16 +3,23 @@
 """
 iCost Alfred Workflow - 图标管理模块
 负责搜索匹配图标并从 GitHub 异步下载到缓存目录
+
+自动匹配的图标不合适时，可以用 icost:icon（icon_picker.py）手动选择，
+手动选择的图标保存在 data 目录的 icon_overrides.json 中，查找时优先使用；
+别名表（aliases.py）中的 "icons" 也合并到其中
 """
 
 import os
 import json
 import sys
 import re
+import time
 import urllib.parse
 from typing import Optional, Dict
 
-from workflow.background import run_in_background, is_running
+from workflow.background import run_in_background, is_running, job_status
+from workflow.util import file_version
+from aliases import get_aliases_path, load_aliases
 
 # GitHub 仓库信息
 GITHUB_REPO = "zzkkyys/Alfred-Simple-iCost"
@@ -25,12 +32,33 @@ MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 ICONS_JSON_PATH = os.path.join(MODULE_DIR, "icons.json")
 DOWNLOAD_SCRIPT = os.path.join(MODULE_DIR, "download_icons.py")
 
+# 批量下载的后台任务名（download_icons.py 也使用；不从那里导入，避免加载 urllib.request）
+BATCH_JOB_NAME = "icon_batch_download"
+
 # 默认图标
 DEFAULT_ICON = "icon.png"
 
+# 上次批量下载出错后，等待多久再重新下载（秒），避免无法下载时不停重试
+DOWNLOAD_RETRY_INTERVAL = 60
+
+# 手动选择的图标 {名称: 图标文件名}，保存在 data 目录（清除缓存时不会丢失）
+ICON_OVERRIDES_FILENAME = "icon_overrides.json"
+
+# 图标文件名的后缀（小写），去掉后缀得到图标名称
+ICON_SUFFIXES = ['_normal@3x.png', '_normal@2x.png', '_normal.png', '.png', '.jpg', '.icns']
+
+# 别名表中图标的解析结果在 cache 目录中的名称（通过 wf.cache_data 保存）
+ALIAS_ICONS_NAME = "alias_icons"
+
+# 解析结果包含元组（版本），使用 marshal 格式
+ALIAS_ICONS_SERIALIZER = "marshal"
+
 # 缓存：图标索引（避免每次都遍历）
 _icons_index: Optional[Dict[str, str]] = None
 
+# 缓存：手动选择的图标（合并了别名表中的图标）
+_icon_overrides: Optional[Dict[str, str]] = None
+
 
 def normalize_item_name(item_name: str) -> str:
     """
@@ -64,6 +92,15 @@ def load_icons_list() -> list:
     return []
 
 
+def strip_icon_suffix(icon_name: str) -> str:
+    """去掉图标文件名的后缀，例如 "color_food_3_Normal@2x.png" -> "color_food_3" """
+    lower = icon_name.lower()
+    for suffix in ICON_SUFFIXES:
+        if lower.endswith(suffix):
+            return icon_name[:-len(suffix)]
+    return icon_name
+
+
 def build_icons_index(icons_list: list) -> Dict[str, str]:
     """
     构建图标索引，将关键词映射到图标文件名
@@ -75,13 +112,8 @@ def build_icons_index(icons_list: list) -> Dict[str, str]:
     index = {}
     
     for icon_name in icons_list:
-        # 从文件名中提取关键词
-        base_name = icon_name.lower()
-        # 移除常见后缀
-        for suffix in ['_normal@3x.png', '_normal@2x.png', '_normal.png', '.png', '.jpg', '.icns']:
-            if base_name.endswith(suffix):
-                base_name = base_name[:-len(suffix)]
-                break
+        # 从文件名中提取关键词（移除常见后缀）
+        base_name = strip_icon_suffix(icon_name).lower()
         
         # 提取关键词（移除前缀如 color_, account_）
         keyword = base_name
@@ -109,13 +141,101 @@ def get_icons_index() -> Dict[str, str]:
     return _icons_index
 
 
-def find_icon_for_item(item_name: str, icons_list: Optional[list] = None) -> Optional[str]:
+def get_icon_overrides_path(wf) -> str:
+    """获取手动选择的图标文件路径"""
+    return wf.datafile(ICON_OVERRIDES_FILENAME)
+
+
+def load_picked_icons(wf) -> Dict[str, str]:
+    """读取 icost:icon 手动选择的图标 {名称: 图标文件名}"""
+    overrides_file = get_icon_overrides_path(wf)
+    if os.path.exists(overrides_file):
+        try:
+            with open(overrides_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+    return {}
+
+
+def resolve_icon_reference(icon: str) -> Optional[str]:
+    """别名表中的图标 -> 图标文件名（可以写文件名，也可以写图标关键词，如 "招商银行"）"""
+    if strip_icon_suffix(icon) != icon:
+        return icon
+    return get_icons_index().get(icon.lower()) or find_icon_for_item(icon)
+
+
+def get_alias_icons(wf) -> Dict[str, str]:
+    """
+    别名表中的图标 {完整名称: 图标文件名}
+    图标关键词需要模糊匹配，因此只在别名表或 icons.json 变化时解析，结果保存在 cache 目录
+    """
+    icons = load_aliases(wf)["icons"]
+    if not icons:
+        return {}
+
+    version = (file_version(get_aliases_path(wf)), file_version(ICONS_JSON_PATH))
+    cached = wf.cached_data(ALIAS_ICONS_NAME, max_age=0, serializer=ALIAS_ICONS_SERIALIZER)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    resolved = {}
+    for name, icon in icons.items():
+        icon_filename = resolve_icon_reference(icon)
+        if icon_filename:
+            resolved[name] = icon_filename
+    wf.cache_data(ALIAS_ICONS_NAME, (version, resolved), serializer=ALIAS_ICONS_SERIALIZER)
+    return resolved
+
+
+def get_icon_overrides(wf) -> Dict[str, str]:
+    """
+    获取优先于自动匹配的图标 {名称: 图标文件名}（使用缓存）
+    别名表中的图标在前，手动选择的图标覆盖它们；简称也映射到完整名称的图标
+    """
+    global _icon_overrides
+    if _icon_overrides is None:
+        aliases = load_aliases(wf)
+        overrides = dict(get_alias_icons(wf))
+        overrides.update(load_picked_icons(wf))
+        for alias, name in aliases["aliases"].items():
+            if name in overrides:
+                overrides.setdefault(alias, overrides[name])
+        _icon_overrides = overrides
+    return _icon_overrides
+
+
+def set_icon_override(wf, item_name: str, icon_filename: Optional[str]):
+    """
+    保存手动选择的图标
+
+    Args:
+        item_name: 账户名或分类名
+        icon_filename: icons.json 中的图标文件名，None 表示恢复自动匹配
+    """
+    picked = load_picked_icons(wf)
+    if icon_filename:
+        picked[item_name] = icon_filename
+    else:
+        picked.pop(item_name, None)
+
+    with open(get_icon_overrides_path(wf), 'w', encoding='utf-8') as f:
+        json.dump(picked, f, ensure_ascii=False, indent=2)
+
+    # 下次使用时重新合并
+    global _icon_overrides
+    _icon_overrides = None
+
+
+def find_icon_for_item(item_name: str, icons_list: Optional[list] = None,
+                       overrides: Optional[Dict[str, str]] = None) -> Optional[str]:
     """
     为给定的 item 名称查找匹配的图标文件名（使用索引快速查找）
     
     Args:
         item_name: 要匹配的名称（如账户名、分类名）
         icons_list: 图标列表（已弃用，保留兼容性）
+        overrides: 手动选择的图标（get_icon_overrides），优先于自动匹配
     
     Returns:
         匹配的图标文件名，如果没有找到则返回 None
@@ -123,6 +243,10 @@ def find_icon_for_item(item_name: str, icons_list: Optional[list] = None) -> Opt
     if not item_name:
         return None
     
+    # 手动选择的图标
+    if overrides and item_name in overrides:
+        return overrides[item_name]
+    
     # 规范化名称：去掉末尾数字（如"餐饮1" -> "餐饮"）
     normalized_name = normalize_item_name(item_name)
     item_lower = normalized_name.lower()
@@ -171,17 +295,47 @@ def queue_icon_download(wf, icon_filename: str, cache_path: str):
     _pending_downloads.append((icon_url, cache_path))
 
 
+def add_download_progress(wf, status: Optional[Dict]):
+    """在列表末尾显示图标下载进度（不可选择）"""
+    done = status.get("done", 0) if status else 0
+    total = status.get("total", 0) if status else 0
+    error = status.get("error") if status else None
+    wf.add_item(
+        title=f"⏳ 正在下载图标 {done}/{total}" if total else "⏳ 正在下载图标",
+        subtitle=f"最近的错误: {error}" if error else "下载完成后自动显示",
+        uid="icon_download_progress",
+        icon=DEFAULT_ICON,
+        valid=False
+    )
+
+
 def flush_download_queue(wf):
     """
     启动后台任务下载所有队列中的图标（批量下载）
+
+    根据下载任务的状态决定是否自动重新运行:
+    - 正在下载: 显示进度，并在 1 秒后重新运行以显示新下载的图标
+    - 上次下载刚刚出错结束: 暂不重试，也不重新运行
+    - 其他情况: 启动新的下载任务并重新运行
     """
     global _pending_downloads
     
     if not _pending_downloads:
         return
     
-    # 检查是否已有下载任务在运行
-    if is_running("icon_batch_download"):
+    status = job_status(BATCH_JOB_NAME)
+
+    # 检查是否已有下载任务在运行（状态已是完成时说明任务正在退出）
+    if is_running(BATCH_JOB_NAME):
+        if not (status and status.get("finished")):
+            add_download_progress(wf, status)
+        wf.rerun = 1.0
+        return
+
+    if (status and status.get("error") and status.get("finished")
+            and time.time() - status["finished"] < DOWNLOAD_RETRY_INTERVAL):
+        wf.logger.debug(f"Icon download failed recently, not retrying: {status['error']}")
+        _pending_downloads = []
         return
     
     # 将下载任务写入临时文件
@@ -193,7 +347,7 @@ def flush_download_queue(wf):
     
     # 启动批量下载脚本
     cmd = [sys.executable, DOWNLOAD_SCRIPT, "--batch", tasks_file]
-    run_in_background("icon_batch_download", cmd)
+    run_in_background(BATCH_JOB_NAME, cmd)
     
     # 清空队列
     _pending_downloads = []
@@ -202,9 +356,20 @@ def flush_download_queue(wf):
     wf.rerun = 1.0
 
 
+def get_icon_path(wf, icon_filename: str) -> str:
+    """
+    获取图标文件的缓存路径，还没有下载时加入下载队列并返回默认图标
+    """
+    cache_path = get_icon_cache_path(wf, icon_filename)
+    if os.path.exists(cache_path):
+        return cache_path
+    queue_icon_download(wf, icon_filename, cache_path)
+    return DEFAULT_ICON
+
+
 def get_icon_for_item(wf, item_name: str, icons_list: Optional[list] = None) -> str:
     """
-    获取 item 对应的图标路径
+    获取 item 对应的图标路径（手动选择的图标优先）
     
     如果缓存中存在则直接返回缓存路径
     如果不存在则加入下载队列并返回默认图标
@@ -217,23 +382,24 @@ def get_icon_for_item(wf, item_name: str, icons_list: Optional[list] = None) ->
     Returns:
         图标路径（缓存路径或默认图标）
     """
-    # 查找匹配的图标
-    icon_filename = find_icon_for_item(item_name, icons_list)
+    with wf.phase("icon resolution"):
+        # 查找匹配的图标
+        icon_filename = find_icon_for_item(item_name, icons_list, get_icon_overrides(wf))
     
-    if not icon_filename:
-        return DEFAULT_ICON
+        if not icon_filename:
+            return DEFAULT_ICON
     
-    # 检查缓存
-    cache_path = get_icon_cache_path(wf, icon_filename)
+        # 检查缓存
+        cache_path = get_icon_cache_path(wf, icon_filename)
     
-    if os.path.exists(cache_path):
-        return cache_path
+        if os.path.exists(cache_path):
+            return cache_path
     
-    # 加入下载队列（不立即下载）
-    queue_icon_download(wf, icon_filename, cache_path)
+        # 加入下载队列（不立即下载）
+        queue_icon_download(wf, icon_filename, cache_path)
     
-    # 返回默认图标
-    return DEFAULT_ICON
+        # 返回默认图标
+        return DEFAULT_ICON
 
 
 def preload_icons(wf, item_names: list, icons_list: Optional[list] = None):
@@ -246,14 +412,16 @@ def preload_icons(wf, item_names: list, icons_list: Optional[list] = None):
         item_names: 要预加载的 item 名称列表
         icons_list: 图标列表（已弃用）
     """
-    for item_name in item_names:
-        icon_filename = find_icon_for_item(item_name)
+    with wf.phase("icon resolution"):
+        overrides = get_icon_overrides(wf)
+        for item_name in item_names:
+            icon_filename = find_icon_for_item(item_name, overrides=overrides)
         
-        if icon_filename:
-            cache_path = get_icon_cache_path(wf, icon_filename)
+            if icon_filename:
+                cache_path = get_icon_cache_path(wf, icon_filename)
             
-            if not os.path.exists(cache_path):
-                queue_icon_download(wf, icon_filename, cache_path)
+                if not os.path.exists(cache_path):
+                    queue_icon_download(wf, icon_filename, cache_path)
     
-    # 批量启动下载
-    flush_download_queue(wf)
+        # 批量启动下载
+        flush_download_queue(wf)
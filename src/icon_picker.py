@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 图标选择
+自动匹配的图标不合适（或没有匹配到）时，为账户或分类手动选择图标
+
+用法（关键词 icost:icon）:
+    icost:icon                    列出所有账户和分类及当前图标
+    icost:icon 招商               过滤账户和分类
+    icost:icon 招商银行           搜索与名称匹配的图标
+    icost:icon 招商银行 bank      搜索与 "bank" 匹配的图标
+    icost:icon 招商银行 bank #2   第 2 页
+
+回车保存选择（保存在 icon_overrides.json，icon_manager.find_icon_for_item 优先使用，
+也优先于别名表 aliases.json 中指定的图标）。
+图标搜索使用预先构建的过滤索引（图标名称和中文名称的拼音，保存在 cache 目录），
+显示当前页时预先下载下一页的图标。
+条目不设置 uid，保持按匹配度排序
+"""
+
+import json
+import re
+import sys
+import os
+from typing import List
+
+# 添加 workflow 包路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from workflow import FilterIndex, Workflow3
+from icon_manager import (DEFAULT_ICON, find_icon_for_item, flush_download_queue,
+                          get_icon_for_item, get_icon_overrides, get_icon_path,
+                          load_icons_list, load_picked_icons, normalize_item_name,
+                          set_icon_override, strip_icon_suffix)
+from pinyin_index import collect_names, pinyin_keys
+
+DATA_FILENAME = "icost_data.json"
+
+# 图标过滤索引在 cache 目录中的名称（通过 wf.cache_data 保存）
+ICON_INDEX_NAME = "icon_picker_index"
+
+# 每页显示的图标数
+PAGE_SIZE = 20
+
+# 页码的格式，例如 "#2"
+PAGE_PATTERN = re.compile(r'^#(\d+)$')
+
+
+def load_data(wf):
+    """加载分类和账户数据（从 cache 目录）"""
+    data_file = wf.cachefile(DATA_FILENAME)
+    if os.path.exists(data_file):
+        with open(data_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"accounts": [], "expense_categories": {}, "income_categories": {}}
+
+
+def picker_icons() -> List[str]:
+    """图标列表，同一个图标的不同尺寸只保留第一个"""
+    icons = {}
+    for icon_name in load_icons_list():
+        icons.setdefault(strip_icon_suffix(icon_name), icon_name)
+    return list(icons.values())
+
+
+def icon_title(icon_name: str) -> str:
+    """图标的显示名称，例如 "color_food_3_Normal@2x.png" -> "color food 3" """
+    return strip_icon_suffix(icon_name).replace("_", " ")
+
+
+def icon_search_keys(icon_name: str) -> List[str]:
+    """图标的搜索键: 显示名称及其拼音（中文名称的图标，如银行）"""
+    title = icon_title(icon_name)
+    return [title] + pinyin_keys(title)
+
+
+def get_icon_index(wf) -> FilterIndex:
+    """获取图标的过滤索引（从 cache 目录读取，图标列表变化时重新构建）"""
+    icons = picker_icons()
+    index = wf.cached_data(ICON_INDEX_NAME, max_age=0)
+    if index is None or index.items != icons:
+        index = FilterIndex(icons, key=icon_search_keys)
+        wf.cache_data(ICON_INDEX_NAME, index)
+    return index
+
+
+def show_names(wf, names: List[str], query: str):
+    """列出（过滤后的）账户和分类，Tab 进入图标搜索"""
+    if query:
+        names = wf.filter(query, names, key=lambda name: " ".join([name] + pinyin_keys(name)))
+
+    overrides = get_icon_overrides(wf)
+    picked = load_picked_icons(wf)
+    for name in names:
+        if name in picked:
+            subtitle = "手动选择的图标"
+        elif name in overrides:
+            subtitle = "别名表中指定的图标，Tab 选择其他图标"
+        else:
+            subtitle = "自动匹配的图标，Tab 选择其他图标"
+        wf.add_item(
+            title=name,
+            subtitle=subtitle,
+            icon=get_icon_for_item(wf, name),
+            autocomplete=f"{name} ",
+            valid=False
+        )
+
+    if query and not names:
+        wf.add_item(
+            title=f"为 \"{query}\" 选择图标",
+            subtitle="没有这个账户或分类，Tab 仍然可以为它选择图标",
+            icon=DEFAULT_ICON,
+            autocomplete=f"{query} ",
+            valid=False
+        )
+
+
+def show_icons(wf, name: str, search: str, page: int):
+    """搜索图标并显示第 page 页（从 1 开始），同时预先下载下一页的图标"""
+    current = find_icon_for_item(name, overrides=get_icon_overrides(wf))
+    picked = load_picked_icons(wf)
+
+    if page == 1 and name in picked:
+        wf.add_item(
+            title="恢复自动匹配",
+            subtitle=f"当前手动选择: {icon_title(picked[name])}",
+            arg=json.dumps({"item": name, "icon": None}, ensure_ascii=False),
+            icon=get_icon_for_item(wf, name),
+            valid=True
+        )
+
+    search = search or normalize_item_name(name)
+    index = get_icon_index(wf)
+    # 多取一页，用于判断是否有下一页并预先下载
+    icons = wf.filter(search, index, max_results=(page + 1) * PAGE_SIZE)
+    start = (page - 1) * PAGE_SIZE
+    current_page = icons[start:start + PAGE_SIZE]
+    next_page = icons[start + PAGE_SIZE:]
+
+    for icon_name in current_page:
+        wf.add_item(
+            title=icon_title(icon_name),
+            subtitle=f"{'✅ 当前图标 · ' if icon_name == current else ''}回车设为 \"{name}\" 的图标",
+            arg=json.dumps({"item": name, "icon": icon_name}, ensure_ascii=False),
+            icon=get_icon_path(wf, icon_name),
+            valid=True
+        )
+
+    if next_page:
+        for icon_name in next_page:
+            get_icon_path(wf, icon_name)
+        wf.add_item(
+            title="下一页",
+            subtitle=f"第 {page + 1} 页",
+            icon=DEFAULT_ICON,
+            autocomplete=f"{name} {search} #{page + 1}",
+            valid=False
+        )
+    elif not current_page:
+        wf.add_item(
+            title=f"没有与 \"{search}\" 匹配的图标",
+            subtitle=f"输入 \"{name} 关键词\" 搜索，例如: {name} bank",
+            icon=DEFAULT_ICON,
+            autocomplete=f"{name} ",
+            valid=False
+        )
+
+
+def main(wf):
+    args = wf.args
+    if len(args) == 2 and args[0] == "--set":
+        # 由 Alfred 的 Run Script 调用，保存选择
+        params = json.loads(args[1])
+        set_icon_override(wf, params["item"], params["icon"])
+        print(f"✅ 已设置 {params['item']} 的图标" if params["icon"]
+              else f"✅ {params['item']} 已恢复自动匹配图标")
+        return
+
+    query = args[0] if args else ""
+    tokens = query.split()
+
+    page = 1
+    if len(tokens) > 1:
+        match = PAGE_PATTERN.match(tokens[-1])
+        if match:
+            page = max(int(match.group(1)), 1)
+            tokens = tokens[:-1]
+
+    names = collect_names(load_data(wf))
+
+    # 输入了完整的名称（或名称后面有空格、搜索词）时搜索图标
+    if tokens and (len(tokens) > 1 or query.endswith(" ") or tokens[0] in names):
+        show_icons(wf, tokens[0], " ".join(tokens[1:]), page)
+    else:
+        show_names(wf, names, query.strip())
+
+    flush_download_queue(wf)
+    wf.send_feedback()
+
+
+if __name__ == "__main__":
+    wf = Workflow3()
+    sys.exit(wf.run(main))
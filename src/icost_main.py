@@ -3,42 +3,155 @@
 """
 iCost Alfred Workflow - 主入口脚本
 支持消费(expense)和收入(income)记账
+
+一次性记账: "50 午餐 @wx #餐饮/午餐" 在输入中直接指定账户和分类，
+解析结果唯一时直接生成 iCost URL，无需再逐步选择账户和分类
+备注预测: 只输入 "50 午餐" 时，根据历史记录预测最可能的账户和分类
 """
 
 import json
 import sys
 import os
+import itertools
 
 # 添加 workflow 包路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from workflow import Workflow3
+from entry_parser import parse_entry
 
 DATA_FILENAME = "icost_data.json"
 
+# 一次性记账时最多显示的候选条目数
+MAX_DIRECT_ITEMS = 9
+
+# 备注预测最多显示的条目数
+MAX_PREDICTED_ITEMS = 3
+
 
 def load_data(wf):
     """加载分类和账户数据（从 cache 目录）"""
-    data_file = wf.cachefile(DATA_FILENAME)
-    if os.path.exists(data_file):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    # 返回默认数据
-    return {
-        "accounts": ["微信", "支付宝", "现金", "银行卡"],
-        "expense_categories": {},
-        "income_categories": {}
-    }
+    with wf.phase("data load"):
+        data_file = wf.cachefile(DATA_FILENAME)
+        if os.path.exists(data_file):
+            with open(data_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        # 返回默认数据
+        return {
+            "accounts": ["微信", "支付宝", "现金", "银行卡"],
+            "expense_categories": {},
+            "income_categories": {}
+        }
+
+
+def add_direct_item(wf, record_type, amount, account, cat1, cat2, remark, prefix="✅"):
+    """添加一个直接记账的条目（arg 为最终的 iCost URL）"""
+    from icon_manager import get_icon_for_item
+    from select_category2 import build_url
+    
+    category = cat2 or cat1
+    type_label = "消费" if record_type == "expense" else "收入"
+    path = f"{cat1} > {cat2}" if cat2 else cat1
+    
+    item = wf.add_item(
+        title=f"{prefix} {type_label} ¥{amount} · {category}",
+        subtitle=f"{account} > {path}" + (f" - 备注: {remark}" if remark else ""),
+        arg=build_url(record_type, amount, account, category, remark),
+        uid=f"direct_{record_type}_{account}_{cat1}_{cat2}",
+        icon=get_icon_for_item(wf, category),
+        valid=True
+    )
+    item.setvar("entry_mode", "direct")
+
+
+def resolve_entry(wf, query):
+    """
+    按已知的账户和分类重新解析输入
+    只有能解析的 @账户 / #分类 才会被采用，其余的 @/# 词留在备注中
+
+    Returns:
+        (entry, 候选账户列表, 候选分类列表)
+    """
+    # 只在输入了 @ 或 # 时才导入并加载数据
+    from entry_parser import get_lookup_index, resolve_account, resolve_category
+    
+    config = load_data(wf)
+    index = get_lookup_index(wf, config)
+    resolved = {}
+    
+    def accept(kind, token, record_type):
+        if kind == "account":
+            resolved[kind] = resolve_account(index, token)
+        else:
+            resolved[kind] = resolve_category(index, config, token, record_type or None)
+        return bool(resolved[kind])
+    
+    entry = parse_entry(query, accept)
+    return entry, resolved.get("account", []), resolved.get("category", [])
+
+
+def add_direct_items(wf, entry, accounts, categories):
+    """
+    添加可以直接记账的条目（arg 为最终的 iCost URL）
+    条目设置变量 entry_mode=direct，由 Alfred 的条件判断直接打开 URL
+    """
+    # 只在解析到账户和分类时才导入（icon_manager 会导入 urllib 等较慢的模块）
+    from habbit import frecency_scores
+    from icon_manager import flush_download_queue
+    
+    # 多个候选时按使用频率（frecency）排序
+    account_scores = frecency_scores(wf, "accounts")
+    category_scores = frecency_scores(wf, "categories")
+    candidates = sorted(
+        itertools.product(accounts, categories),
+        key=lambda c: -(account_scores.get(c[0], 0) + category_scores.get(c[1][2] or c[1][1], 0))
+    )
+    
+    for account, (record_type, cat1, cat2) in candidates[:MAX_DIRECT_ITEMS]:
+        add_direct_item(wf, record_type, entry["amount"], account, cat1, cat2, entry["remark"])
+    
+    # 启动批量下载
+    flush_download_queue(wf)
+
+
+def add_predicted_items(wf, amount, remark):
+    """根据备注预测完整的记账条目（只保留账户和分类仍然存在的预测）"""
+    # 只在输入了备注时才导入
+    from remark_model import load_model, predict
+    from icon_manager import flush_download_queue
+    
+    predictions = predict(load_model(wf), remark, MAX_PREDICTED_ITEMS)
+    if not predictions:
+        return
+    
+    config = load_data(wf)
+    accounts = set(config.get("accounts", []))
+    for (record_type, account, category), _ in predictions:
+        if account not in accounts:
+            continue
+        for cat1, cat2_list in config.get(f"{record_type}_categories", {}).items():
+            if category in cat2_list:
+                add_direct_item(wf, record_type, amount, account, cat1, category, remark, "🔮")
+                break
+            if category == cat1 and not cat2_list:
+                add_direct_item(wf, record_type, amount, account, cat1, "", remark, "🔮")
+                break
+    
+    flush_download_queue(wf)
 
 
 def main(wf):
     # 获取用户输入
     query = wf.args[0].strip() if wf.args else ""
     
-    # 解析输入，支持格式：金额 或 金额 备注
-    parts = query.split(None, 1)
-    amount = parts[0] if parts else ""
-    remark = parts[1] if len(parts) > 1 else ""
+    # 解析输入，支持格式：金额 [备注] [@账户] [#一级分类/二级分类]
+    entry = parse_entry(query)
+    accounts, categories = [], []
+    if entry["account"] or entry["category"]:
+        # 没有对应账户或分类的 @/# 词（如邮箱、话题）作为备注
+        entry, accounts, categories = resolve_entry(wf, query)
+    amount = entry["amount"]
+    remark = entry["remark"]
     
     # 验证金额是否为有效数字
     try:
@@ -52,6 +165,13 @@ def main(wf):
         valid_amount = False
     
     if valid_amount:
+        # 指定了账户和分类时，优先显示直接记账的条目
+        if accounts and categories:
+            add_direct_items(wf, entry, accounts, categories)
+        elif remark:
+            # 只有备注时，显示根据历史记录预测的条目
+            add_predicted_items(wf, amount, remark)
+        
         # 金额有效，显示消费和收入选项
         wf.add_item(
             title=f"💸 消费 ¥{amount}",
@@ -84,7 +204,7 @@ def main(wf):
         # 显示使用说明
         wf.add_item(
             title="输入金额开始记账",
-            subtitle="格式: 金额 [备注] 例如: 50 午餐",
+            subtitle="格式: 金额 [备注] [@账户] [#分类] 例如: 50 午餐 @wx #餐饮/午餐",
             uid="help",
             icon="icon.png",
             valid=False
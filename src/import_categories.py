@@ -8,14 +8,25 @@ iCost Alfred Workflow - 从 Excel 导入分类
 import json
 import sys
 import os
+import time
 
 # 添加 workflow 包路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from workflow import Workflow3
+from workflow.background import is_running, job_status
 
 DATA_FILENAME = "icost_data.json"
 
+# 后台导入任务名（do_import.py 也使用；不从那里导入，避免每次输入都加载整个导入流程）
+IMPORT_JOB_NAME = "icost_import"
+
+# 导入进行中时自动刷新进度的间隔（秒）
+PROGRESS_RERUN = 0.5
+
+# 导入结束后，在列表顶部显示结果的时长（秒）
+RESULT_DISPLAY_SECONDS = 600
+
 
 def load_data(wf):
     """加载现有数据（从 cache 目录）"""
@@ -164,10 +175,65 @@ def import_from_excel(wf, file_path):
     except Exception as e:
         return None, f"导入失败: {str(e)}"
 
+def format_duration(seconds: float) -> str:
+    """将秒数格式化为 "1分05秒" 的形式"""
+    seconds = int(seconds + 0.5)
+    if seconds < 60:
+        return f"{seconds}秒"
+    return f"{seconds // 60}分{seconds % 60:02d}秒"
+
+
+def add_import_status(wf):
+    """
+    显示后台导入任务的状态
+    - 进行中: 已读取行数、速度（行/秒）和预计剩余时间，并自动刷新
+    - 最近完成: 导入结果
+    """
+    status = job_status(IMPORT_JOB_NAME)
+    if not status:
+        return
+    
+    file_name = status.get("file", "")
+    finished = status.get("finished")
+    
+    if not finished and is_running(IMPORT_JOB_NAME):
+        done = status.get("done", 0)
+        total = status.get("total", 0)
+        elapsed = status["updated"] - status["started"]
+        rate = done / elapsed if elapsed > 0 else 0
+        
+        title = f"⏳ 正在导入 {file_name}: {done} 行"
+        if total:
+            title = f"⏳ 正在导入 {file_name}: {done}/{total} 行 ({done * 100 // total}%)"
+        
+        subtitle = f"{rate:.0f} 行/秒" if rate else "正在读取文件…"
+        if rate and total > done:
+            subtitle += f"，预计剩余 {format_duration((total - done) / rate)}"
+        
+        wf.add_item(title=title, subtitle=subtitle, uid="import_progress",
+                    icon="icon.png", valid=False)
+        wf.rerun = PROGRESS_RERUN
+        return
+    
+    if finished and time.time() - finished < RESULT_DISPLAY_SECONDS:
+        result = status.get("result") or status.get("error") or ""
+        lines = result.splitlines() or ["导入已结束"]
+        wf.add_item(
+            title=lines[0],
+            subtitle="；".join([file_name] + lines[1:]),
+            uid="import_result",
+            icon="icon.png",
+            valid=False
+        )
+
+
 def main(wf):
     # 获取用户输入的文件路径
     query = wf.args[0].strip() if wf.args else ""
     
+    # 后台导入任务的进度或结果
+    add_import_status(wf)
+    
     if query:
         # 用户提供了文件路径
         file_path = query
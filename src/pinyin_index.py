@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 拼音索引模块
+为账户和分类名称生成全拼和首字母，支持用 ASCII 输入搜索中文名称
+例如: "cy" / "canyin" -> "餐饮"
+
+拼音读音表 pinyin.json 由 generate_pinyin_json.py 离线生成，运行时不依赖 pypinyin
+"""
+
+import itertools
+import json
+import os
+from typing import Dict, List, Optional
+
+# 模块目录
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+PINYIN_JSON_PATH = os.path.join(MODULE_DIR, "pinyin.json")
+
+# 拼音索引在 cache 目录中的名称（通过 wf.cache_data 保存）
+PINYIN_INDEX_NAME = "pinyin_index"
+
+# 拼音索引只包含字符串和列表，使用加载更快的 marshal 格式
+INDEX_SERIALIZER = "marshal"
+
+# 多音字组合过多时，每个名称最多保留的读音组合数
+MAX_VARIANTS = 8
+
+# 缓存：拼音读音表（避免重复加载）
+_pinyin_table: Optional[Dict[str, List[str]]] = None
+
+
+def load_pinyin_table() -> Dict[str, List[str]]:
+    """加载拼音读音表 {汉字: [读音, ...]}（使用缓存）"""
+    global _pinyin_table
+    if _pinyin_table is None:
+        if os.path.exists(PINYIN_JSON_PATH):
+            with open(PINYIN_JSON_PATH, 'r', encoding='utf-8') as f:
+                _pinyin_table = json.load(f)
+        else:
+            _pinyin_table = {}
+    return _pinyin_table
+
+
+def pinyin_keys(name: str) -> List[str]:
+    """
+    生成名称的拼音搜索键（全拼和首字母，均为小写）
+    多音字会生成多个组合，例如 "银行" -> ["yinxing", "yx", "yinhang", "yh", ...]
+
+    Args:
+        name: 账户名或分类名
+
+    Returns:
+        拼音搜索键列表，名称中没有汉字时返回空列表
+    """
+    table = load_pinyin_table()
+
+    # 每个字符的候选读音，非汉字（字母、数字等）原样保留
+    readings = []
+    has_hanzi = False
+    for char in name:
+        if char in table:
+            readings.append(table[char])
+            has_hanzi = True
+        elif char.isalnum():
+            readings.append([char.lower()])
+
+    if not has_hanzi:
+        return []
+
+    keys = []
+    for combo in itertools.islice(itertools.product(*readings), MAX_VARIANTS):
+        for key in ("".join(combo), "".join(r[0] for r in combo)):
+            if key not in keys:
+                keys.append(key)
+
+    return keys
+
+
+def collect_names(data: Dict) -> List[str]:
+    """收集数据中的所有账户、一级分类和二级分类名称（去重）"""
+    names = list(data.get("accounts", []))
+    for section in ("expense_categories", "income_categories"):
+        for cat1, cat2_list in data.get(section, {}).items():
+            names.append(cat1)
+            names.extend(cat2_list)
+    return list(dict.fromkeys(names))
+
+
+def build_pinyin_index(names: List[str]) -> Dict[str, List[str]]:
+    """
+    构建拼音索引
+
+    Returns:
+        {名称: [拼音搜索键, ...]}
+    """
+    return {name: pinyin_keys(name) for name in names}
+
+
+def save_pinyin_index(wf, data: Dict) -> Dict[str, List[str]]:
+    """为数据中的所有名称构建拼音索引并保存到 cache 目录（导入时调用）"""
+    index = build_pinyin_index(collect_names(data))
+    wf.cache_data(PINYIN_INDEX_NAME, index, serializer=INDEX_SERIALIZER)
+    return index
+
+
+def get_pinyin_index(wf, data: Dict) -> Dict[str, List[str]]:
+    """
+    获取拼音索引（从 cache 目录读取）
+    如果索引不存在，或数据中有索引未覆盖的名称（例如手动编辑了数据文件），则重新构建
+    """
+    index = wf.cached_data(PINYIN_INDEX_NAME, max_age=0, serializer=INDEX_SERIALIZER)
+    if index is None or any(name not in index for name in collect_names(data)):
+        index = save_pinyin_index(wf, data)
+    return index
+
+
+def search_keys(name: str, index: Dict[str, List[str]]) -> List[str]:
+    """返回名称本身及其拼音搜索键，用作 FilterIndex 的 key"""
+    return [name] + index.get(name, [])
+
+
+def match_string(name: str, index: Dict[str, List[str]]) -> str:
+    """返回 Alfred 过滤结果时使用的 match 字段（名称 + 拼音，空格分隔）"""
+    return " ".join(search_keys(name, index))
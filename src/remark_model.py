@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 备注预测模块
+根据历史记账记录学习 "备注词 -> (类型, 账户, 分类)" 的共现次数，
+输入备注时预测最可能的完整记账条目，例如 "午餐" -> (消费, 微信, 午餐)
+
+学习来源:
+1. 每次记账后 habbit.record_from_url 解析到的 URL（包含 remark 参数时）
+2. 导入的 Excel 账单中的备注列
+
+模型保存在 cache 目录的 JSON 文件中，词数量和每个词的条目数量均有上限。
+词数量超出上限时按 "总次数 × 最近出现时间的衰减" 保留，新词可以替换长期未出现的旧词
+"""
+
+import heapq
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from workflow.util import atomic_writer
+
+# 模型数据文件名
+MODEL_FILENAME = "remark_model.json"
+
+# 最多保留的词数量（超出时保留总次数最多的词）
+MAX_TOKENS = 2000
+
+# 每个词最多保留的条目数量（超出时保留次数最多的条目）
+MAX_ENTRIES_PER_TOKEN = 8
+
+# 裁剪词时次数衰减的半衰期（天）：词每隔这么久没有出现，排名时的次数减半
+TOKEN_HALF_LIFE_DAYS = 90
+
+# 预测条目: (记录类型, 账户, 分类)
+Entry = Tuple[str, str, str]
+
+# 条目在 JSON 中的键分隔符
+ENTRY_SEPARATOR = "\t"
+
+
+def get_model_file_path(wf) -> str:
+    """获取模型数据文件路径"""
+    return wf.cachefile(MODEL_FILENAME)
+
+
+def load_model(wf) -> Dict:
+    """
+    加载模型
+
+    Returns:
+        {"tokens": {"午餐": {"expense\\t微信\\t午餐": 12, ...}, ...},
+         "last_seen": {"午餐": 1700000000, ...}}
+    """
+    model_file = get_model_file_path(wf)
+    if os.path.exists(model_file):
+        try:
+            with open(model_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+
+    return {"tokens": {}}
+
+
+def save_model(wf, model: Dict):
+    """保存模型（保存前裁剪到上限以内）"""
+    prune_model(model)
+    model_file = get_model_file_path(wf)
+    # 先写入临时文件再替换，避免其他进程读到写了一半的模型
+    with atomic_writer(model_file, 'wb') as f:
+        f.write(json.dumps(model, ensure_ascii=False, separators=(",", ":")).encode('utf-8'))
+
+
+def tokenize(remark: str) -> List[str]:
+    """
+    将备注拆分为词
+    每个空格分隔的词本身是一个词；包含中文时再加入相邻两字组成的词，
+    使 "公司午餐" 和 "午餐" 能够互相匹配
+
+    Returns:
+        去重后的词列表（小写）
+    """
+    tokens = []
+    for word in remark.lower().split():
+        tokens.append(word)
+        if not word.isascii() and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return list(dict.fromkeys(tokens))
+
+
+def learn(model: Dict, remark: str, record_type: str, account: str, category: str,
+          count: int = 1, now: Optional[float] = None):
+    """
+    记录一次备注与记账条目的共现（只修改内存中的模型）
+
+    Args:
+        model: 模型
+        remark: 备注
+        record_type: 记录类型 ("expense"/"income")
+        account: 账户名
+        category: 分类名（iCost URL 中的 category）
+        count: 次数
+        now: 学习的时间（默认为当前时间），记录为词最近出现的时间
+    """
+    if not (remark and account and category):
+        return
+
+    key = ENTRY_SEPARATOR.join((record_type, account, category))
+    token_counts = model.setdefault("tokens", {})
+    last_seen = model.setdefault("last_seen", {})
+    seen = int(time.time() if now is None else now)
+    for token in tokenize(remark):
+        counts = token_counts.setdefault(token, {})
+        counts[key] = counts.get(key, 0) + count
+        last_seen[token] = seen
+        # 超出上限较多时立即裁剪，避免单个词无限增长
+        if len(counts) > MAX_ENTRIES_PER_TOKEN * 2:
+            _prune_counts(counts)
+
+
+def _prune_counts(counts: Dict[str, int]):
+    """只保留次数最多的 MAX_ENTRIES_PER_TOKEN 个条目"""
+    if len(counts) > MAX_ENTRIES_PER_TOKEN:
+        keep = heapq.nlargest(MAX_ENTRIES_PER_TOKEN, counts.items(), key=lambda kv: kv[1])
+        counts.clear()
+        counts.update(keep)
+
+
+def prune_model(model: Dict, now: Optional[float] = None):
+    """
+    将模型裁剪到上限以内
+
+    词按 总次数 × 0.5 ^ (距最近出现的天数 / TOKEN_HALF_LIFE_DAYS) 排名，
+    得分相同时保留最近出现的词，因此模型满了之后新词仍然可以替换长期未出现的旧词
+    """
+    token_counts = model.setdefault("tokens", {})
+    last_seen = model.setdefault("last_seen", {})
+    now = time.time() if now is None else now
+    for token, counts in token_counts.items():
+        _prune_counts(counts)
+        # 旧版本的模型没有记录时间，从现在开始计算
+        last_seen.setdefault(token, int(now))
+
+    if len(token_counts) > MAX_TOKENS:
+        half_life = TOKEN_HALF_LIFE_DAYS * 86400
+
+        def rank(token):
+            age = max(now - last_seen[token], 0)
+            return (sum(token_counts[token].values()) * 0.5 ** (age / half_life),
+                    last_seen[token])
+
+        keep = set(heapq.nlargest(MAX_TOKENS, token_counts, key=rank))
+        for token in list(token_counts):
+            if token not in keep:
+                del token_counts[token]
+
+    for token in list(last_seen):
+        if token not in token_counts:
+            del last_seen[token]
+
+
+def record_remark(wf, remark: str, record_type: str, account: str, category: str):
+    """学习一条记账记录并保存模型"""
+    if not (remark and account and category):
+        return
+    model = load_model(wf)
+    learn(model, remark, record_type, account, category)
+    save_model(wf, model)
+
+
+def learn_records(wf, records: Iterable[Tuple[str, str, str, str]]) -> int:
+    """
+    批量学习记账记录并保存模型（导入 Excel 时调用）
+
+    Args:
+        records: [(备注, 记录类型, 账户, 分类), ...]
+
+    Returns:
+        学习的记录数
+    """
+    model = load_model(wf)
+    learned = 0
+    for remark, record_type, account, category in records:
+        if remark and account and category:
+            learn(model, remark, record_type, account, category)
+            learned += 1
+    if learned:
+        save_model(wf, model)
+    return learned
+
+
+def predict(model: Dict, remark: str, top_n: int = 3) -> List[Tuple[Entry, float]]:
+    """
+    根据备注预测记账条目
+    每个词的得分为 条目次数 / 该词总次数，按词长加权后累加
+
+    Returns:
+        [((记录类型, 账户, 分类), 得分), ...]，按得分降序
+    """
+    token_counts = model.get("tokens", {})
+    scores = {}
+    for token in tokenize(remark):
+        counts = token_counts.get(token)
+        if not counts:
+            continue
+        total = sum(counts.values())
+        weight = len(token)
+        for key, count in counts.items():
+            scores[key] = scores.get(key, 0.0) + weight * count / total
+
+    top = heapq.nlargest(top_n, scores.items(), key=lambda kv: kv[1])
+    return [(tuple(key.split(ENTRY_SEPARATOR)), score) for key, score in top]
@@ -14,22 +14,25 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from workflow import Workflow3
 from icon_manager import get_icon_for_item, preload_icons, flush_download_queue
 from habbit import sort_by_frequency
+from pinyin_index import get_pinyin_index, match_string
+from feedback_cache import placeholders, send_cached_feedback, send_template_feedback
 
 DATA_FILENAME = "icost_data.json"
 
 
 def load_data(wf):
     """加载分类和账户数据（从 cache 目录）"""
-    data_file = wf.cachefile(DATA_FILENAME)
-    if os.path.exists(data_file):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    # 返回默认数据
-    return {
-        "accounts": ["微信", "支付宝", "现金", "银行卡"],
-        "expense_categories": {},
-        "income_categories": {}
-    }
+    with wf.phase("data load"):
+        data_file = wf.cachefile(DATA_FILENAME)
+        if os.path.exists(data_file):
+            with open(data_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        # 返回默认数据
+        return {
+            "accounts": ["微信", "支付宝", "现金", "银行卡"],
+            "expense_categories": {},
+            "income_categories": {}
+        }
 
 
 def main(wf):
@@ -55,10 +58,20 @@ def main(wf):
     amount = data.get("amount", "0")
     remark = data.get("remark", "")
     
+    # 使用反馈模板：有缓存直接输出，否则用占位符生成模板
+    values = {"amount": amount, "remark": remark}
+    if send_cached_feedback(wf, "account", record_type, values):
+        return
+    fields = placeholders(values)
+    amount, remark = fields["amount"], fields["remark"]
+    
     # 加载账户列表
     config = load_data(wf)
     accounts = config.get("accounts", ["微信", "支付宝", "现金", "银行卡"])
     
+    # 拼音索引（支持在 Grid 中输入拼音或首字母过滤）
+    pinyin_index = get_pinyin_index(wf, config)
+    
     # 按使用频率排序
     accounts = sort_by_frequency(wf, accounts, "accounts")
     
@@ -83,13 +96,14 @@ def main(wf):
             }),
             uid=f"account_{account}",
             icon=icon_path,
-            valid=True
+            valid=True,
+            match=match_string(account, pinyin_index)
         )
     
     # 启动批量下载
     flush_download_queue(wf)
     
-    wf.send_feedback()
+    send_template_feedback(wf, "account", record_type, values)
 
 
 if __name__ == "__main__":
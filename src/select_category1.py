@@ -14,22 +14,25 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from workflow import Workflow3
 from icon_manager import get_icon_for_item, preload_icons, flush_download_queue
 from habbit import sort_by_frequency
+from pinyin_index import get_pinyin_index, match_string
+from feedback_cache import placeholders, send_cached_feedback, send_template_feedback
 
 DATA_FILENAME = "icost_data.json"
 
 
 def load_data(wf):
     """加载分类和账户数据（从 cache 目录）"""
-    data_file = wf.cachefile(DATA_FILENAME)
-    if os.path.exists(data_file):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    # 返回默认数据
-    return {
-        "accounts": ["微信", "支付宝", "现金", "银行卡"],
-        "expense_categories": {},
-        "income_categories": {}
-    }
+    with wf.phase("data load"):
+        data_file = wf.cachefile(DATA_FILENAME)
+        if os.path.exists(data_file):
+            with open(data_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        # 返回默认数据
+        return {
+            "accounts": ["微信", "支付宝", "现金", "银行卡"],
+            "expense_categories": {},
+            "income_categories": {}
+        }
 
 
 def main(wf):
@@ -53,6 +56,13 @@ def main(wf):
     remark = data.get("remark", "")
     account = data.get("account", "")
     
+    # 使用反馈模板：有缓存直接输出，否则用占位符生成模板
+    values = {"amount": amount, "remark": remark, "account": account}
+    if send_cached_feedback(wf, "category1", record_type, values):
+        return
+    fields = placeholders(values)
+    amount, remark, account = fields["amount"], fields["remark"], fields["account"]
+    
     # 加载分类数据
     config = load_data(wf)
     
@@ -72,12 +82,15 @@ def main(wf):
             valid=False
         )
     else:
-        # 预加载图标
         category_names = list(categories.keys())
         
+        # 拼音索引（支持在 Grid 中输入拼音或首字母过滤）
+        pinyin_index = get_pinyin_index(wf, config)
+        
         # 按使用频率排序
         category_names = sort_by_frequency(wf, category_names, "categories")
         
+        # 预加载图标
         preload_icons(wf, category_names)
         
         for cat1 in category_names:
@@ -99,13 +112,14 @@ def main(wf):
                 }),
                 uid=f"cat1_{cat1}",
                 icon=icon_path,
-                valid=True
+                valid=True,
+                match=match_string(cat1, pinyin_index)
             )
     
     # 启动批量下载
     flush_download_queue(wf)
     
-    wf.send_feedback()
+    send_template_feedback(wf, "category1", record_type, values)
 
 
 if __name__ == "__main__":
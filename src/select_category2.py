@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from workflow import Workflow3
 from icon_manager import get_icon_for_item, preload_icons, flush_download_queue
 from habbit import sort_by_frequency
+from pinyin_index import get_pinyin_index, match_string
 
 DATA_FILENAME = "icost_data.json"
 
@@ -26,16 +27,17 @@ X_ERROR_URL = "shortcuts://run-shortcut?name=iCostError&"
 
 def load_data(wf):
     """加载分类和账户数据（从 cache 目录）"""
-    data_file = wf.cachefile(DATA_FILENAME)
-    if os.path.exists(data_file):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    # 返回默认数据
-    return {
-        "accounts": ["微信", "支付宝", "现金", "银行卡"],
-        "expense_categories": {},
-        "income_categories": {}
-    }
+    with wf.phase("data load"):
+        data_file = wf.cachefile(DATA_FILENAME)
+        if os.path.exists(data_file):
+            with open(data_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        # 返回默认数据
+        return {
+            "accounts": ["微信", "支付宝", "现金", "银行卡"],
+            "expense_categories": {},
+            "income_categories": {}
+        }
 
 
 def build_url(record_type, amount, account, category, remark=""):
@@ -106,6 +108,9 @@ def main(wf):
             valid=True
         )
     else:
+        # 拼音索引（支持在 Grid 中输入拼音或首字母过滤）
+        pinyin_index = get_pinyin_index(wf, config)
+        
         # 按使用频率排序
         sub_categories = sort_by_frequency(wf, sub_categories, "categories")
         
@@ -123,7 +128,8 @@ def main(wf):
                 arg=url,
                 uid=f"cat2_{cat2}",
                 icon=icon_path,
-                valid=True
+                valid=True,
+                match=match_string(cat2, pinyin_index)
             )
     
     # 启动批量下载
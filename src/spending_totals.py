@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 支出累计模块
+按 (月份, 分类, 账户) 累计支出金额，供 icost:budget 显示本月预算使用情况，
+显示时只需读取当月的累计值，不需要扫描历史记录
+
+累计值的来源:
+1. 每次记账后 habbit.record_from_url 把 URL 中的金额加到当月累计
+2. 导入 Excel 账单时根据交易记录（transactions.py）重新生成
+
+导入的账单可能已经包含之前通过 URL 记过的账，因此 URL 记账同时保存一份明细（最近两个月），
+重新生成时只把晚于账单最后一天的明细加回去，避免重复计算
+"""
+
+import datetime
+import json
+import os
+from typing import Dict, Optional
+
+from transactions import (EPOCH_ORDINAL, TYPE_EXPENSE, day_to_month, month_label,
+                          parse_amount)
+
+# 累计数据文件名
+TOTALS_FILENAME = "spending_totals.json"
+
+# (分类, 账户) 在 JSON 中的键分隔符
+KEY_SEPARATOR = "\t"
+
+# URL 记账明细保留的天数
+RECORDED_DAYS = 62
+
+# 保留累计值的月数（文件大小和读取时间只与分类、账户数量有关）
+MAX_MONTHS = 13
+
+
+def get_totals_file_path(wf) -> str:
+    """获取累计数据文件路径"""
+    return wf.cachefile(TOTALS_FILENAME)
+
+
+def load_totals(wf) -> Dict:
+    """
+    加载累计数据
+
+    Returns:
+        {
+            "months": {"2024-03": {"午餐\\t微信": 12350, ...}, ...},  # 金额单位为分
+            "recorded": [[天数, 分类, 账户, 金额], ...]  # URL 记账明细
+        }
+    """
+    totals_file = get_totals_file_path(wf)
+    if os.path.exists(totals_file):
+        try:
+            with open(totals_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+
+    return {"months": {}, "recorded": []}
+
+
+def save_totals(wf, totals: Dict):
+    """保存累计数据（只保留最近 MAX_MONTHS 个月）"""
+    months = totals.get("months", {})
+    if len(months) > MAX_MONTHS:
+        for month in sorted(months)[:-MAX_MONTHS]:
+            del months[month]
+    totals_file = get_totals_file_path(wf)
+    with open(totals_file, 'w', encoding='utf-8') as f:
+        json.dump(totals, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def today() -> int:
+    """今天的天数（1970-01-01 起）"""
+    return datetime.date.today().toordinal() - EPOCH_ORDINAL
+
+
+def add_spending(totals: Dict, day: int, category: str, account: str, cents: int,
+                 month: Optional[str] = None):
+    """
+    把一笔支出加到所在月份的累计（只修改内存中的数据）
+
+    Args:
+        month: 月份（"2024-03"），已知时不需要再根据 day 计算
+    """
+    month = month or month_label(day_to_month(day))
+    month_totals = totals.setdefault("months", {}).setdefault(month, {})
+    key = category + KEY_SEPARATOR + account
+    month_totals[key] = month_totals.get(key, 0) + cents
+
+
+def record_spending(wf, amount: str, category: str, account: str, day: Optional[int] = None):
+    """
+    记录一笔支出并保存（每次记账后调用）
+
+    Args:
+        amount: URL 中的金额，例如 "35.5"
+        category: URL 中的分类（二级分类，没有二级分类时为一级分类）
+        account: 账户
+        day: 日期（天数），默认为今天
+    """
+    cents = parse_amount(amount)
+    if not cents:
+        return
+
+    day = today() if day is None else day
+    totals = load_totals(wf)
+    add_spending(totals, day, category, account, cents)
+
+    recorded = [entry for entry in totals.get("recorded", []) if entry[0] > day - RECORDED_DAYS]
+    recorded.append([day, category, account, cents])
+    totals["recorded"] = recorded
+    save_totals(wf, totals)
+
+
+def rebuild_from_store(wf, store):
+    """
+    根据交易记录重新生成累计（导入账单后调用）
+    账单最后一天之后通过 URL 记的账不在账单中，保留并加回
+    """
+    totals = load_totals(wf)
+    new_totals = {"months": {}, "recorded": []}
+
+    last_day = None
+    if len(store):
+        columns = [store.column(name) for name in
+                   ("day", "type", "amount", "category", "subcategory", "account")]
+        columns.append(store.months())
+        categories = store.dictionaries["category"]
+        subcategories = store.dictionaries["subcategory"]
+        accounts = store.dictionaries["account"]
+        labels = {}
+        for day, record_type, cents, category, subcategory, account, month in zip(*columns):
+            if record_type == TYPE_EXPENSE:
+                label = labels.get(month) or labels.setdefault(month, month_label(int(month)))
+                add_spending(new_totals, int(day), subcategories[subcategory] or categories[category],
+                             accounts[account], int(cents), label)
+            if last_day is None or day > last_day:
+                last_day = int(day)
+
+    for entry in totals.get("recorded", []):
+        if last_day is None or entry[0] > last_day:
+            add_spending(new_totals, *entry)
+            new_totals["recorded"].append(entry)
+
+    save_totals(wf, new_totals)
+
+
+def month_spending(wf, month: Optional[str] = None) -> Dict[str, int]:
+    """
+    某月（默认本月）每个分类的支出合计（所有账户）
+
+    Returns:
+        {分类: 金额（分）}，没有分类的支出记在 "" 下
+    """
+    month = month or month_label(day_to_month(today()))
+    spending: Dict[str, int] = {}
+    for key, cents in load_totals(wf).get("months", {}).get(month, {}).items():
+        category = key.split(KEY_SEPARATOR, 1)[0]
+        spending[category] = spending.get(category, 0) + cents
+    return spending
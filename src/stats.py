@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 收支统计
+根据导入的交易记录（transactions.py）显示统计，不需要重新读取 Excel
+
+用法（关键词 icost:stats）:
+    icost:stats              最近一个月的支出分类占比
+    icost:stats 2024-03      指定月份的支出分类占比
+    icost:stats trend        每月支出和收入
+    icost:stats top [月份]   消费最多的商家（备注）
+    icost:stats account [月份] 按账户统计支出
+
+统计条目都不设置 uid，避免 Alfred 按使用记录调整顺序
+"""
+
+import sys
+import os
+
+# 添加 workflow 包路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from workflow import Workflow3
+from icon_manager import get_icon_for_item, flush_download_queue
+from transactions import (TYPE_EXPENSE, TYPE_INCOME, load_store, month_label,
+                          parse_month)
+
+# 月度趋势显示的月数
+TREND_MONTHS = 12
+
+# 商家排行显示的数量
+TOP_MERCHANTS = 10
+
+# 各视图的关键词
+TREND_KEYWORDS = ("trend", "趋势")
+TOP_KEYWORDS = ("top", "商家")
+ACCOUNT_KEYWORDS = ("account", "账户")
+
+
+def format_amount(cents: int) -> str:
+    """金额（分）-> "¥1,234.50" / "-¥1,234.50" """
+    sign = "-" if cents < 0 else ""
+    return f"{sign}¥{abs(cents) / 100:,.2f}"
+
+
+def add_breakdown_items(wf, items, total: int, with_icons: bool = True):
+    """分组合计条目: 名称 金额，副标题为占比和笔数"""
+    for name, amount, count in items:
+        share = amount * 100 / total if total else 0
+        wf.add_item(
+            title=f"{name or '(无)'}  {format_amount(amount)}",
+            subtitle=f"占 {share:.1f}%，{count} 笔",
+            icon=get_icon_for_item(wf, name) if with_icons else "icon.png",
+            valid=False
+        )
+
+
+def show_month(wf, store, month: int, by: str = "category"):
+    """某月的支出合计和按分类（或账户）的占比"""
+    expense = store.group_sum("month", TYPE_EXPENSE, month).get(month, (0, 0))
+    income = store.group_sum("month", TYPE_INCOME, month).get(month, (0, 0))
+    label = month_label(month)
+
+    wf.add_item(
+        title=f"📅 {label} 支出 {format_amount(expense[0])}（{expense[1]} 笔）",
+        subtitle=f"收入 {format_amount(income[0])}（{income[1]} 笔）｜ "
+                 f"输入 trend 查看每月趋势，top 查看商家排行",
+        icon="icon.png",
+        autocomplete="trend",
+        valid=False
+    )
+    add_breakdown_items(wf, store.breakdown(by, month), expense[0])
+
+
+def show_trend(wf, store):
+    """最近几个月的支出和收入"""
+    expense = dict((month, amount) for month, amount, _ in store.monthly_totals(TYPE_EXPENSE))
+    income = dict((month, amount) for month, amount, _ in store.monthly_totals(TYPE_INCOME))
+    months = sorted(set(expense) | set(income), reverse=True)[:TREND_MONTHS]
+
+    for month in months:
+        label = month_label(month)
+        wf.add_item(
+            title=f"{label}  支出 {format_amount(expense.get(month, 0))}",
+            subtitle=f"收入 {format_amount(income.get(month, 0))}"
+                     f"，结余 {format_amount(income.get(month, 0) - expense.get(month, 0))}"
+                     f" ｜ Tab 查看分类占比",
+            icon="icon.png",
+            autocomplete=label,
+            valid=False
+        )
+
+
+def show_top_merchants(wf, store, month=None):
+    """消费最多的商家（备注）"""
+    items = store.top_merchants(TOP_MERCHANTS, month)
+    total = sum(amount for _, amount, _ in items)
+    scope = month_label(month) if month is not None else "全部"
+    wf.add_item(
+        title=f"🏪 {scope} 消费最多的 {len(items)} 个商家",
+        subtitle=f"合计 {format_amount(total)}（按备注统计）",
+        icon="icon.png",
+        valid=False
+    )
+    add_breakdown_items(wf, items, total, with_icons=False)
+
+
+def main(wf):
+    query = wf.args[0].strip() if wf.args else ""
+    tokens = query.split()
+
+    store = load_store(wf)
+    if not len(store):
+        wf.add_item(
+            title="还没有交易记录",
+            subtitle="请先使用 icost:import 导入 iCost 导出的账单",
+            icon="icon.png",
+            valid=False
+        )
+        wf.send_feedback()
+        return
+
+    month = None
+    for token in tokens:
+        month = parse_month(token)
+        if month is not None:
+            break
+
+    keywords = set(token.lower() for token in tokens)
+    if keywords & set(TREND_KEYWORDS):
+        show_trend(wf, store)
+    elif keywords & set(TOP_KEYWORDS):
+        show_top_merchants(wf, store, month)
+    elif keywords & set(ACCOUNT_KEYWORDS):
+        show_month(wf, store, month if month is not None else store.latest_month(), "account")
+    else:
+        show_month(wf, store, month if month is not None else store.latest_month())
+
+    flush_download_queue(wf)
+    wf.send_feedback()
+
+
+if __name__ == "__main__":
+    wf = Workflow3()
+    sys.exit(wf.run(main))
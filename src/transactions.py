@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+iCost Alfred Workflow - 交易记录列式存储
+导入 Excel 账单时保存每条交易的日期、金额、类型、分类、账户和备注，
+供 icost:stats 统计月度收支、分类占比和消费最多的商家（备注）
+
+每列保存为一个定长整数列文件（日期为 1970-01-01 起的 int32 天数，金额为 int64 分，
+分类、账户为字典编码的 int16），记录按日期排序。
+查询时只对需要的列做内存映射（mmap），不需要解析；
+按月份查询时在日期列上二分查找，只读取该月的记录。
+安装了 NumPy 时按列向量化分组求和，否则逐行累加
+"""
+
+import bisect
+import datetime
+import heapq
+import itertools
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from workflow.util import atomic_writer
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 交易记录元数据（行数、列文件版本、字典）在 cache 目录中的名称（通过 wf.cache_data 保存）
+STORE_NAME = "transactions"
+
+# 元数据只包含数字、字符串和列表，使用加载更快的 marshal 格式
+STORE_SERIALIZER = "marshal"
+
+# 列文件所在的 cache 子目录，文件名为 "<列名>.<版本>.col"
+COLUMNS_DIRNAME = "transactions"
+
+# 存储格式版本（修改列定义时递增，使旧数据失效）
+STORE_FORMAT = 2
+
+# 交易类型
+TYPE_EXPENSE = 0
+TYPE_INCOME = 1
+TYPE_OTHER = 2  # 转账等，不计入统计
+
+# 列定义: (列名, array 类型码)
+COLUMNS = (
+    ("day", "i"),          # 1970-01-01 起的天数
+    ("amount", "q"),       # 金额（分）
+    ("type", "b"),         # 交易类型
+    ("category", "h"),     # 一级分类（字典编码）
+    ("subcategory", "h"),  # 二级分类（字典编码）
+    ("account", "h"),      # 账户（字典编码）
+    ("merchant", "i"),     # 备注/商家（字典编码，取值较多）
+)
+
+# 字典编码的列（编码 0 固定为空字符串）
+DICTIONARY_COLUMNS = ("category", "subcategory", "account", "merchant")
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+# 月份键: 年 * 12 + (月 - 1)
+EPOCH_MONTH = 1970 * 12
+
+
+def parse_day(value) -> Optional[int]:
+    """将 Excel 单元格中的日期（datetime/date 或 "2024-03-05 12:30" 等字符串）转换为天数"""
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    if isinstance(value, datetime.date):
+        return value.toordinal() - EPOCH_ORDINAL
+    if not value:
+        return None
+
+    match = re.match(r'\s*(\d{4})[-/.年](\d{1,2})[-/.月](\d{1,2})', str(value))
+    if not match:
+        return None
+    try:
+        return datetime.date(*map(int, match.groups())).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def parse_amount(value) -> Optional[int]:
+    """将金额（数字或 "¥1,234.50" 等字符串）转换为分（取绝对值）"""
+    if isinstance(value, (int, float)):
+        return abs(round(value * 100))
+    if not value:
+        return None
+
+    text = re.sub(r'[^\d.\-]', '', str(value))
+    try:
+        return abs(round(float(text) * 100))
+    except ValueError:
+        return None
+
+
+def parse_type(record_type: str) -> int:
+    """iCost 账单中的类型列 -> 交易类型"""
+    if '收入' in record_type:
+        return TYPE_INCOME
+    if not record_type or '支出' in record_type:
+        return TYPE_EXPENSE
+    return TYPE_OTHER
+
+
+def day_to_month(day: int) -> int:
+    """天数 -> 月份键"""
+    date = datetime.date.fromordinal(day + EPOCH_ORDINAL)
+    return date.year * 12 + date.month - 1
+
+
+def month_label(month: int) -> str:
+    """月份键 -> "2024-03" """
+    return f"{month // 12}-{month % 12 + 1:02d}"
+
+
+def parse_month(text: str) -> Optional[int]:
+    """"2024-03" / "2024-3" / "202403" -> 月份键"""
+    match = re.fullmatch(r'(\d{4})[-/.年]?(\d{1,2})月?', text.strip())
+    if not match:
+        return None
+    year, month = map(int, match.groups())
+    if not 1 <= month <= 12:
+        return None
+    return year * 12 + month - 1
+
+
+def _map_column(path: str, typecode: str):
+    """内存映射列文件，返回按类型码解释的 memoryview（文件为空时返回空 array）"""
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return array(typecode)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
+
+
+class TransactionStore:
+    """
+    列式交易记录
+    columns: {列名: array 或 memoryview}，dictionaries: {列名: [字符串, ...]}（编码即下标）
+
+    从磁盘加载时，列在第一次使用时才映射（loader: 列名 -> 列数据），
+    且记录已按日期排序（sorted 为 True），按月份查询时只读取该月的记录
+    """
+
+    def __init__(self, columns: Optional[Dict] = None,
+                 dictionaries: Optional[Dict[str, List[str]]] = None,
+                 rows: Optional[int] = None, loader=None):
+        self.columns = columns if columns is not None else {
+            name: array(code) for name, code in COLUMNS}
+        self.dictionaries = dictionaries or {name: [""] for name in DICTIONARY_COLUMNS}
+        self.sorted = loader is not None
+        self._rows = rows
+        self._loader = loader
+        # 字符串 -> 编码（添加记录时才构建）
+        self._codes: Optional[Dict[str, Dict[str, int]]] = None
+        # 每条记录的月份键（查询时才计算）
+        self._months = None
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return self._rows
+        return len(self.columns["day"])
+
+    def _column(self, name: str):
+        """返回列数据（需要时才映射列文件）"""
+        column = self.columns.get(name)
+        if column is None:
+            column = self.columns[name] = self._loader(name)
+        return column
+
+    def _make_writable(self):
+        """将映射的列和字典复制为可修改的 array 和 list，以便追加记录"""
+        # 字典来自 wf.cached_data 返回的共享对象，不能直接修改
+        self.dictionaries = {name: list(values) for name, values in self.dictionaries.items()}
+        self._codes = None
+        for name, code in COLUMNS:
+            column = self._column(name)
+            if not isinstance(column, array):
+                copy = array(code)
+                copy.frombytes(column.tobytes())
+                self.columns[name] = copy
+        self.sorted = False
+        self._rows = None
+        self._loader = None
+
+    def _encode(self, column: str, value: str) -> int:
+        """字符串 -> 字典编码（新字符串追加到字典末尾）"""
+        if self._codes is None:
+            self._codes = {name: {s: i for i, s in enumerate(values)}
+                           for name, values in self.dictionaries.items()}
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return code
+
+    def add(self, day: int, amount: int, record_type: int, category: str = "",
+            subcategory: str = "", account: str = "", merchant: str = ""):
+        """添加一条交易记录"""
+        if self._loader is not None:
+            self._make_writable()
+        columns = self.columns
+        columns["day"].append(day)
+        columns["amount"].append(amount)
+        columns["type"].append(record_type)
+        columns["category"].append(self._encode("category", category))
+        columns["subcategory"].append(self._encode("subcategory", subcategory))
+        columns["account"].append(self._encode("account", account))
+        columns["merchant"].append(self._encode("merchant", merchant))
+        self.sorted = False
+        self._months = None
+
+    def rows(self):
+        """逐条返回解码后的记录 (天数, 金额, 类型, 一级分类, 二级分类, 账户, 备注)"""
+        columns = [self._column(name) for name, _ in COLUMNS]
+        dictionaries = [self.dictionaries.get(name) for name, _ in COLUMNS]
+        for row in zip(*columns):
+            yield tuple(values[v] if values else v for v, values in zip(row, dictionaries))
+
+    def merge(self, other: "TransactionStore") -> List[Tuple]:
+        """
+        合并另一份交易记录（例如再次导入有重叠时间段的账单）
+        相同的记录按出现次数合并: 只添加 other 中比当前多出的部分
+
+        Returns:
+            新增的记录（与 rows() 格式相同）
+        """
+        existing: Dict[Tuple, int] = {}
+        for row in self.rows():
+            existing[row] = existing.get(row, 0) + 1
+
+        added = []
+        for row in other.rows():
+            if existing.get(row):
+                existing[row] -= 1
+            else:
+                self.add(*row)
+                added.append(row)
+        return added
+
+    def sort_by_day(self):
+        """按日期排序（保持同一天内的原有顺序）"""
+        if self.sorted:
+            return
+        days = self._column("day")
+        order = sorted(range(len(days)), key=days.__getitem__)
+        for name, code in COLUMNS:
+            column = self._column(name)
+            self.columns[name] = array(code, (column[i] for i in order))
+        self.sorted = True
+        self._months = None
+
+    # 查询
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None):
+        """返回列数据的 [start:stop] 部分（有 NumPy 时为共享内存的 ndarray）"""
+        column = self._column(name)
+        if np is not None:
+            column = np.frombuffer(column, dtype=column.format if isinstance(column, memoryview)
+                                   else column.typecode)
+        if start or stop is not None:
+            return column[start:stop]
+        return column
+
+    def months(self, start: int = 0, stop: Optional[int] = None):
+        """每条记录的月份键（全部记录的结果会缓存）"""
+        if not start and stop is None and self._months is not None:
+            return self._months
+
+        days = self.column("day", start, stop)
+        if np is not None:
+            days = days.astype("datetime64[D]")
+            months = days.astype("datetime64[M]").astype(np.int64) + EPOCH_MONTH
+        else:
+            cache = {}
+            months = array("i", (
+                cache[day] if day in cache else cache.setdefault(day, day_to_month(day))
+                for day in days
+            ))
+
+        if not start and stop is None:
+            self._months = months
+        return months
+
+    def day_range(self, first_day: int, last_day: int) -> Tuple[int, int]:
+        """日期在 [first_day, last_day] 之间的记录的下标范围（需要已按日期排序）"""
+        days = self._column("day")
+        return bisect.bisect_left(days, first_day), bisect.bisect_right(days, last_day)
+
+    def month_range(self, month: int) -> Tuple[int, int]:
+        """某月记录的下标范围（需要已按日期排序）"""
+        first, following = (datetime.date(m // 12, m % 12 + 1, 1) for m in (month, month + 1))
+        return self.day_range(first.toordinal() - EPOCH_ORDINAL,
+                              following.toordinal() - EPOCH_ORDINAL - 1)
+
+    def latest_month(self) -> Optional[int]:
+        """最近一条记录所在的月份"""
+        if not len(self):
+            return None
+        days = self._column("day")
+        return day_to_month(days[-1] if self.sorted else max(days))
+
+    def group_sum(self, by: str, record_type: int = TYPE_EXPENSE,
+                  month: Optional[int] = None) -> Dict[int, Tuple[int, int]]:
+        """
+        按列分组求和
+
+        Args:
+            by: 分组的列名，或 "month"
+            record_type: 只统计该类型的记录
+            month: 只统计该月份的记录
+
+        Returns:
+            {分组键（字典编码或月份键）: (金额合计（分）, 笔数)}
+        """
+        # 已按日期排序时只读取该月的记录
+        start, stop = 0, None
+        if month is not None and self.sorted:
+            start, stop = self.month_range(month)
+            month = None
+
+        keys = self.months(start, stop) if by == "month" else self.column(by, start, stop)
+        types = self.column("type", start, stop)
+        amounts = self.column("amount", start, stop)
+        months = self.months(start, stop) if month is not None else None
+
+        if np is not None:
+            return self._group_sum_numpy(keys, types, amounts, months, record_type, month)
+
+        selected = (t == record_type for t in types)
+        if months is not None:
+            selected = (s and m == month for s, m in zip(selected, months))
+
+        sums: Dict[int, List[int]] = {}
+        for key, amount in itertools.compress(zip(keys, amounts), selected):
+            total = sums.get(key)
+            if total is None:
+                sums[key] = [amount, 1]
+            else:
+                total[0] += amount
+                total[1] += 1
+        return {key: (total[0], total[1]) for key, total in sums.items()}
+
+    @staticmethod
+    def _group_sum_numpy(keys, types, amounts, months, record_type: int,
+                         month: Optional[int]):
+        """group_sum 的 NumPy 实现（bincount）"""
+        mask = types == record_type
+        if months is not None:
+            mask &= months == month
+        keys = np.asarray(keys)[mask]
+        if not len(keys):
+            return {}
+
+        offset = int(keys.min())
+        keys = keys - offset
+        counts = np.bincount(keys)
+        sums = np.bincount(keys, weights=amounts[mask])
+        return {int(key) + offset: (int(round(sums[key])), int(counts[key]))
+                for key in np.flatnonzero(counts)}
+
+    def monthly_totals(self, record_type: int = TYPE_EXPENSE) -> List[Tuple[int, int, int]]:
+        """每月合计 [(月份键, 金额, 笔数), ...]，按月份升序"""
+        sums = self.group_sum("month", record_type)
+        return [(month, *sums[month]) for month in sorted(sums)]
+
+    def breakdown(self, by: str = "category", month: Optional[int] = None,
+                  record_type: int = TYPE_EXPENSE, top_n: Optional[int] = None,
+                  skip_empty: bool = False) -> List[Tuple[str, int, int]]:
+        """
+        按分类/账户/备注分组的合计 [(名称, 金额, 笔数), ...]，按金额降序
+
+        Args:
+            by: "category" / "subcategory" / "account" / "merchant"
+            top_n: 只返回金额最多的前几项
+            skip_empty: 不包含名称为空的分组（例如没有备注的记录）
+        """
+        sums = self.group_sum(by, record_type, month)
+        if skip_empty:
+            sums.pop(0, None)
+        names = self.dictionaries[by]
+        items = [(names[code], amount, count) for code, (amount, count) in sums.items()]
+        if top_n is not None:
+            return heapq.nlargest(top_n, items, key=lambda item: item[1])
+        return sorted(items, key=lambda item: item[1], reverse=True)
+
+    def top_merchants(self, top_n: int = 10, month: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """消费金额最多的商家（备注）"""
+        return self.breakdown("merchant", month, TYPE_EXPENSE, top_n=top_n, skip_empty=True)
+
+
+def get_columns_dir(wf) -> str:
+    """列文件所在目录"""
+    path = os.path.join(wf.cachedir, COLUMNS_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _column_path(columns_dir: str, name: str, version: int) -> str:
+    return os.path.join(columns_dir, f"{name}.{version}.col")
+
+
+def load_store(wf) -> TransactionStore:
+    """
+    加载交易记录（没有时返回空的存储）
+    只读取元数据，列文件在查询用到时才映射
+    """
+    meta = wf.cached_data(STORE_NAME, max_age=0, serializer=STORE_SERIALIZER)
+    if (not meta or meta.get("format") != STORE_FORMAT
+            or meta.get("byteorder") != sys.byteorder):
+        return TransactionStore()
+
+    columns_dir = get_columns_dir(wf)
+    typecodes = dict(COLUMNS)
+
+    def loader(name):
+        return _map_column(_column_path(columns_dir, name, meta["version"]), typecodes[name])
+
+    return TransactionStore({}, meta["dictionaries"], rows=meta["rows"], loader=loader)
+
+
+def save_store(wf, store: TransactionStore):
+    """
+    保存交易记录（按日期排序后每列写入一个文件）
+    列文件使用新的版本号写入，元数据更新后再删除旧版本的文件，
+    正在读取旧版本的进程不受影响
+    """
+    store.sort_by_day()
+    columns_dir = get_columns_dir(wf)
+    version = time.time_ns()
+
+    for name, _ in COLUMNS:
+        with atomic_writer(_column_path(columns_dir, name, version), 'wb') as f:
+            f.write(store._column(name).tobytes())
+
+    wf.cache_data(STORE_NAME, {
+        "format": STORE_FORMAT,
+        "byteorder": sys.byteorder,
+        "version": version,
+        "rows": len(store),
+        "dictionaries": store.dictionaries,
+    }, serializer=STORE_SERIALIZER)
+
+    current = f".{version}.col"
+    for filename in os.listdir(columns_dir):
+        if filename.endswith(".col") and not filename.endswith(current):
+            os.remove(os.path.join(columns_dir, filename))
@@ -49,6 +49,7 @@ from .workflow import (
     MATCH_INITIALS_STARTSWITH,
     MATCH_STARTSWITH,
     MATCH_SUBSTRING,
+    FilterIndex,
     KeychainError,
     PasswordNotFound,
     Workflow,
@@ -63,6 +64,7 @@ __licence__ = "MIT"
 __copyright__ = "Copyright 2014-2019 Dean Jackson"
 
 __all__ = [
+    "FilterIndex",
     "Variables",
     "Workflow",
     "Workflow3",
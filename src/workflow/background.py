@@ -17,15 +17,19 @@ and examples.
 """
 
 
+import json
 import os
 import pickle
+import shutil
 import signal
 import subprocess
 import sys
+import time
 
 from workflow import Workflow
+from workflow.util import atomic_writer
 
-__all__ = ["is_running", "run_in_background"]
+__all__ = ["JobStatus", "is_running", "job_status", "run_in_background"]
 
 _wf = None
 
@@ -65,6 +69,18 @@ def _pid_file(name):
     return wf().cachefile(name + ".pid")
 
 
+def _status_file(name):
+    """Return path to status file for ``name``.
+
+    :param name: name of task
+    :type name: ``unicode``
+    :returns: Path to status file for task
+    :rtype: ``unicode`` filepath
+
+    """
+    return wf().cachefile(name + ".status")
+
+
 def _process_exists(pid):
     """Check if a process with PID ``pid`` exists.
 
@@ -121,6 +137,122 @@ def is_running(name):
     return False
 
 
+def job_status(name):
+    """Return the status last reported by job ``name``.
+
+    The status is written by the job itself with :class:`JobStatus`.
+    Reading it is a single small file read, so it is cheap enough to
+    call on every run of a Script Filter.
+
+    Args:
+        name (str): Name of the job.
+
+    Returns:
+        dict: ``started``, ``updated`` and ``finished`` timestamps
+        (``finished`` is ``None`` until the job is done), ``done`` and
+        ``total`` item counts, the last ``error`` message (or ``None``),
+        the ``result`` passed to :meth:`JobStatus.finish` and any extra
+        fields passed to :class:`JobStatus`. ``None`` if the job has
+        never reported its status.
+    """
+    try:
+        with open(_status_file(name), "r") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+class JobStatus(object):
+    """Progress of a background job, for :func:`job_status`.
+
+    Create it in the job when it starts, then report progress::
+
+        with JobStatus("import", total=len(rows)) as status:
+            for row in rows:
+                ...
+                status.advance()
+
+    Progress is written at most once every ``interval`` seconds, so
+    calling :meth:`advance` for every item is fine. Errors and the end of
+    the job are always written straight away. An exception raised in the
+    ``with`` block is recorded as the job's error.
+
+    Args:
+        name (str): Name of the job.
+        total (int, optional): Number of items to process, if known.
+        interval (float, optional): Minimum seconds between writes.
+        **extra: Additional JSON-serializable fields to store, e.g.
+            the name of the file being processed.
+    """
+
+    def __init__(self, name, total=0, interval=0.2, **extra):
+        """Create new `JobStatus` and write initial status."""
+        self.path = _status_file(name)
+        self.interval = interval
+        now = time.time()
+        self.data = {
+            "started": now,
+            "updated": now,
+            "finished": None,
+            "done": 0,
+            "total": total,
+            "error": None,
+            "result": None,
+        }
+        self.data.update(extra)
+        self.save()
+
+    def save(self):
+        """Write status to disk."""
+        self.data["updated"] = time.time()
+        with atomic_writer(self.path, "w") as fp:
+            json.dump(self.data, fp)
+
+    def update(self, done=None, total=None, error=None):
+        """Update progress and write it if ``interval`` has passed.
+
+        Args:
+            done (int, optional): Number of items processed.
+            total (int, optional): Number of items to process.
+            error (str, optional): Error message. Always written.
+        """
+        if done is not None:
+            self.data["done"] = done
+        if total is not None:
+            self.data["total"] = total
+        if error is not None:
+            self.data["error"] = error
+
+        if error is not None or time.time() - self.data["updated"] >= self.interval:
+            self.save()
+
+    def advance(self, count=1):
+        """Add ``count`` to the number of processed items."""
+        self.update(done=self.data["done"] + count)
+
+    def finish(self, error=None, result=None):
+        """Mark job as finished.
+
+        Args:
+            error (str, optional): Error the job failed with.
+            result (optional): JSON-serializable result of the job.
+        """
+        if error is not None:
+            self.data["error"] = error
+        if result is not None:
+            self.data["result"] = result
+        self.data["finished"] = time.time()
+        self.save()
+
+    def __enter__(self):
+        """Return self."""
+        return self
+
+    def __exit__(self, typ, value, traceback):
+        """Mark job as finished, recording exception (if any)."""
+        self.finish("{0}: {1}".format(typ.__name__, value) if typ else None)
+
+
 def _background(
     pidfile, stdin="/dev/null", stdout="/dev/null", stderr="/dev/null"
 ):  # pragma: no cover
@@ -142,10 +274,7 @@ def _background(
             pid = os.fork()
             if pid > 0:
                 if write:  # write PID of child process to `pidfile`
-                    tmp = pidfile + ".tmp"
-                    with open(tmp, "wb") as fp:
-                        fp.write(pid.to_bytes(4, sys.byteorder))
-                    os.rename(tmp, pidfile)
+                    _write_pid(pidfile, pid)
                 if wait:  # wait for child process to exit
                     os.waitpid(pid, 0)
                 os._exit(0)
@@ -196,26 +325,119 @@ def kill(name, sig=signal.SIGTERM):
     return True
 
 
+def _write_pid(pidfile, pid):
+    """Atomically write ``pid`` to ``pidfile``."""
+    tmp = pidfile + ".tmp"
+    with open(tmp, "wb") as fp:
+        fp.write(pid.to_bytes(4, sys.byteorder))
+    os.rename(tmp, pidfile)
+
+
+def _spawn(name, args, cwd=None, env=None):  # pragma: no cover
+    """Start ``args`` as a daemon directly from the calling process.
+
+    Double-forks (the second child in a new session, with standard
+    streams redirected to ``/dev/null``), then the second child forks
+    again and ``exec``s the command. The second child writes the
+    command's PID to the PID file, passes it back to the caller through
+    a pipe, waits for the command to exit and deletes the PID file, so
+    a finished job never leaves a stale PID behind that a new process
+    might be given.
+
+    The first child exits straight away, so the caller only waits for
+    the forks, not for a Python interpreter to start, and the daemon is
+    re-parented to ``init`` (no zombie if the caller keeps running).
+
+    :param name: name of job
+    :type name: unicode
+    :param args: command and its arguments
+    :type args: ``list``
+    :param cwd: working directory of command (default: workflow directory)
+    :param env: environment of command (default: current environment)
+    :returns: ``0`` if command was started, else ``1``
+    :rtype: int
+
+    """
+    if isinstance(args, str):
+        args = [args]
+    env = os.environ if env is None else env
+    # Check the command exists here, as errors after ``exec`` are lost
+    if shutil.which(args[0], path=env.get("PATH")) is None:
+        _log().error("[%s] command not found: %r", name, args[0])
+        return 1
+
+    cwd = cwd or wf().workflowdir
+    pidfile = _pid_file(name)
+
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # first child
+        try:
+            os.close(r)
+            os.setsid()
+            if os.fork() == 0:  # second child: watches the command
+                devnull = os.open(os.devnull, os.O_RDWR)
+                for fd in (0, 1, 2):
+                    os.dup2(devnull, fd)
+                daemon = os.fork()
+                if daemon == 0:
+                    os.close(w)
+                    os.chdir(cwd)
+                    os.execvpe(args[0], args, env)
+                _write_pid(pidfile, daemon)
+                os.write(w, daemon.to_bytes(4, sys.byteorder))
+                os.close(w)
+                os.waitpid(daemon, 0)
+                _remove_pid(pidfile, daemon)
+        except BaseException:
+            os._exit(1)
+        os._exit(0)
+
+    os.close(w)
+    os.waitpid(pid, 0)
+    with os.fdopen(r, "rb") as fp:
+        read = fp.read()
+
+    if not read:
+        _log().error("[%s] failed to start command: %r", name, args)
+        return 1
+
+    _log().debug("[%s] background job started", name)
+    return 0
+
+
+def _remove_pid(pidfile, pid):
+    """Delete ``pidfile`` if it still contains ``pid``."""
+    try:
+        with open(pidfile, "rb") as fp:
+            if int.from_bytes(fp.read(), sys.byteorder) != pid:
+                return
+        os.unlink(pidfile)
+    except OSError:
+        pass
+
+
 def run_in_background(name, args, **kwargs):
-    r"""Cache arguments then call this script again via :func:`subprocess.call`.
+    r"""Run command ``args`` in a background process.
 
     :param name: name of job
     :type name: unicode
     :param args: arguments passed as first argument to :func:`subprocess.call`
     :param \**kwargs: keyword arguments to :func:`subprocess.call`
-    :returns: exit code of sub-process
+    :returns: exit code of launcher (not of the command)
     :rtype: int
 
-    When you call this function, it caches its arguments and then calls
+    If no ``kwargs`` other than ``cwd`` and ``env`` are given, the
+    command is started directly from this process (see :func:`_spawn`),
+    which takes a couple of milliseconds.
+
+    Otherwise, this function caches its arguments and then calls
     ``background.py`` in a subprocess. The Python subprocess will load the
     cached arguments, fork into the background, and then run the command you
-    specified.
+    specified. This function returns as soon as the ``background.py``
+    subprocess has forked, returning the exit code of *that* process.
 
-    This function will return as soon as the ``background.py`` subprocess has
-    forked, returning the exit code of *that* process (i.e. not of the command
-    you're trying to run).
-
-    If that process fails, an error will be written to the log file.
+    If launching fails, an error will be written to the log file.
 
     If a process is already running under the same name, this function will
     return immediately and will not run the specified command.
@@ -225,6 +447,23 @@ def run_in_background(name, args, **kwargs):
         _log().info("[%s] job already running", name)
         return
 
+    if set(kwargs) <= {"cwd", "env"}:
+        return _spawn(name, args, **kwargs)
+
+    return _run_via_runner(name, args, **kwargs)
+
+
+def _run_via_runner(name, args, **kwargs):
+    r"""Cache arguments then call this script again via :func:`subprocess.call`.
+
+    :param name: name of job
+    :type name: unicode
+    :param args: arguments passed as first argument to :func:`subprocess.call`
+    :param \**kwargs: keyword arguments to :func:`subprocess.call`
+    :returns: exit code of sub-process
+    :rtype: int
+
+    """
     argcache = _arg_cache(name)
 
     # Cache arguments
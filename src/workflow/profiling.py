@@ -0,0 +1,234 @@
+# encoding: utf-8
+#
+# MIT Licence. See http://opensource.org/licenses/MIT
+#
+
+"""Opt-in profiling of workflow runs.
+
+When enabled, :meth:`Workflow.run() <workflow.Workflow.run>` records
+the duration of each run, split into phases, as a line of JSON in
+``profile.jsonl`` in the workflow's cache directory. ``total`` and the
+``phases`` are wall-clock seconds from the start of
+:meth:`~workflow.Workflow.run`. Phases are timed with
+:meth:`Workflow.phase() <workflow.Workflow.phase>`; the library times
+``feedback`` (serialising the results) itself.
+
+``startup_cpu`` is the CPU time the process used before
+:meth:`~workflow.Workflow.run` was called (interpreter start-up and
+imports). It is CPU, not wall-clock, time and is not part of
+``total``.
+
+Profiling is enabled by setting the :const:`PROFILE_ENV_VAR`
+environment (or workflow) variable, or with the magic arguments
+``workflow:profileon``, ``workflow:profilestats`` and
+``workflow:profileoff``. Its value is a mode:
+
+``timings``
+    Record phase timings only.
+``cprofile``
+    Also run the workflow under :mod:`cProfile` and keep the stats
+    of the :const:`PROFILE_SLOWEST` slowest runs in the ``profiles``
+    subdirectory of the cache directory. Profiling slows the workflow
+    down, so timings recorded in this mode are inflated.
+
+Example of a log line::
+
+    {"time": 1760000000.1, "script": "select_account.py", "mode": "timings",
+     "startup_cpu": 0.0302, "total": 0.0119, "error": false,
+     "phases": {"data load": 0.0011, "feedback": 0.0008}}
+
+"""
+
+import json
+import os
+import time
+
+from workflow.util import atomic_writer
+
+#: Environment variable that enables profiling (``1``/``timings``
+#: or ``cprofile``). Takes precedence over the magic arguments.
+PROFILE_ENV_VAR = "workflow_profile"
+
+#: Profiling modes
+PROFILE_MODES = ("timings", "cprofile")
+
+#: Name of file in cache directory holding the mode set by magic arguments
+PROFILE_FLAG_FILE = "__workflow_profile"
+
+#: Name of the JSON Lines log in the cache directory
+PROFILE_LOG = "profile.jsonl"
+
+#: Size (bytes) beyond which the oldest half of the log is discarded
+PROFILE_LOG_MAX_BYTES = 256 * 1024
+
+#: Subdirectory of the cache directory for cProfile stats
+PROFILE_STATS_DIR = "profiles"
+
+#: Number of slowest runs whose cProfile stats are kept
+PROFILE_SLOWEST = 5
+
+
+def profile_mode(wf):
+    """Return profiling mode for this run.
+
+    :param wf: the :class:`~workflow.Workflow` being run
+    :returns: one of :const:`PROFILE_MODES` or ``None`` if profiling
+        is off
+    :rtype: ``str``
+
+    """
+    value = os.getenv(PROFILE_ENV_VAR)
+    if value is None:
+        try:
+            with open(wf.cachefile(PROFILE_FLAG_FILE)) as fp:
+                value = fp.read()
+        except IOError:
+            return None
+
+    value = value.strip().lower()
+    if value in PROFILE_MODES:
+        return value
+    if value in ("1", "true", "yes", "on"):
+        return "timings"
+    return None
+
+
+def set_profile_mode(wf, mode):
+    """Set profiling mode of future runs (used by magic arguments).
+
+    :param wf: :class:`~workflow.Workflow` instance
+    :param mode: one of :const:`PROFILE_MODES` or ``None`` to turn
+        profiling off
+
+    """
+    path = wf.cachefile(PROFILE_FLAG_FILE)
+    if mode is None:
+        if os.path.exists(path):
+            os.unlink(path)
+        return
+
+    with open(path, "w") as fp:
+        fp.write(mode)
+
+
+class _Phase(object):
+    """Context manager that adds its duration to a phase of a :class:`Profile`."""
+
+    __slots__ = ("phases", "name", "start")
+
+    def __init__(self, phases, name):
+        self.phases = phases
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.phases[self.name] = self.phases.get(self.name, 0.0) + elapsed
+
+
+class Profile(object):
+    """Timings (and optionally cProfile stats) of one workflow run.
+
+    Created by :meth:`Workflow.run() <workflow.Workflow.run>` when
+    profiling is enabled.
+
+    :param mode: one of :const:`PROFILE_MODES`
+    :type mode: ``str``
+
+    Attributes:
+        startup_cpu (float): CPU seconds used before the profile was
+            created.
+        phases (dict): Wall-clock seconds spent in each phase. Time
+            spent in the same phase several times (e.g. resolving an
+            icon for each item) is added up.
+
+    """
+
+    def __init__(self, mode):
+        """Create new :class:`Profile`, starting the clock."""
+        self.mode = mode
+        self.startup_cpu = time.process_time()
+        self.phases = {}
+        self.start = time.perf_counter()
+        self.profiler = None
+        if mode == "cprofile":
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+
+    def phase(self, name):
+        """Return context manager that times phase ``name``."""
+        return _Phase(self.phases, name)
+
+    def call(self, func, *args):
+        """Call ``func`` with ``args``, under cProfile if enabled."""
+        if self.profiler is not None:
+            return self.profiler.runcall(func, *args)
+        return func(*args)
+
+    def save(self, wf, script, error=False):
+        """Append this run to the log and keep its stats if slow enough.
+
+        :param wf: :class:`~workflow.Workflow` instance
+        :param script: name of the script that was run
+        :param error: whether the run failed
+        :returns: total duration of the run in seconds
+        :rtype: ``float``
+
+        """
+        total = time.perf_counter() - self.start
+        record = {
+            "time": round(time.time(), 3),
+            "script": script,
+            "mode": self.mode,
+            "startup_cpu": round(self.startup_cpu, 6),
+            "total": round(total, 6),
+            "error": error,
+            "phases": {name: round(t, 6) for name, t in self.phases.items()},
+        }
+
+        path = wf.cachefile(PROFILE_LOG)
+        with open(path, "a", encoding="utf-8") as fp:
+            fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        _trim_log(path)
+
+        if self.profiler is not None:
+            self._save_stats(wf, script, total)
+
+        return total
+
+    def _save_stats(self, wf, script, total):
+        """Save cProfile stats if this is one of the slowest runs."""
+        dirpath = wf.cachefile(PROFILE_STATS_DIR)
+        if not os.path.exists(dirpath):
+            os.makedirs(dirpath)
+
+        # Filenames start with the zero-padded duration in microseconds,
+        # so they sort slowest last
+        kept = sorted(n for n in os.listdir(dirpath) if n.endswith(".prof"))
+        name = "{0:012d}-{1}-{2}.prof".format(
+            int(total * 1e6), int(time.time()), os.path.splitext(script)[0]
+        )
+        if len(kept) >= PROFILE_SLOWEST and name < kept[-PROFILE_SLOWEST]:
+            return
+
+        self.profiler.dump_stats(os.path.join(dirpath, name))
+        kept.append(name)
+        for old in sorted(kept)[:-PROFILE_SLOWEST]:
+            os.unlink(os.path.join(dirpath, old))
+
+
+def _trim_log(path):
+    """Discard oldest half of log at ``path`` if it has grown too big."""
+    if os.path.getsize(path) <= PROFILE_LOG_MAX_BYTES:
+        return
+
+    with open(path, encoding="utf-8") as fp:
+        lines = fp.readlines()
+
+    with atomic_writer(path, "w") as fp:
+        fp.writelines(lines[len(lines) // 2 :])
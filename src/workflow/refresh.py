@@ -0,0 +1,67 @@
+# encoding: utf-8
+#
+# MIT Licence. See http://opensource.org/licenses/MIT
+#
+
+"""Regenerate a cache in a background process.
+
+Started by :meth:`Workflow.refresh_cache <workflow.Workflow.refresh_cache>`
+(via :func:`~workflow.background.run_in_background`) when
+:meth:`~workflow.Workflow.cached_data` is called with ``stale_ok=True``
+and the cached data has expired. Not intended to be run directly::
+
+    python -m workflow.refresh <name> <serializer> <marker> <module> <qualname> <args>
+
+``module`` is either a module name or the path to a Python file.
+``args`` is a JSON list of positional arguments for the function.
+"""
+
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+
+from workflow import Workflow
+
+
+def _load_module(module):
+    """Import ``module`` by name or, if it's a file path, from file."""
+    if not os.path.isabs(module):
+        return importlib.import_module(module)
+
+    name = os.path.splitext(os.path.basename(module))[0]
+    # Make the script's siblings importable, as when it's run directly
+    sys.path.insert(0, os.path.dirname(module))
+    spec = importlib.util.spec_from_file_location(name, module)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _load_func(module, qualname):
+    """Return function ``qualname`` from ``module``."""
+    obj = _load_module(module)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def main(wf):  # pragma: no cover
+    """Call the data function and cache its result."""
+    name, serializer, marker, module, qualname, args = wf.args
+    log = wf.logger
+    try:
+        func = _load_func(module, qualname)
+        log.debug("[%s] regenerating cache with %s.%s", name, module, qualname)
+        data = func(*json.loads(args))
+        wf.cache_data(name, data, serializer=serializer)
+        log.debug("[%s] cache refreshed", name)
+    finally:
+        if os.path.exists(marker):
+            os.unlink(marker)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    Workflow().run(main)
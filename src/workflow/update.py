@@ -28,7 +28,7 @@ import re
 import subprocess
 import tempfile
 from collections import defaultdict
-from functools import total_ordering
+from functools import partial, total_ordering
 from itertools import zip_longest
 from urllib import request
 
@@ -412,26 +412,35 @@ def build_api_url(repo):
     return RELEASES_BASE.format(repo)
 
 
-def get_downloads(repo):
+def fetch_releases(url):
+    """Retrieve JSON list of releases from GitHub API URL ``url``.
+
+    Module-level (rather than a closure in :func:`get_downloads`), so
+    the cache can be refreshed in a background process.
+    """
+    wf().logger.info("retrieving releases from %r ...", url)
+    r = request.urlopen(url)
+    return r.read()
+
+
+def get_downloads(repo, stale_ok=False):
     """Load available ``Download``s for GitHub repo.
 
     .. versionadded: 1.37
 
     Args:
         repo (unicode): GitHub repo to load releases for.
+        stale_ok (bool): If the cached releases have expired, use them
+            anyway and fetch new ones in the background.
 
     Returns:
         list: Sequence of `Download` contained in GitHub releases.
     """
     url = build_api_url(repo)
-
-    def _fetch():
-        wf().logger.info("retrieving releases for %r ...", repo)
-        r = request.urlopen(url)
-        return r.read()
-
     key = "github-releases-" + repo.replace("/", "-")
-    js = wf().cached_data(key, _fetch, max_age=60)
+    js = wf().cached_data(
+        key, partial(fetch_releases, url), max_age=60, stale_ok=stale_ok
+    )
 
     return Download.from_releases(js)
 
@@ -463,7 +472,9 @@ def latest_download(dls, alfred_version=None, prereleases=False):
     return None
 
 
-def check_update(repo, current_version, prereleases=False, alfred_version=None):
+def check_update(
+    repo, current_version, prereleases=False, alfred_version=None, stale_ok=False
+):
     """Check whether a newer release is available on GitHub.
 
     Args:
@@ -473,6 +484,7 @@ def check_update(repo, current_version, prereleases=False, alfred_version=None):
         prereleases (bool): Whether to include pre-releases.
         alfred_version (unicode): version of currently-running Alfred.
             if empty, defaults to ``$alfred_version`` environment variable.
+        stale_ok (bool): Passed to :func:`get_downloads`.
 
     Returns:
         bool: ``True`` if an update is available, else ``False``
@@ -486,7 +498,7 @@ def check_update(repo, current_version, prereleases=False, alfred_version=None):
     no_update = {"available": False, "download": None, "version": None}
     current = Version(current_version)
 
-    dls = get_downloads(repo)
+    dls = get_downloads(repo, stale_ok)
     if not len(dls):
         wf().logger.warning("no valid downloads for %s", repo)
         wf().cache_data(key, no_update)
@@ -469,6 +469,27 @@ def atomic_writer(fpath, mode):
                 pass
 
 
+def file_version(path):
+    """Return version of file (or directory) ``path`` for cache keys.
+
+    The version changes whenever the file is modified. Compare it with
+    a stored version to tell whether data derived from the file are
+    stale, at the cost of a single ``stat()``.
+
+    :param path: path of file or directory
+    :type path: ``unicode``
+    :returns: ``(st_mtime_ns, st_size)``, or ``(0, 0)`` if ``path``
+        doesn't exist
+    :rtype: ``tuple``
+
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return (0, 0)
+    return (st.st_mtime_ns, st.st_size)
+
+
 class LockFile(object):
     """Context manager to protect filepaths with lockfiles.
 
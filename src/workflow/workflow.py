@@ -21,9 +21,13 @@ up your Python script to best utilise the :class:`Workflow` object.
 
 
 import binascii
+import functools
+import heapq
+import io
 import json
 import logging
 import logging.handlers
+import marshal
 import os
 import pickle
 import plistlib
@@ -33,8 +37,10 @@ import string
 import subprocess
 import sys
 import time
+import types
 import unicodedata
-from contextlib import contextmanager
+import zlib
+from contextlib import contextmanager, nullcontext
 from copy import deepcopy
 from typing import Optional
 
@@ -43,6 +49,11 @@ try:
 except ImportError:  # pragma: no cover
     import xml.etree.ElementTree as ET
 
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover
+    lz4_frame = None
+
 # imported to maintain API
 from workflow.util import AcquisitionError  # noqa: F401
 from workflow.util import LockFile, atomic_writer, uninterruptible
@@ -53,6 +64,9 @@ assert sys.version_info[0] == 3
 #: correctly have the value ``None``)
 UNSET = object()
 
+#: Context manager returned by :meth:`Workflow.phase` when profiling is off
+_NO_PHASE = nullcontext()
+
 ####################################################################
 # Standard system icons
 ####################################################################
@@ -386,6 +400,14 @@ ASCII_REPLACEMENTS = {
     "ỹ": "y",
 }
 
+#: :meth:`str.translate` table built from :const:`ASCII_REPLACEMENTS`
+ASCII_TRANSLATION = str.maketrans(ASCII_REPLACEMENTS)
+
+#: Number of folded/normalised strings memoised by :func:`fold_to_ascii`
+#: and :meth:`Workflow.decode`. Filtering folds the same item keys on
+#: every keystroke, so the working set is the size of the item list.
+TEXT_CACHE_SIZE = 8192
+
 ####################################################################
 # Smart-to-dumb punctuation mapping
 ####################################################################
@@ -434,6 +456,9 @@ MATCH_ALLCHARS = 64
 #: Combination of all other ``MATCH_*`` constants
 MATCH_ALL = 127
 
+#: Number of :const:`MATCH_ALLCHARS` search functions kept for reuse
+SEARCH_CACHE_SIZE = 256
+
 
 ####################################################################
 # Used by `Workflow.check_update`
@@ -443,6 +468,26 @@ MATCH_ALL = 127
 DEFAULT_UPDATE_FREQUENCY = 1
 
 
+####################################################################
+# Used by `Workflow.refresh_cache`
+####################################################################
+
+#: Seconds after which a pending background cache refresh is assumed
+#: to have died and may be started again
+REFRESH_TIMEOUT = 600
+
+
+####################################################################
+# Used by `Workflow._cached_info`
+####################################################################
+
+#: ``info.plist`` keys persisted to the info cache in :attr:`Workflow.cachedir`
+INFO_CACHE_KEYS = ("bundleid", "name", "version")
+
+#: Filename of the info cache within :attr:`Workflow.cachedir`
+INFO_CACHE_FILENAME = "__workflow_info_plist.json"
+
+
 ####################################################################
 # Keychain access errors
 ####################################################################
@@ -490,12 +535,177 @@ def isascii(text):
     :returns: ``True`` if ``text`` contains only ASCII characters
     :rtype: ``Boolean``
 
+    """
+    return text.isascii()
+
+
+def _stat(path):
+    """Return :func:`os.stat` result for ``path`` or ``None`` if missing.
+
+    :param path: path to file
+    :type path: ``unicode``
+    :returns: :class:`os.stat_result` or ``None``
+
     """
     try:
-        text.encode("ascii")
-    except UnicodeEncodeError:
-        return False
-    return True
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _importable_func(func):
+    """Return ``(module, qualname, args)`` to call ``func`` from another process.
+
+    ``module`` is a module name, or the path of the running script if
+    ``func`` was defined in ``__main__``.
+
+    :param func: module-level function or :func:`functools.partial` of one
+        with JSON-serializable positional arguments
+    :type func: ``callable``
+    :returns: ``tuple`` or ``None`` if ``func`` can't be imported
+
+    """
+    args = ()
+    if isinstance(func, functools.partial):
+        if func.keywords:
+            return None
+        args = list(func.args)
+        func = func.func
+
+    if not isinstance(func, types.FunctionType) or "<" in func.__qualname__:
+        return None
+
+    module = func.__module__
+    if module == "__main__":
+        main = sys.modules["__main__"]
+        spec = getattr(main, "__spec__", None)
+        if spec is not None:  # run with ``python -m``
+            module = spec.name
+        elif getattr(main, "__file__", None):
+            module = os.path.abspath(main.__file__)
+        else:
+            return None
+
+    try:
+        json.dumps(args)
+    except (TypeError, ValueError):
+        return None
+
+    return module, func.__qualname__, args
+
+
+def fold_to_ascii(text):
+    """Convert non-ASCII characters to closest ASCII equivalent.
+
+    Module-level implementation of :meth:`Workflow.fold_to_ascii`, so
+    that it can be used without a :class:`Workflow` instance (e.g. by
+    :class:`FilterIndex`).
+
+    :param text: text to convert
+    :type text: ``unicode``
+    :returns: text containing only ASCII characters
+    :rtype: ``unicode``
+
+    """
+    if text.isascii():
+        return text
+    return _fold_non_ascii(text)
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _fold_non_ascii(text):
+    """Memoised part of :func:`fold_to_ascii` for non-ASCII ``text``."""
+    return unicodedata.normalize("NFKD", text.translate(ASCII_TRANSLATION))
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _normalize(normalization, text):
+    """Memoised :func:`unicodedata.normalize` for non-ASCII ``text``."""
+    if unicodedata.is_normalized(normalization, text):
+        return text
+    return unicodedata.normalize(normalization, text)
+
+
+def _search_key(value):
+    """Precompute the parts of ``value`` that the filter rules test.
+
+    :param value: (possibly diacritic-folded) search key of an item
+    :type value: ``unicode``
+    :returns: ``(value, lower, chars, capitals, atoms, initials)``
+    :rtype: ``tuple``
+
+    """
+    lower = value.lower()
+    atoms = tuple([s.lower() for s in split_on_delimiters(value)])
+    return (
+        value,
+        lower,
+        frozenset(lower),
+        "".join([c for c in value if c in INITIALS]).lower(),
+        atoms,
+        "".join([s[0] for s in atoms if s]),
+    )
+
+
+def _score_search_key(skey, query, match_on, search=None):
+    """Score precomputed search key ``skey`` against ``query``.
+
+    ``query`` must already be lowercase. ``search`` is the
+    :const:`MATCH_ALLCHARS` search function for ``query`` (see
+    :func:`_allchars_search`); it is only required if ``match_on``
+    includes :const:`MATCH_ALLCHARS`.
+
+    :returns: ``(score, rule)``
+
+    """
+    value, lower, chars, capitals, atoms, initials = skey
+
+    # pre-filter any items that do not contain all characters
+    # of ``query`` to save on running several more expensive tests
+    if not chars.issuperset(query):
+        return (0, None)
+
+    # item starts with query
+    if match_on & MATCH_STARTSWITH and lower.startswith(query):
+        return (100.0 - (len(value) / len(query)), MATCH_STARTSWITH)
+
+    # query matches capitalised letters in item,
+    # e.g. of = OmniFocus
+    if match_on & MATCH_CAPITALS and capitals.startswith(query):
+        return (100.0 - (len(capitals) / len(query)), MATCH_CAPITALS)
+
+    # is `query` one of the atoms in item? similar to substring, but
+    # scores more highly, as it's a word within the item
+    if match_on & MATCH_ATOM and query in atoms:
+        return (100.0 - (len(value) / len(query)), MATCH_ATOM)
+
+    # `query` matches start (or all) of the initials of the
+    # atoms, e.g. ``himym`` matches "How I Met Your Mother"
+    # *and* "how i met your mother" (the ``capitals`` rule only
+    # matches the former)
+    if match_on & MATCH_INITIALS_STARTSWITH and initials.startswith(query):
+        return (100.0 - (len(initials) / len(query)), MATCH_INITIALS_STARTSWITH)
+
+    # `query` is a substring of initials, e.g. ``doh`` matches
+    # "The Dukes of Hazzard"
+    elif match_on & MATCH_INITIALS_CONTAIN and query in initials:
+        return (95.0 - (len(initials) / len(query)), MATCH_INITIALS_CONTAIN)
+
+    # `query` is a substring of item
+    if match_on & MATCH_SUBSTRING and query in lower:
+        return (90.0 - (len(value) / len(query)), MATCH_SUBSTRING)
+
+    # finally, assign a score based on how close together the
+    # characters in `query` are in item.
+    if match_on & MATCH_ALLCHARS:
+        match = search(lower)
+        if match:
+            start, end = match
+            score = 100.0 / ((1 + start) * (end - start + 1))
+            return (score, MATCH_ALLCHARS)
+
+    # Nothing matched
+    return (0, None)
 
 
 ####################################################################
@@ -686,10 +896,366 @@ class PickleSerializer(BaseSerializer):
         return pickle.dump(obj, file_obj, protocol=-1)
 
 
+class MarshalSerializer(BaseSerializer):
+    """Wrapper around :mod:`marshal`.
+
+    Much faster than ``pickle`` for plain data (``dict``, ``list``,
+    ``tuple``, ``set``, ``str``, numbers, etc.), but cannot store
+    instances of other classes. The format may change between Python
+    versions, so only use it for data that can be regenerated, such as
+    the cache.
+
+    """
+
+    is_binary = True
+
+    @classmethod
+    def load(cls, file_obj):
+        """Load serialized object from open marshal file.
+
+        :param file_obj: file handle
+        :type file_obj: ``file`` object
+        :returns: object loaded from marshal file
+        :rtype: object
+
+        """
+        return marshal.loads(file_obj.read())
+
+    @classmethod
+    def dump(cls, obj, file_obj):
+        """Serialize object ``obj`` to open marshal file.
+
+        :param obj: Python object to serialize
+        :type obj: plain data structure
+        :param file_obj: file handle
+        :type file_obj: ``file`` object
+
+        """
+        return file_obj.write(marshal.dumps(obj))
+
+
+class CompressedSerializer(BaseSerializer):
+    """Compress the output of another serializer.
+
+    Subclasses set :attr:`serializer` (a binary serializer) and the
+    ``compress`` and ``decompress`` attributes, functions that take
+    and return ``bytes``. Useful for large blobs, where reading less
+    from disk outweighs the cost of decompressing.
+
+    """
+
+    is_binary = True
+
+    #: Binary serializer whose output is compressed
+    serializer = PickleSerializer
+
+    @classmethod
+    def load(cls, file_obj):
+        """Load serialized object from open compressed file.
+
+        :param file_obj: file handle
+        :type file_obj: ``file`` object
+        :returns: object loaded from file
+        :rtype: object
+
+        """
+        return cls.serializer.load(io.BytesIO(cls.decompress(file_obj.read())))
+
+    @classmethod
+    def dump(cls, obj, file_obj):
+        """Serialize and compress object ``obj`` to open file.
+
+        :param obj: Python object to serialize
+        :type obj: object supported by :attr:`serializer`
+        :param file_obj: file handle
+        :type file_obj: ``file`` object
+
+        """
+        buf = io.BytesIO()
+        cls.serializer.dump(obj, buf)
+        return file_obj.write(cls.compress(buf.getvalue()))
+
+
+class ZlibPickleSerializer(CompressedSerializer):
+    """``pickle`` compressed with :mod:`zlib` at a fast level."""
+
+    #: :func:`zlib.compress` at level 1 (the fastest)
+    compress = staticmethod(functools.partial(zlib.compress, level=1))
+    decompress = staticmethod(zlib.decompress)
+
+
+class ZlibMarshalSerializer(ZlibPickleSerializer):
+    """``marshal`` compressed with :mod:`zlib` at a fast level."""
+
+    serializer = MarshalSerializer
+
+
+class LZ4PickleSerializer(CompressedSerializer):
+    """``pickle`` compressed with LZ4 frames.
+
+    Only registered if the optional ``lz4`` package is installed.
+
+    """
+
+    if lz4_frame is not None:  # pragma: no cover
+        compress = staticmethod(lz4_frame.compress)
+        decompress = staticmethod(lz4_frame.decompress)
+
+
 # Set up default manager and register built-in serializers
 manager = SerializerManager()
 manager.register("pickle", PickleSerializer)
 manager.register("json", JSONSerializer)
+manager.register("marshal", MarshalSerializer)
+manager.register("pickle.zlib", ZlibPickleSerializer)
+manager.register("marshal.zlib", ZlibMarshalSerializer)
+if lz4_frame is not None:  # pragma: no cover
+    manager.register("pickle.lz4", LZ4PickleSerializer)
+
+
+@functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _allchars_search(query):
+    """Return :const:`MATCH_ALLCHARS` search function for ``query``.
+
+    The function finds the characters of ``query`` in order in a
+    lowercase search key and returns ``(start, end)`` (``end``
+    exclusive) of the shortest window that contains them, the first
+    one if several are equally short, or ``None`` if the key doesn't
+    contain them all in order.
+
+    For each candidate start, the characters are found forwards to
+    get the earliest end, then backwards from there to get the latest
+    start for that end. Each step is a :meth:`str.find` or
+    :meth:`str.rfind`, so there is no backtracking on long keys.
+
+    :param query: lowercase query
+    :type query: ``unicode``
+    :returns: search function
+    :rtype: ``callable``
+
+    """
+    first = query[0]
+    forwards = query[1:]
+    backwards = query[-2::-1]
+    shortest = len(query)
+
+    def search(lower):
+        find = lower.find
+        rfind = lower.rfind
+        best = None
+        start = find(first)
+        while start != -1:
+            end = start
+            for c in forwards:
+                end = find(c, end + 1)
+                if end == -1:
+                    return best
+
+            # narrow the window from the left
+            i = end
+            for c in backwards:
+                i = rfind(c, start, i)
+
+            if best is None or end + 1 - i < best[1] - best[0]:
+                best = (i, end + 1)
+                if end + 1 - i == shortest:
+                    break
+
+            start = find(first, i + 1)
+
+        return best
+
+    return search
+
+
+def _score_alternatives(keys, query, fold, match_on, search=None):
+    """Best score of ``query`` against the alternative keys of an item.
+
+    :param keys: ``(search_key, folded_key)`` pairs of a
+        :class:`FilterIndex` entry
+    :param fold: whether to use the diacritic-folded keys
+    :returns: ``(score, rule)``
+
+    """
+    best = (0, None)
+    for skey, fkey in keys:
+        if fold and fkey is not None:
+            skey = fkey
+        result = _score_search_key(skey, query, match_on, search)
+        # Rules may score below zero; only prefer those to no match
+        if result[0] and (not best[0] or result[0] > best[0]):
+            best = result
+    return best
+
+
+class FilterIndex(object):
+    """Precomputed search keys for :meth:`Workflow.filter`.
+
+    :meth:`Workflow.filter` normally derives everything it matches
+    against (lowercase and diacritic-folded keys, character sets,
+    capitals, atoms and initials) from every item on every call.
+    A :class:`FilterIndex` does that work once, so pass one instead
+    of ``items`` when the same list is filtered repeatedly::
+
+        index = wf.cached_data(
+            "categories", lambda: FilterIndex(names), max_age=0
+        )
+        results = wf.filter(query, index)
+
+    Instances are picklable (as long as ``items`` are), so they can be
+    stored with :meth:`Workflow.cache_data`. ``key`` is only called
+    while the index is built and is not stored.
+
+    ``key`` may also return a sequence of alternative keys, e.g. a
+    name and its transliterations. Each query word is then scored
+    against every alternative and the best score counts. Results are
+    sorted on the first alternative.
+
+    :param items: iterable of items to index
+    :param key: function to get comparison key(s) from ``items``.
+        Must return a ``unicode`` string or a sequence of them.
+    :type key: ``callable``
+
+    Attributes:
+        items (list): Indexed items, in their original order.
+        entries (list): ``(position, sort_key, keys, max_len)`` tuples
+            for items with a non-empty key. ``keys`` is a tuple of
+            ``(search_key, folded_key)`` pairs, one per alternative;
+            ``folded_key`` is ``None`` if diacritic folding doesn't
+            change the key. ``max_len`` is the length of the longest
+            (folded) key.
+
+    """
+
+    def __init__(self, items, key=lambda x: x):
+        """Create new :class:`FilterIndex`."""
+        self.items = list(items)
+        self.entries = []
+
+        for i, item in enumerate(self.items):
+            values = key(item)
+            if isinstance(values, str):
+                values = (values,)
+
+            keys = []
+            max_len = 0
+            for value in values:
+                value = value.strip()
+                if value == "":
+                    continue
+
+                skey = _search_key(value)
+                folded = fold_to_ascii(value)
+                fkey = _search_key(folded) if folded != value else None
+                keys.append((skey, fkey))
+                max_len = max(max_len, len(value), len(folded))
+
+            if keys:
+                self.entries.append((i, keys[0][0][1], tuple(keys), max_len))
+
+    def __len__(self):
+        """Number of indexed items."""
+        return len(self.items)
+
+
+class _TopResults(object):
+    """Bounded heap of the best ``(sort_key, result)`` pairs of a filter.
+
+    Used by :meth:`Workflow.filter` when ``max_results`` is set, so
+    that only ``size`` results are ever ordered. The heap root is the
+    worst result kept so far.
+
+    :param size: number of results to keep
+    :type size: ``int``
+    :param min_score: results must score more than this to be kept
+    :type min_score: ``int``
+
+    """
+
+    def __init__(self, size, min_score=0):
+        """Create new :class:`_TopResults`."""
+        self.size = size
+        self.min_score = min_score
+        #: Score of the worst kept result once the heap is full
+        self.floor = 0
+        self._heap = []
+
+    def add(self, sort_key, result):
+        """Keep ``result`` if it is one of the best ``size`` so far."""
+        if self.min_score and result[1] <= self.min_score:
+            return
+
+        entry = _WorseFirst(sort_key, result)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif self._heap[0] < entry:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return
+
+        if len(self._heap) == self.size:
+            self.floor = self._heap[0].sort_key[2]
+
+    def results(self):
+        """Kept results, best first.
+
+        :returns: list of ``(item, score, rule)`` tuples
+        :rtype: ``list``
+
+        """
+        return [e.result for e in sorted(self._heap, reverse=True)]
+
+
+class _WorseFirst(object):
+    """Heap entry of :class:`_TopResults` that orders worse results first.
+
+    Results compare like the ``(sort_key, result)`` tuples that
+    :meth:`Workflow.filter` sorts, but reversed.
+
+    """
+
+    __slots__ = ("sort_key", "result")
+
+    def __init__(self, sort_key, result):
+        """Create new heap entry."""
+        self.sort_key = sort_key
+        self.result = result
+
+    def __lt__(self, other):
+        """Whether this entry is a worse result than ``other``."""
+        return (self.sort_key, self.result) > (other.sort_key, other.result)
+
+
+class _LazyDict(object):
+    """Descriptor for a :class:`dict` attribute created on first access.
+
+    The value is kept in the slot named ``_<attribute>``, which stays
+    ``None`` until the attribute is read or assigned, so objects that
+    never use the attribute don't allocate a :class:`dict` for it.
+    Code that only needs to test for a non-empty value should read the
+    slot directly.
+
+    """
+
+    __slots__ = ("slot",)
+
+    def __set_name__(self, owner, name):
+        """Store value in slot ``_<name>``."""
+        self.slot = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        """Return :class:`dict`, creating it if necessary."""
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if value is None:
+            value = {}
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        """Replace :class:`dict`."""
+        setattr(obj, self.slot, value)
 
 
 class Item(object):
@@ -703,6 +1269,24 @@ class Item(object):
 
     """
 
+    __slots__ = (
+        "title",
+        "subtitle",
+        "_modifier_subtitles",
+        "arg",
+        "autocomplete",
+        "valid",
+        "uid",
+        "icon",
+        "icontype",
+        "type",
+        "largetext",
+        "copytext",
+        "quicklookurl",
+    )
+
+    modifier_subtitles = _LazyDict()
+
     def __init__(
         self,
         title,
@@ -722,7 +1306,7 @@ class Item(object):
         """Same arguments as :meth:`Workflow.add_item`."""
         self.title = title
         self.subtitle = subtitle
-        self.modifier_subtitles = modifier_subtitles or {}
+        self._modifier_subtitles = modifier_subtitles or None
         self.arg = arg
         self.autocomplete = autocomplete
         self.valid = valid
@@ -765,11 +1349,12 @@ class Item(object):
         ET.SubElement(root, "subtitle").text = self.subtitle
 
         # Add modifier subtitles
-        for mod in ("cmd", "ctrl", "alt", "shift", "fn"):
-            if mod in self.modifier_subtitles:
-                ET.SubElement(
-                    root, "subtitle", {"mod": mod}
-                ).text = self.modifier_subtitles[mod]
+        if self._modifier_subtitles:
+            for mod in ("cmd", "ctrl", "alt", "shift", "fn"):
+                if mod in self._modifier_subtitles:
+                    ET.SubElement(
+                        root, "subtitle", {"mod": mod}
+                    ).text = self._modifier_subtitles[mod]
 
         # Add arg as element instead of attribute on <item>, as it's more
         # flexible (newlines aren't allowed in attributes)
@@ -962,6 +1547,10 @@ class Workflow(object):
         self._data_serializer = seralizer
         self._info = None
         self._info_loaded = False
+        self._info_fields = None
+        # In-process memo of loaded (deserialized) cache files:
+        # {path: ((st_mtime_ns, st_size), data)}
+        self._cache_memo = {}
         self._logger = None
         self._items = []
         self._alfred_env = None
@@ -969,8 +1558,8 @@ class Workflow(object):
         self._version = UNSET
         # Version from last workflow run
         self._last_version_run = UNSET
-        # Cache for regex patterns created for filter keys
-        self._search_pattern_cache = {}
+        # Profile of the current run (see `workflow.profiling`)
+        self._profile = None
         #: Prefix for all magic arguments.
         #: The default value is ``workflow:`` so keyword
         #: ``config`` would match user query ``workflow:config``.
@@ -1110,7 +1699,7 @@ class Workflow(object):
             if self.alfred_env.get("workflow_bundleid"):
                 self._bundleid = self.alfred_env.get("workflow_bundleid")
             else:
-                self._bundleid = self.info["bundleid"]
+                self._bundleid = self._cached_info["bundleid"]
 
         return self._bundleid
 
@@ -1138,7 +1727,7 @@ class Workflow(object):
             if self.alfred_env.get("workflow_name"):
                 self._name = self.decode(self.alfred_env.get("workflow_name"))
             else:
-                self._name = self.decode(self.info["name"])
+                self._name = self.decode(self._cached_info["name"])
 
         return self._name
 
@@ -1180,7 +1769,7 @@ class Workflow(object):
 
             # info.plist
             if not version:
-                version = self.info.get("version")
+                version = self._cached_info.get("version")
 
             if version:
                 from .update import Version
@@ -1690,7 +2279,29 @@ class Workflow(object):
 
         self.logger.debug("saved data: %s", data_path)
 
-    def cached_data(self, name, data_func=None, max_age=60):
+    def _cache_store(self, name, serializer_name=None):
+        """Return ``(serializer, path)`` of cache ``name``.
+
+        :param name: name of datastore
+        :param serializer_name: name of serializer to use. If not set,
+            :attr:`cache_serializer` is used.
+        :returns: ``tuple`` of serializer object and path of cache file
+
+        """
+        serializer_name = serializer_name or self.cache_serializer
+        serializer = manager.serializer(serializer_name)
+
+        if serializer is None:
+            raise ValueError(
+                "Invalid serializer `{0}`. Register your serializer with "
+                "`manager.register()` first.".format(serializer_name)
+            )
+
+        return serializer, self.cachefile("%s.%s" % (name, serializer_name))
+
+    def cached_data(
+        self, name, data_func=None, max_age=60, serializer=None, stale_ok=False
+    ):
         """Return cached data if younger than ``max_age`` seconds.
 
         Retrieve data from cache or re-generate and re-cache data if
@@ -1702,30 +2313,129 @@ class Workflow(object):
         :type data_func: ``callable``
         :param max_age: maximum age of cached data in seconds
         :type max_age: ``int``
+        :param serializer: name of serializer to use for this store.
+            If not set, :attr:`cache_serializer` is used. Must be the
+            same as the one passed to :meth:`cache_data`.
+        :param stale_ok: if the cache is older than ``max_age``, return
+            the stale data immediately and regenerate it in a background
+            process (stale-while-revalidate). See :meth:`refresh_cache`.
+        :type stale_ok: ``bool``
         :returns: cached data, return value of ``data_func`` or ``None``
             if ``data_func`` is not set
 
-        """
-        serializer = manager.serializer(self.cache_serializer)
-
-        cache_path = self.cachefile("%s.%s" % (name, self.cache_serializer))
-        age = self.cached_data_age(name)
+        Loaded data are memoized for the lifetime of this object and
+        reused as long as the cache file's modification time and size
+        are unchanged, so repeated lookups cost a single ``stat()``.
+        The same object is returned each time, so treat it as
+        read-only: copy it before making changes, then save the copy
+        with :meth:`cache_data`. Only data loaded from the cache file
+        are memoized, so the types returned are those the serializer
+        produces (e.g. lists, not tuples, with JSON).
 
-        if (age < max_age or max_age == 0) and os.path.exists(cache_path):
+        """
+        serializer_name = serializer
+        serializer, cache_path = self._cache_store(name, serializer_name)
+        st = _stat(cache_path)
+        fresh = st and (max_age == 0 or time.time() - st.st_mtime < max_age)
+
+        if st and (fresh or (stale_ok and data_func)):
+            if not fresh and self.refresh_cache(name, data_func, serializer_name):
+                self.logger.debug("returning stale cached data: %s", cache_path)
+            elif not fresh:
+                # Can't regenerate in background: do it now
+                return self._regenerate_cache(serializer, cache_path, data_func)
+
+            stamp = (st.st_mtime_ns, st.st_size)
+            memo = self._cache_memo.get(cache_path)
+            if memo and memo[0] == stamp:
+                return memo[1]
 
             with open(cache_path, "rb") as file_obj:
                 self.logger.debug("loading cached data: %s", cache_path)
-                return serializer.load(file_obj)
+                data = serializer.load(file_obj)
+
+            self._cache_memo[cache_path] = (stamp, data)
+            return data
 
         if not data_func:
             return None
 
+        return self._regenerate_cache(serializer, cache_path, data_func)
+
+    def _regenerate_cache(self, serializer, cache_path, data_func):
+        """Call ``data_func`` and save its result to ``cache_path``."""
+
         data = data_func()
-        self.cache_data(name, data)
+        self._write_cache(serializer, cache_path, data)
 
         return data
 
-    def cache_data(self, name, data):
+    def refresh_cache(self, name, data_func, serializer=None):
+        """Regenerate cache ``name`` with ``data_func`` in the background.
+
+        The refresh runs in a background process via
+        :func:`~workflow.background.run_in_background`, so ``data_func``
+        must be importable by that process: a module-level function, or
+        a :func:`functools.partial` of one with JSON-serializable
+        positional arguments. Functions defined in the running script
+        are loaded from its file, so the script must only run its main
+        code under ``if __name__ == "__main__":``.
+
+        Only one refresh per cache runs at a time: while one is pending,
+        further calls do nothing and return ``True``.
+
+        :param name: name of datastore
+        :param data_func: function to regenerate data
+        :type data_func: ``callable``
+        :param serializer: name of serializer to save data with
+        :returns: ``True`` if a refresh is running or was started,
+            ``False`` if ``data_func`` can't be run in another process
+        :rtype: ``bool``
+
+        """
+        target = _importable_func(data_func)
+        if target is None:
+            self.logger.debug("can't refresh `%s` in background: %r", name, data_func)
+            return False
+
+        serializer = serializer or self.cache_serializer
+        # Single-flight guard, removed by the refresh process when it
+        # finishes. A stale marker (e.g. from a crashed job) is replaced.
+        marker = self.cachefile("{0}.{1}.refresh".format(name, serializer))
+        st = _stat(marker)
+        if st and time.time() - st.st_mtime < REFRESH_TIMEOUT:
+            self.logger.debug("refresh of `%s` already pending", name)
+            return True
+
+        try:
+            if st:
+                os.unlink(marker)
+            fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:  # another process got there first
+            return True
+        except FileNotFoundError:  # another process removed it first
+            return True
+        os.close(fd)
+
+        from .background import run_in_background
+
+        module, qualname, args = target
+        cmd = [
+            sys.executable,
+            "-m",
+            "workflow.refresh",
+            name,
+            serializer,
+            marker,
+            module,
+            qualname,
+            json.dumps(args),
+        ]
+        self.logger.debug("refreshing `%s` in background ...", name)
+        run_in_background("__workflow_refresh-" + name, cmd, cwd=self.workflowdir)
+        return True
+
+    def cache_data(self, name, data, serializer=None):
         """Save ``data`` to cache under ``name``.
 
         If ``data`` is ``None``, the corresponding cache file will be
@@ -1734,11 +2444,16 @@ class Workflow(object):
         :param name: name of datastore
         :param data: data to store. This may be any object supported by
                 the cache serializer
+        :param serializer: name of serializer to use for this store.
+            If not set, :attr:`cache_serializer` is used.
 
         """
-        serializer = manager.serializer(self.cache_serializer)
+        serializer, cache_path = self._cache_store(name, serializer)
+        self._write_cache(serializer, cache_path, data)
 
-        cache_path = self.cachefile("%s.%s" % (name, self.cache_serializer))
+    def _write_cache(self, serializer, cache_path, data):
+        """Save ``data`` to ``cache_path`` or delete it if ``data`` is ``None``."""
+        self._cache_memo.pop(cache_path, None)
 
         if data is None:
             if os.path.exists(cache_path):
@@ -1746,43 +2461,52 @@ class Workflow(object):
                 self.logger.debug("deleted cache file: %s", cache_path)
             return
 
+        # Not memoized: the caller keeps ``data`` and may change it, and
+        # the next read should return what the serializer produces
         with serializer.atomic_writer(cache_path, "w") as file_obj:
             serializer.dump(data, file_obj)
 
         self.logger.debug("cached data: %s", cache_path)
 
-    def cached_data_fresh(self, name, max_age):
+    def cached_data_fresh(self, name, max_age, serializer=None):
         """Whether cache `name` is less than `max_age` seconds old.
 
         :param name: name of datastore
         :param max_age: maximum age of data in seconds
         :type max_age: ``int``
+        :param serializer: name of serializer the store was saved with.
+            If not set, :attr:`cache_serializer` is used.
         :returns: ``True`` if data is less than ``max_age`` old, else
             ``False``
 
         """
-        age = self.cached_data_age(name)
+        age = self.cached_data_age(name, serializer)
 
         if not age:
             return False
 
         return age < max_age
 
-    def cached_data_age(self, name):
+    def cached_data_age(self, name, serializer=None):
         """Return age in seconds of cache `name` or 0 if cache doesn't exist.
 
         :param name: name of datastore
         :type name: ``unicode``
+        :param serializer: name of serializer the store was saved with.
+            If not set, :attr:`cache_serializer` is used.
         :returns: age of datastore in seconds
         :rtype: ``int``
 
         """
-        cache_path = self.cachefile("%s.%s" % (name, self.cache_serializer))
+        return self._cache_age(self._cache_store(name, serializer)[1])
 
-        if not os.path.exists(cache_path):
+    def _cache_age(self, cache_path):
+        """Return age in seconds of file at ``cache_path`` or 0."""
+        st = _stat(cache_path)
+        if not st:
             return 0
 
-        return time.time() - os.stat(cache_path).st_mtime
+        return time.time() - st.st_mtime
 
     def filter(
         self,
@@ -1806,8 +2530,9 @@ class Workflow(object):
 
         :param query: query to test items against
         :type query: ``unicode``
-        :param items: iterable of items to test
-        :type items: ``list`` or ``tuple``
+        :param items: iterable of items to test, or a :class:`FilterIndex`
+            of them (in which case ``key`` is ignored)
+        :type items: ``list``, ``tuple`` or :class:`FilterIndex`
         :param key: function to get comparison key from ``items``.
             Must return a ``unicode`` string. The default simply returns
             the item.
@@ -1822,6 +2547,9 @@ class Workflow(object):
             than this.
         :type min_score: ``int``
         :param max_results: If non-zero, prune results list to this length.
+            Only this many results are kept (in a bounded heap) while
+            items are scored, and items that can no longer make the
+            cut are skipped early.
         :type max_results: ``int``
         :param match_on: Filter option flags. Bitwise-combined list of
             ``MATCH_*`` constants (see below).
@@ -1894,6 +2622,10 @@ class Workflow(object):
         altered.
 
         """
+        index = items if isinstance(items, FilterIndex) else None
+        if index is not None:
+            items = index.items
+
         if not query:
             return items
 
@@ -1908,44 +2640,41 @@ class Workflow(object):
             "__workflow_diacritic_folding", fold_diacritics
         )
 
-        results = []
+        words = [s.strip() for s in query.split(" ")]
+        words = [word for word in words if word != ""]
 
-        for item in items:
-            skip = False
-            score = 0
-            words = [s.strip() for s in query.split(" ")]
-            value = key(item).strip()
-            if value == "":
-                continue
-            for word in words:
-                if word == "":
-                    continue
-                s, rule = self._filter_item(value, word, match_on, fold_diacritics)
-
-                if not s:  # Skip items that don't match part of the query
-                    skip = True
-                score += s
+        # With ``max_results``, keep only the best results in a bounded
+        # heap instead of sorting all of them
+        top = None
+        if max_results and not ascending:
+            top = _TopResults(max_results, min_score)
+            add = top.add
+        else:
+            results = []
 
-            if skip:
-                continue
+            def add(sort_key, result):
+                results.append((sort_key, result))
 
-            if score:
-                # use "reversed" `score` (i.e. highest becomes lowest) and
-                # `value` as sort key. This means items with the same score
-                # will be sorted in alphabetical not reverse alphabetical order
-                results.append(
-                    ((100.0 / score, value.lower(), score), (item, score, rule))
-                )
+        source = items if index is None else index
+        for sort_key, result in self._score_items(
+            words, source, key, match_on, fold_diacritics, top
+        ):
+            add(sort_key, result)
 
-        # sort on keys, then discard the keys
-        results.sort(reverse=ascending)
-        results = [t[1] for t in results]
+        if top is not None:
+            results = top.results()
+        else:
+            if min_score:
+                results = [r for r in results if r[1][1] > min_score]
 
-        if min_score:
-            results = [r for r in results if r[1] > min_score]
+            if max_results and len(results) > max_results:
+                # only reached when ``ascending`` is set
+                results = heapq.nlargest(max_results, results)
+            else:
+                # sort on keys, then discard the keys
+                results.sort(reverse=ascending)
 
-        if max_results and len(results) > max_results:
-            results = results[:max_results]
+            results = [t[1] for t in results]
 
         # return list of ``(item, score, rule)``
         if include_score:
@@ -1953,6 +2682,78 @@ class Workflow(object):
         # just return list of items
         return [t[0] for t in results]
 
+    def _score_items(self, words, items, key, match_on, fold_diacritics, top=None):
+        """Score ``items`` against all query ``words`` for :meth:`filter`.
+
+        :param items: items or a :class:`FilterIndex` of them
+        :param top: :class:`_TopResults` matches are added to, used to
+            skip items that can no longer make the cut
+        :returns: generator of ``(sort_key, (item, score, rule))``
+            tuples for matching items
+
+        """
+        # ``top.floor`` is the score of the current worst kept result:
+        # no rule scores 100 or more, so an item can't be kept once its
+        # score plus 100 per unscored word falls below it. Rules can
+        # score below zero (which sorts first) for keys over 90 times
+        # longer than a word, so such keys are never skipped.
+        remaining = len(words) - 1
+        safe_len = 90 * min([len(word) for word in words])
+
+        if isinstance(items, FilterIndex):
+            index = items
+            items = index.items
+            # Per-word ``(query, fold, search)``, computed once
+            queries = []
+            for word in words:
+                word = word.lower()
+                search = None
+                if match_on & MATCH_ALLCHARS:
+                    search = self._search_for_query(word)
+                queries.append((word, fold_diacritics and isascii(word), search))
+
+            for i, sort_key, keys, max_len in index.entries:
+                score = 0
+                for j, (word, fold, search) in enumerate(queries):
+                    s, rule = _score_alternatives(keys, word, fold, match_on, search)
+                    if not s:  # Skip items that don't match part of the query
+                        break
+                    score += s
+                    if (
+                        top
+                        and score + 100.0 * (remaining - j) < top.floor
+                        and max_len <= safe_len
+                    ):
+                        break
+                else:
+                    if score:
+                        yield (100.0 / score, sort_key, score), (items[i], score, rule)
+
+        else:
+            for item in items:
+                score = 0
+                value = key(item).strip()
+                if value == "":
+                    continue
+                for j, word in enumerate(words):
+                    s, rule = self._filter_item(value, word, match_on, fold_diacritics)
+                    if not s:  # Skip items that don't match part of the query
+                        break
+                    score += s
+                    if (
+                        top
+                        and score + 100.0 * (remaining - j) < top.floor
+                        and len(self.fold_to_ascii(value)) <= safe_len
+                    ):
+                        break
+                else:
+                    if score:
+                        # use "reversed" `score` (i.e. highest becomes lowest)
+                        # and `value` as sort key. This means items with the
+                        # same score will be sorted in alphabetical not
+                        # reverse alphabetical order
+                        yield (100.0 / score, value.lower(), score), (item, score, rule)
+
     def _filter_item(self, value, query, match_on, fold_diacritics):
         """Filter ``value`` against ``query`` using rules ``match_on``.
 
@@ -1968,98 +2769,18 @@ class Workflow(object):
             value = self.fold_to_ascii(value)
 
         # pre-filter any items that do not contain all characters
-        # of ``query`` to save on running several more expensive tests
+        # of ``query`` before building the full search key
         if not set(query) <= set(value.lower()):
-
             return (0, None)
 
-        # item starts with query
-        if match_on & MATCH_STARTSWITH and value.lower().startswith(query):
-            score = 100.0 - (len(value) / len(query))
-
-            return (score, MATCH_STARTSWITH)
-
-        # query matches capitalised letters in item,
-        # e.g. of = OmniFocus
-        if match_on & MATCH_CAPITALS:
-            initials = "".join([c for c in value if c in INITIALS])
-            if initials.lower().startswith(query):
-                score = 100.0 - (len(initials) / len(query))
-
-                return (score, MATCH_CAPITALS)
-
-        # split the item into "atoms", i.e. words separated by
-        # spaces or other non-word characters
-        if (
-            match_on & MATCH_ATOM
-            or match_on & MATCH_INITIALS_CONTAIN
-            or match_on & MATCH_INITIALS_STARTSWITH
-        ):
-            atoms = [s.lower() for s in split_on_delimiters(value)]
-            # print('atoms : %s  -->  %s' % (value, atoms))
-            # initials of the atoms
-            initials = "".join([s[0] for s in atoms if s])
-
-        if match_on & MATCH_ATOM:
-            # is `query` one of the atoms in item?
-            # similar to substring, but scores more highly, as it's
-            # a word within the item
-            if query in atoms:
-                score = 100.0 - (len(value) / len(query))
-
-                return (score, MATCH_ATOM)
-
-        # `query` matches start (or all) of the initials of the
-        # atoms, e.g. ``himym`` matches "How I Met Your Mother"
-        # *and* "how i met your mother" (the ``capitals`` rule only
-        # matches the former)
-        if match_on & MATCH_INITIALS_STARTSWITH and initials.startswith(query):
-            score = 100.0 - (len(initials) / len(query))
-
-            return (score, MATCH_INITIALS_STARTSWITH)
-
-        # `query` is a substring of initials, e.g. ``doh`` matches
-        # "The Dukes of Hazzard"
-        elif match_on & MATCH_INITIALS_CONTAIN and query in initials:
-            score = 95.0 - (len(initials) / len(query))
-
-            return (score, MATCH_INITIALS_CONTAIN)
-
-        # `query` is a substring of item
-        if match_on & MATCH_SUBSTRING and query in value.lower():
-            score = 90.0 - (len(value) / len(query))
-
-            return (score, MATCH_SUBSTRING)
-
-        # finally, assign a score based on how close together the
-        # characters in `query` are in item.
+        search = None
         if match_on & MATCH_ALLCHARS:
             search = self._search_for_query(query)
-            match = search(value)
-            if match:
-                score = 100.0 / (
-                    (1 + match.start()) * (match.end() - match.start() + 1)
-                )
 
-                return (score, MATCH_ALLCHARS)
-
-        # Nothing matched
-        return (0, None)
+        return _score_search_key(_search_key(value), query, match_on, search)
 
     def _search_for_query(self, query):
-        if query in self._search_pattern_cache:
-            return self._search_pattern_cache[query]
-
-        # Build pattern: include all characters
-        pattern = []
-        for c in query:
-            # pattern.append('[^{0}]*{0}'.format(re.escape(c)))
-            pattern.append(".*?{0}".format(re.escape(c)))
-        pattern = "".join(pattern)
-        search = re.compile(pattern, re.IGNORECASE).search
-
-        self._search_pattern_cache[query] = search
-        return search
+        return _allchars_search(query.lower())
 
     def run(self, func, text_errors=False):
         """Call ``func`` to run your workflow.
@@ -2080,8 +2801,14 @@ class Workflow(object):
         Any exceptions raised will be logged and an error message will be
         output to Alfred.
 
+        If profiling is enabled (see :mod:`workflow.profiling`), the
+        duration of the run and of its phases (see :meth:`phase`) is
+        appended to ``profile.jsonl`` in :attr:`cachedir`.
+
         """
         start = time.time()
+        self._profile = self._start_profile()
+        error = False
 
         # Write to debugger to ensure "real" output starts on a new line
         print(".", file=sys.stderr)
@@ -2104,13 +2831,17 @@ class Workflow(object):
                 self.check_update()
 
             # Run workflow's entry function/method
-            func(self)
+            if self._profile is not None:
+                self._profile.call(func, self)
+            else:
+                func(self)
 
             # Set last version run to current version after a successful
             # run
             self.set_last_version()
 
         except Exception as err:
+            error = True
             self.logger.exception(err)
             if self.help_url:
                 self.logger.info("for assistance, see: %s", self.help_url)
@@ -2133,12 +2864,56 @@ class Workflow(object):
             return 1
 
         finally:
+            if self._profile is not None:
+                self._save_profile(error)
             self.logger.debug(
                 "---------- finished in %0.3fs ----------", time.time() - start
             )
 
         return 0
 
+    def phase(self, name):
+        """Return context manager that times phase ``name`` of this run.
+
+        Use it to break down where the time of a run goes when
+        profiling is enabled (see :mod:`workflow.profiling`)::
+
+            with wf.phase("data load"):
+                data = load_data(wf)
+
+        Durations of a phase entered several times are added up. If
+        profiling is disabled, the context manager does nothing.
+
+        :param name: name of phase
+        :type name: ``unicode``
+        :returns: context manager
+
+        """
+        if self._profile is None:
+            return _NO_PHASE
+        return self._profile.phase(name)
+
+    def _start_profile(self):
+        """Return :class:`~workflow.profiling.Profile` if profiling is enabled."""
+        from workflow.profiling import Profile, profile_mode
+
+        try:
+            mode = profile_mode(self)
+        except Exception as err:  # profiling must never break the workflow
+            self.logger.error("couldn't read profiling mode: %s", err)
+            return None
+        return Profile(mode) if mode else None
+
+    def _save_profile(self, error):
+        """Save profile of this run."""
+        script = os.path.basename(sys.argv[0])
+        try:
+            total = self._profile.save(self, script, error)
+        except Exception as err:
+            self.logger.error("couldn't save profile: %s", err)
+            return
+        self.logger.debug("profiled %s: %0.3fs %r", script, total, self._profile.phases)
+
     # Alfred feedback methods ------------------------------------------
 
     def add_item(
@@ -2234,12 +3009,13 @@ class Workflow(object):
 
     def send_feedback(self):
         """Print stored items to console/Alfred as XML."""
-        root = ET.Element("items")
-        for item in self._items:
-            root.append(item.elem)
-        sys.stdout.write('<?xml version="1.0" encoding="utf-8"?>\n')
-        sys.stdout.write(ET.tostring(root, encoding="unicode"))
-        sys.stdout.flush()
+        with self.phase("feedback"):
+            root = ET.Element("items")
+            for item in self._items:
+                root.append(item.elem)
+            sys.stdout.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            sys.stdout.write(ET.tostring(root, encoding="unicode"))
+            sys.stdout.flush()
 
     ####################################################################
     # Updating methods
@@ -2597,6 +3373,24 @@ class Workflow(object):
         self.magic_arguments["foldingoff"] = fold_off
         self.magic_arguments["foldingdefault"] = fold_default
 
+        # Profiling
+        def profile(mode, msg):
+            def wrapper():
+                from workflow.profiling import set_profile_mode
+
+                set_profile_mode(self, mode)
+                return msg
+
+            return wrapper
+
+        self.magic_arguments["profileon"] = profile(
+            "timings", "Profiling turned on"
+        )
+        self.magic_arguments["profilestats"] = profile(
+            "cprofile", "Profiling with cProfile turned on"
+        )
+        self.magic_arguments["profileoff"] = profile(None, "Profiling turned off")
+
         # Updates
         def update_on():
             self.settings["__workflow_autoupdate"] = True
@@ -2758,11 +3552,12 @@ class Workflow(object):
         :class:`Workflow`.
 
         """
-        encoding = encoding or self._input_encoding
-        normalization = normalization or self._normalizsation
         if not isinstance(text, str):
-            text = str(text, encoding)
-        return unicodedata.normalize(normalization, text)
+            text = str(text, encoding or self._input_encoding)
+        # ASCII is the same in every normalisation form
+        if text.isascii():
+            return text
+        return _normalize(normalization or self._normalizsation, text)
 
     def fold_to_ascii(self, text):
         """Convert non-ASCII characters to closest ASCII equivalent.
@@ -2777,10 +3572,7 @@ class Workflow(object):
         :rtype: ``unicode``
 
         """
-        if isascii(text):
-            return text
-        text = "".join([ASCII_REPLACEMENTS.get(c, c) for c in text])
-        return unicodedata.normalize("NFKD", text)
+        return fold_to_ascii(text)
 
     def dumbify_punctuation(self, text):
         """Convert non-ASCII punctuation to closest ASCII equivalent.
@@ -2831,6 +3623,54 @@ class Workflow(object):
             self._info = plistlib.load(file_obj)
         self._info_loaded = True
 
+    @property
+    def _cached_info(self):
+        """Subset of ``info.plist`` used by :attr:`bundleid` & co.
+
+        Parsing the whole of ``info.plist`` is slow, so the keys in
+        :const:`INFO_CACHE_KEYS` are saved to a small JSON file in the
+        cache directory, which is keyed on the mtime and size of
+        ``info.plist``.
+
+        The cache is only used if Alfred has told us where the cache
+        directory is: otherwise :attr:`cachedir` itself depends on
+        :attr:`bundleid`.
+
+        :returns: ``dict`` of cached ``info.plist`` values
+        :rtype: ``dict``
+
+        """
+        if self._info_fields is not None:
+            return self._info_fields
+
+        dirpath = self.alfred_env.get("workflow_cache")
+        if self._info_loaded or not dirpath:
+            self._info_fields = self.info
+            return self._info_fields
+
+        st = os.stat(self.workflowfile("info.plist"))
+        stamp = [st.st_mtime_ns, st.st_size]
+        cache_path = os.path.join(self._create(dirpath), INFO_CACHE_FILENAME)
+
+        try:
+            with open(cache_path, "r") as file_obj:
+                cached = json.load(file_obj)
+            if cached.get("stamp") == stamp:
+                self._info_fields = cached["fields"]
+                return self._info_fields
+        except (IOError, OSError, ValueError, KeyError):
+            pass
+
+        fields = {k: self.info[k] for k in INFO_CACHE_KEYS if k in self.info}
+        try:
+            with atomic_writer(cache_path, "w") as file_obj:
+                json.dump({"stamp": stamp, "fields": fields}, file_obj)
+        except (IOError, OSError) as err:  # pragma: no cover
+            self.logger.debug("couldn't write info cache: %s", err)
+
+        self._info_fields = fields
+        return self._info_fields
+
     def _create(self, dirpath):
         """Create directory `dirpath` if it doesn't exist.
 
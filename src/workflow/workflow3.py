@@ -28,7 +28,11 @@ import json
 import os
 import sys
 
-from .workflow import ICON_WARNING, Workflow
+from .workflow import ICON_WARNING, Workflow, _LazyDict
+
+# Encoder with the same settings as :func:`json.dumps`, used to
+# serialize feedback piece by piece
+_encode = json.JSONEncoder().encode
 
 
 class Variables(dict):
@@ -63,10 +67,14 @@ class Variables(dict):
 
     """
 
+    __slots__ = ("arg", "_config")
+
+    config = _LazyDict()
+
     def __init__(self, arg=None, **variables):
         """Create a new `Variables` object."""
         self.arg = arg
-        self.config = {}
+        self._config = None
         super(Variables, self).__init__(**variables)
 
     @property
@@ -79,8 +87,8 @@ class Variables(dict):
                 d2[k] = v
             o["variables"] = d2
 
-        if self.config:
-            o["config"] = self.config
+        if self._config:
+            o["config"] = self._config
 
         if self.arg is not None:
             o["arg"] = self.arg
@@ -94,7 +102,7 @@ class Variables(dict):
             unicode: ``alfredworkflow`` JSON object
 
         """
-        if not self and not self.config:
+        if not self and not self._config:
             if not self.arg:
                 return ""
             if isinstance(self.arg, str):
@@ -143,6 +151,20 @@ class Modifier(object):
 
     """
 
+    __slots__ = (
+        "key",
+        "subtitle",
+        "arg",
+        "valid",
+        "icon",
+        "icontype",
+        "_config",
+        "_variables",
+    )
+
+    config = _LazyDict()
+    variables = _LazyDict()
+
     def __init__(
         self, key, subtitle=None, arg=None, valid=None, icon=None, icontype=None
     ):
@@ -170,8 +192,8 @@ class Modifier(object):
         self.icon = icon
         self.icontype = icontype
 
-        self.config = {}
-        self.variables = {}
+        self._config = None
+        self._variables = None
 
     def setvar(self, name, value):
         """Set a workflow variable for this Item.
@@ -194,7 +216,9 @@ class Modifier(object):
             unicode or ``default``: Value of variable if set or ``default``.
 
         """
-        return self.variables.get(name, default)
+        if self._variables is None:
+            return default
+        return self._variables.get(name, default)
 
     @property
     def obj(self):
@@ -215,11 +239,11 @@ class Modifier(object):
         if self.valid is not None:
             o["valid"] = self.valid
 
-        if self.variables:
-            o["variables"] = self.variables
+        if self._variables:
+            o["variables"] = self._variables
 
-        if self.config:
-            o["config"] = self.config
+        if self._config:
+            o["config"] = self._config
 
         icon = self._icon()
         if icon:
@@ -227,6 +251,37 @@ class Modifier(object):
 
         return o
 
+    def _write_json(self, write):
+        """Serialize modifier as JSON without building :attr:`obj`.
+
+        Output is identical to ``json.dumps(self.obj)``.
+
+        Args:
+            write (callable): Called with each chunk of JSON text.
+
+        """
+        sep = "{"
+        for k, v in (
+            ("subtitle", self.subtitle),
+            ("arg", self.arg),
+            ("valid", self.valid),
+        ):
+            if v is not None:
+                write('%s"%s": %s' % (sep, k, _encode(v)))
+                sep = ", "
+
+        for k, v in (("variables", self._variables), ("config", self._config)):
+            if v:
+                write('%s"%s": %s' % (sep, k, _encode(v)))
+                sep = ", "
+
+        if self.icon is not None or self.icontype is not None:
+            write(sep + '"icon": ')
+            _write_icon(write, self.icon, self.icontype)
+            sep = ", "
+
+        write("{}" if sep == "{" else "}")
+
     def _icon(self):
         """Return `icon` object for item.
 
@@ -244,6 +299,16 @@ class Modifier(object):
         return icon
 
 
+def _write_icon(write, path, icontype):
+    """Write an `icon` object with the same layout as ``_icon()``."""
+    if path is not None and icontype is not None:
+        write('{"path": %s, "type": %s}' % (_encode(path), _encode(icontype)))
+    elif path is not None:
+        write('{"path": %s}' % _encode(path))
+    else:
+        write('{"type": %s}' % _encode(icontype))
+
+
 class Item3(object):
     """Represents a feedback item for Alfred 3+.
 
@@ -256,6 +321,29 @@ class Item3(object):
 
     """
 
+    __slots__ = (
+        "title",
+        "subtitle",
+        "arg",
+        "autocomplete",
+        "match",
+        "valid",
+        "uid",
+        "icon",
+        "icontype",
+        "type",
+        "quicklookurl",
+        "largetext",
+        "copytext",
+        "_modifiers",
+        "_config",
+        "_variables",
+    )
+
+    modifiers = _LazyDict()
+    config = _LazyDict()
+    variables = _LazyDict()
+
     def __init__(
         self,
         title,
@@ -294,10 +382,10 @@ class Item3(object):
         self.largetext = largetext
         self.copytext = copytext
 
-        self.modifiers = {}
+        self._modifiers = None
 
-        self.config = {}
-        self.variables = {}
+        self._config = None
+        self._variables = None
 
     def setvar(self, name, value):
         """Set a workflow variable for this Item.
@@ -320,7 +408,9 @@ class Item3(object):
             unicode or ``default``: Value of variable if set or ``default``.
 
         """
-        return self.variables.get(name, default)
+        if self._variables is None:
+            return default
+        return self._variables.get(name, default)
 
     def add_modifier(
         self, key, subtitle=None, arg=None, valid=None, icon=None, icontype=None
@@ -347,7 +437,8 @@ class Item3(object):
         mod = Modifier(key, subtitle, arg, valid, icon, icontype)
 
         # Add Item variables to Modifier
-        mod.variables.update(self.variables)
+        if self._variables:
+            mod.variables.update(self._variables)
 
         self.modifiers[key] = mod
 
@@ -383,11 +474,11 @@ class Item3(object):
         if self.quicklookurl is not None:
             o["quicklookurl"] = self.quicklookurl
 
-        if self.variables:
-            o["variables"] = self.variables
+        if self._variables:
+            o["variables"] = self._variables
 
-        if self.config:
-            o["config"] = self.config
+        if self._config:
+            o["config"] = self._config
 
         # Largetype and copytext
         text = self._text()
@@ -399,12 +490,60 @@ class Item3(object):
             o["icon"] = icon
 
         # Modifiers
-        mods = self._modifiers()
+        mods = self._mods()
         if mods:
             o["mods"] = mods
 
         return o
 
+    def _write_json(self, write):
+        """Serialize item as JSON without building :attr:`obj`.
+
+        Output is identical to ``json.dumps(self.obj)``.
+
+        Args:
+            write (callable): Called with each chunk of JSON text.
+
+        """
+        write(
+            '{"title": %s, "subtitle": %s, "valid": %s'
+            % (_encode(self.title), _encode(self.subtitle), _encode(self.valid))
+        )
+
+        for k, v in (
+            ("arg", self.arg),
+            ("autocomplete", self.autocomplete),
+            ("match", self.match),
+            ("uid", self.uid),
+            ("type", self.type),
+            ("quicklookurl", self.quicklookurl),
+        ):
+            if v is not None:
+                write(', "%s": %s' % (k, _encode(v)))
+
+        if self._variables:
+            write(', "variables": ' + _encode(self._variables))
+
+        if self._config:
+            write(', "config": ' + _encode(self._config))
+
+        if self.largetext is not None or self.copytext is not None:
+            write(', "text": ' + _encode(self._text()))
+
+        if self.icon is not None or self.icontype is not None:
+            write(', "icon": ')
+            _write_icon(write, self.icon, self.icontype)
+
+        if self._modifiers:
+            sep = ', "mods": {'
+            for k, mod in list(self._modifiers.items()):
+                write("%s%s: " % (sep, _encode(k)))
+                mod._write_json(write)
+                sep = ", "
+            write("}")
+
+        write("}")
+
     def _icon(self):
         """Return `icon` object for item.
 
@@ -437,16 +576,16 @@ class Item3(object):
 
         return text
 
-    def _modifiers(self):
+    def _mods(self):
         """Build `mods` dictionary for JSON feedback.
 
         Returns:
             dict: Modifier mapping or `None`.
 
         """
-        if self.modifiers:
+        if self._modifiers:
             mods = {}
-            for k, mod in list(self.modifiers.items()):
+            for k, mod in list(self._modifiers.items()):
                 mods[k] = mod.obj
 
             return mods
@@ -625,7 +764,8 @@ class Workflow3(Workflow):
         )
 
         # Add variables to child item
-        item.variables.update(self.variables)
+        if self.variables:
+            item.variables.update(self.variables)
 
         self._items.append(item)
         return item
@@ -639,7 +779,7 @@ class Workflow3(Workflow):
         """New cache name/key based on session ID."""
         return self._session_prefix + name
 
-    def cache_data(self, name, data, session=False):
+    def cache_data(self, name, data, session=False, serializer=None):
         """Cache API with session-scoped expiry.
 
         .. versionadded:: 1.25
@@ -649,8 +789,10 @@ class Workflow3(Workflow):
             data (object): Data to cache
             session (bool, optional): Whether to scope the cache
                 to the current session.
+            serializer (str, optional): Name of serializer to use for
+                this store instead of :attr:`cache_serializer`.
 
-        ``name`` and ``data`` are the same as for the
+        ``name``, ``data`` and ``serializer`` are the same as for the
         :meth:`~workflow.Workflow.cache_data` method on
         :class:`~workflow.Workflow`.
 
@@ -661,9 +803,17 @@ class Workflow3(Workflow):
         if session:
             name = self._mk_session_name(name)
 
-        return super(Workflow3, self).cache_data(name, data)
+        return super(Workflow3, self).cache_data(name, data, serializer)
 
-    def cached_data(self, name, data_func=None, max_age=60, session=False):
+    def cached_data(
+        self,
+        name,
+        data_func=None,
+        max_age=60,
+        session=False,
+        serializer=None,
+        stale_ok=False,
+    ):
         """Cache API with session-scoped expiry.
 
         .. versionadded:: 1.25
@@ -675,8 +825,13 @@ class Workflow3(Workflow):
             max_age (int): Maximum allowable age of cache in seconds.
             session (bool, optional): Whether to scope the cache
                 to the current session.
+            serializer (str, optional): Name of serializer to use for
+                this store instead of :attr:`cache_serializer`.
+            stale_ok (bool, optional): Return stale data immediately and
+                regenerate it in the background.
 
-        ``name``, ``data_func`` and ``max_age`` are the same as for the
+        ``name``, ``data_func``, ``max_age``, ``serializer`` and
+        ``stale_ok`` are the same as for the
         :meth:`~workflow.Workflow.cached_data` method on
         :class:`~workflow.Workflow`.
 
@@ -687,7 +842,9 @@ class Workflow3(Workflow):
         if session:
             name = self._mk_session_name(name)
 
-        return super(Workflow3, self).cached_data(name, data_func, max_age)
+        return super(Workflow3, self).cached_data(
+            name, data_func, max_age, serializer=serializer, stale_ok=stale_ok
+        )
 
     def clear_session_cache(self, current=False):
         """Remove session data from the cache.
@@ -758,10 +915,41 @@ class Workflow3(Workflow):
         icon = icon or ICON_WARNING
         return self.add_item(title, subtitle, icon=icon)
 
+    def write_feedback(self, fp):
+        """Write stored items to ``fp`` as JSON.
+
+        Each item is serialized straight to ``fp`` instead of first
+        building the complete :attr:`obj`. The output is identical to
+        ``json.dump(self.obj, fp)``.
+
+        Args:
+            fp (file): File-like object to write to.
+
+        """
+        write = fp.write
+        write('{"items": [')
+        for i, item in enumerate(self._items):
+            if i:
+                write(", ")
+            item._write_json(write)
+        write("]")
+
+        if self.variables:
+            write(', "variables": ' + _encode(self.variables))
+        if self.rerun:
+            write(', "rerun": ' + _encode(self.rerun))
+        write("}")
+
     def send_feedback(self):
-        """Print stored items to console/Alfred as JSON."""
-        if self.debugging:
-            json.dump(self.obj, sys.stdout, indent=2, separators=(",", ": "))
-        else:
-            json.dump(self.obj, sys.stdout)
-        sys.stdout.flush()
+        """Print stored items to console/Alfred as JSON.
+
+        When :attr:`debugging` is on, the feedback is pretty-printed.
+        Otherwise, items are streamed to STDOUT by :meth:`write_feedback`.
+
+        """
+        with self.phase("feedback"):
+            if self.debugging:
+                json.dump(self.obj, sys.stdout, indent=2, separators=(",", ": "))
+            else:
+                self.write_feedback(sys.stdout)
+            sys.stdout.flush()